@@ -9,6 +9,7 @@ import torch
 import torch.nn as nn
 import torch.optim as optim
 from collections import deque
+from ai.observation import ArrayObservation, MARIO_FEATURES
 
 class DQN(nn.Module):
     def __init__(self, state_dim, action_dim):
@@ -29,14 +30,20 @@ class ExploratoryAgent:
     Cette classe définit un agent simple qui choisit des actions de manière aléatoire.
     """
     
-    def __init__(self, exploration_rate=0.8, state_dim=8, action_list=None):
+    def __init__(self, exploration_rate=0.8, state_dim=8, action_list=None, seed=None):
         """
         Initialise l'agent exploratoire.
         
         Args:
             exploration_rate (float): Taux d'exploration, entre 0 et 1.
                 Plus cette valeur est élevée, plus l'agent prendra des actions aléatoires.
+            seed (int): graine du hasard de l'agent (exploration, échantillonnage, poids initiaux)
         """
+        # Hasard propre à l'agent, pour des parties reproductibles à graine égale
+        self.random = random.Random(seed)
+        self.generator = torch.Generator()
+        if seed is not None:
+            self.generator.manual_seed(seed)
         self.exploration_rate = exploration_rate
         self.epsilon_min = 0.05
         self.epsilon_decay = 0.995
@@ -48,8 +55,15 @@ class ExploratoryAgent:
         self.state_dim = state_dim
         self.action_list = action_list if action_list else ['left', 'right', 'jump', 'idle']
         self.action_dim = len(self.action_list)
-        self.policy_net = DQN(self.state_dim, self.action_dim).to(self.device)
-        self.target_net = DQN(self.state_dim, self.action_dim).to(self.device)
+        # Poids initiaux tirés de la graine de l'agent, dans une copie du hasard global de torch :
+        # les autres agents et réseaux du processus gardent le leur (poids créés sur le CPU)
+        with torch.random.fork_rng(devices=[]):
+            if seed is not None:
+                torch.manual_seed(seed)
+            self.policy_net = DQN(self.state_dim, self.action_dim)
+            self.target_net = DQN(self.state_dim, self.action_dim)
+        self.policy_net.to(self.device)
+        self.target_net.to(self.device)
         self.target_net.load_state_dict(self.policy_net.state_dict())
         self.optimizer = optim.Adam(self.policy_net.parameters(), lr=self.lr)
         self.update_target_steps = 200
@@ -60,6 +74,11 @@ class ExploratoryAgent:
 
     def preprocess_state(self, state):
         # Simplification: concatène position, vitesse, taille, etc. (adapter selon l'observation réelle)
+        if isinstance(state, ArrayObservation):
+            # Mêmes caractéristiques que le dictionnaire, lues directement dans le tableau
+            features = torch.zeros(self.state_dim, dtype=torch.float32)
+            features[:MARIO_FEATURES] = torch.from_numpy(state.mario[:MARIO_FEATURES])
+            return features.to(self.device)
         if isinstance(state, dict):
             mario_pos = state.get("mario_pos", [0, 0])
             mario_vel = state.get("mario_vel", [0, 0])
@@ -90,8 +109,8 @@ class ExploratoryAgent:
 
     def choose_action(self, state):
         state_tensor = self.preprocess_state(state).unsqueeze(0)
-        if torch.rand(1).item() < self.exploration_rate:
-            action_idx = torch.randint(0, self.action_dim, (1,)).item()
+        if torch.rand(1, generator=self.generator).item() < self.exploration_rate:
+            action_idx = torch.randint(0, self.action_dim, (1,), generator=self.generator).item()
         else:
             with torch.no_grad():
                 q_values = self.policy_net(state_tensor)
@@ -108,7 +127,15 @@ class ExploratoryAgent:
         # Récompense de progression : bonus si Mario avance vers la droite
         progression_bonus = 0
         booster_bonus = 0
-        if isinstance(last_state, dict) and isinstance(state, dict):
+        if isinstance(last_state, ArrayObservation) and isinstance(state, ArrayObservation):
+            x_before, x_after = last_state.mario[0], state.mario[0]
+            if x_after > x_before:
+                progression_bonus = float(x_after - x_before) * 0.1
+            elif x_after < x_before:
+                progression_bonus = -0.2
+            if state.mario[4] > last_state.mario[4]:
+                booster_bonus = 0.5
+        elif isinstance(last_state, dict) and isinstance(state, dict):
             x_before = last_state.get("mario_pos", [0, 0])[0]
             x_after = state.get("mario_pos", [0, 0])[0]
             if x_after > x_before:
@@ -124,7 +151,7 @@ class ExploratoryAgent:
         self.remember(last_state, last_action, reward, state, done)
         if len(self.memory) < self.batch_size:
             return
-        batch = random.sample(self.memory, self.batch_size)
+        batch = self.random.sample(self.memory, self.batch_size)
         states, actions, rewards, next_states, dones = zip(*batch)
         states = torch.stack(states)
         actions = torch.tensor(actions, device=self.device)
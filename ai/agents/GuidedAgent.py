@@ -6,6 +6,27 @@ import pygame
 import os
 import pickle
 import cv2  # Pour la détection du checkpoint
+from ai.observation import ArrayObservation, ENEMY_CODES, OBJECT_TYPES
+
+
+# Sortes d'objets des heuristiques, d'après le nom de classe (nearby_objects de l'état en dictionnaire)
+def is_enemy(obj_type):
+    return "Goomba" in obj_type or "Koopa" in obj_type
+
+
+def is_item(obj_type):
+    return any(item in obj_type for item in ["Coin", "CoinBox", "RandomBox", "Mushroom"])
+
+
+def is_block(obj_type):
+    return "Tile" in obj_type or "Block" in obj_type or "Brick" in obj_type
+
+
+# Mêmes sortes en codes de type d'ArrayObservation : tables indexées par le code
+ENEMY_KIND = np.isin(np.arange(len(OBJECT_TYPES)), ENEMY_CODES)
+ITEM_KIND = np.array([is_item(name) for name in OBJECT_TYPES])
+BLOCK_KIND = np.array([is_block(name) for name in OBJECT_TYPES])
+
 
 class GuidedAgent:
     """
@@ -16,7 +37,10 @@ class GuidedAgent:
     grâce à l'apprentissage par renforcement.
     """
     
-    def __init__(self):
+    def __init__(self, seed=None):
+        # Hasard propre à l'agent, pour des parties reproductibles à graine égale
+        self.random = random.Random(seed)
+        
         # Paramètres de l'agent
         self.exploration_rate = 0.4  # Taux d'exploration initial augmenté pour plus d'exploration
         self.min_exploration_rate = 0.05  # Taux minimal d'exploration
@@ -102,6 +126,15 @@ class GuidedAgent:
         """
         Retourne un état limité (naïf) : position, vitesse et taille de Mario uniquement.
         """
+        if isinstance(state, ArrayObservation):
+            # Lecture directe des valeurs de tête du tableau, sans passer par le dictionnaire complet
+            values = state.mario
+            return {
+                "mario_pos": [int(values[0]), int(values[1])],
+                "mario_vel": [float(values[2]), float(values[3])],
+                "mario_size": int(values[4]),
+                "game_state": state.game_state
+            }
         return {
             "mario_pos": state.get("mario_pos", [0, 0]),
             "mario_vel": state.get("mario_vel", [0, 0]),
@@ -109,19 +142,59 @@ class GuidedAgent:
             "game_state": state.get("game_state", "playing")
         }
 
+    def mario_state(self, state):
+        """(état du jeu, position, vitesse) de Mario : tableaux d'une ArrayObservation lus directement, sinon état limité"""
+        if isinstance(state, ArrayObservation):
+            values = state.mario
+            return state.game_state, [int(values[0]), int(values[1])], [float(values[2]), float(values[3])]
+        state = self.filter_state(state)
+        return state["game_state"], state["mario_pos"], state["mario_vel"]
+
+    def scan_objects(self, state):
+        """
+        Compte les objets proches utiles aux heuristiques de choose_action : ennemis devant,
+        bonus, blocs devant Mario et sol devant lui (aucun : un trou). Une ArrayObservation est
+        lue directement (positions et codes de type des lignes du masque) ; un état en
+        dictionnaire est d'abord converti, à partir des noms de classe de nearby_objects.
+        """
+        if isinstance(state, ArrayObservation):
+            objects = state.objects[state.mask]
+            rel_x, rel_y, codes = objects[:, 0], objects[:, 1], objects[:, 2]
+            enemy = ENEMY_KIND[codes]
+            item = ITEM_KIND[codes]
+            block = BLOCK_KIND[codes]
+        else:
+            objects = state.get("nearby_objects", [])
+            rel_x = np.array([obj[0] for obj in objects], dtype=np.int64)
+            rel_y = np.array([obj[1] for obj in objects], dtype=np.int64)
+            enemy = np.array([is_enemy(obj[2]) for obj in objects], dtype=bool)
+            item = np.array([is_item(obj[2]) for obj in objects], dtype=bool)
+            block = np.array([is_block(obj[2]) for obj in objects], dtype=bool)
+        ahead = enemy & (rel_x > 0) & (rel_x < 80) & (np.abs(rel_y) < 50)
+        above = item & (np.abs(rel_x) < 16) & (rel_y > -150) & (rel_y < -20)
+        return {
+            "count": len(objects),
+            "enemies_ahead": int(np.count_nonzero(ahead)),
+            "enemies_close": int(np.count_nonzero(ahead & (rel_x < 40))),
+            "items_above": int(np.count_nonzero(above)),
+            "items_ahead": int(np.count_nonzero(item & ~above & (rel_x > 0) & (rel_x < 100))),
+            "blocks_ahead": int(np.count_nonzero(block & (rel_x > 10) & (rel_x < 40) & (rel_y > -40) & (rel_y < 5))),
+            "ground_ahead": int(np.count_nonzero(block & (rel_x > 16) & (rel_x < 96) & (rel_y > -10) & (rel_y < 40))),
+        }
+
     def choose_action(self, state):
         """
-        Sélectionne une action en fonction de l'état actuel (état limité pour agent naïf)
+        Sélectionne une action en fonction de l'état actuel : position et vitesse de Mario,
+        objets proches pour les heuristiques (ennemis, blocs, trous)
         """
-        # Filtrer l'état pour ne garder que les infos simples
-        state = self.filter_state(state)
+        # Ne garder que les infos simples de Mario ; les objets proches ne sont lus
+        # que par les heuristiques (scan_objects), dans l'observation d'origine
+        observation = state
+        game_state, mario_pos, mario_vel = self.mario_state(state)
         try:
             # Actions possibles
             actions = ['left', 'right', 'jump', 'idle']
             
-            # Vérifier l'état du jeu
-            game_state = state.get("game_state", "playing")
-            
             # Logique spécifique pour le menu
             if game_state == "menu":
                 return self.handle_menu_action()
@@ -144,7 +217,7 @@ class GuidedAgent:
                         self.location_attempts[death_key] = {a: 0 for a in actions}
                         # Stratégie initiale: essayer d'autres actions
                         self.location_strategy[death_key] = [a for a in actions if a != self.last_action]
-                        random.shuffle(self.location_strategy[death_key])
+                        self.random.shuffle(self.location_strategy[death_key])
                         
                         print(f"Nouvelle zone de mort enregistrée: {death_key}, action: {self.last_action}")
                     else:
@@ -176,15 +249,12 @@ class GuidedAgent:
                 # Après game over, préférer l'action jump pour redémarrer
                 return 'jump'
             
-            # Récupérer la position actuelle de Mario
-            mario_pos = state["mario_pos"]
-            
             # Vérifier si Mario est dans une zone connue comme dangereuse
             current_zone = (int(mario_pos[0] / 50) * 50, int(mario_pos[1] / 50) * 50)
             zone_key = f"{current_zone[0]}-{current_zone[1]}"
             
             # Si Mario est dans une zone où il est déjà mort, utiliser une stratégie spécifique
-            if zone_key in self.death_locations and random.random() < 0.7:  # 70% de chance d'appliquer la stratégie
+            if zone_key in self.death_locations and self.random.random() < 0.7:  # 70% de chance d'appliquer la stratégie
                 # Incrémenter le compteur de tentatives pour cette zone
                 if zone_key in self.location_attempts:
                     attempts = sum(self.location_attempts[zone_key].values())
@@ -236,14 +306,14 @@ class GuidedAgent:
                 return action
             
             # Explorer avec une certaine probabilité (epsilon-greedy)
-            if random.random() < self.exploration_rate:
+            if self.random.random() < self.exploration_rate:
                 # Privilégier davantage le mouvement vers la droite, réduire les sauts en exploration
                 jump_probability = 0.2  # Réduit à 20% de chances de sauter
-                if random.random() < jump_probability:
+                if self.random.random() < jump_probability:
                     action = 'jump'
                 else:
                     # Favoriser fortement le mouvement vers la droite
-                    action = random.choice(['right', 'right', 'right', 'right', 'right', 'left'])  # 85% chance de droite
+                    action = self.random.choice(['right', 'right', 'right', 'right', 'right', 'left'])  # 85% chance de droite
                 print(f"Action aléatoire: {action}")
                 return action
             
@@ -251,30 +321,14 @@ class GuidedAgent:
             pygame.event.pump()
             
             # Récupérer les informations d'état
-            mario_vel = state["mario_vel"]
-            nearby_objects = state["nearby_objects"]
-            mario_pos = state["mario_pos"]
             is_on_ground = mario_vel[1] == 0
             avance = mario_vel[0] > 0
 
             # Analyse des objets proches pour détecter obstacle, vide ou ennemi devant
-            obstacle_ahead = False
-            void_ahead = False
-            enemy_ahead = False
-            ground_tiles_ahead = []
-            for obj in nearby_objects:
-                rel_x, rel_y, obj_type = obj
-                # Bloc devant
-                if ("Block" in obj_type or "Brick" in obj_type or "Tile" in obj_type) and 10 < rel_x < 40 and -40 < rel_y < 5:
-                    obstacle_ahead = True
-                # Sol devant (pour détecter les trous)
-                if ("Tile" in obj_type or "Block" in obj_type or "Brick" in obj_type) and 16 < rel_x < 96 and -10 < rel_y < 40:
-                    ground_tiles_ahead.append(obj)
-                # Ennemi devant
-                if ("Goomba" in obj_type or "Koopa" in obj_type) and 0 < rel_x < 80 and abs(rel_y) < 50:
-                    enemy_ahead = True
-            if len(ground_tiles_ahead) == 0 and avance:
-                void_ahead = True
+            nearby = self.scan_objects(observation)
+            obstacle_ahead = nearby["blocks_ahead"] > 0
+            void_ahead = nearby["ground_ahead"] == 0 and avance
+            enemy_ahead = nearby["enemies_ahead"] > 0
 
             # --- PÉNALITÉ MORTELLE POUR SAUT INUTILE ---
             # Si l'action choisie est 'jump' alors qu'il n'y a ni obstacle, ni vide, ni ennemi devant, infliger une mort immédiate
@@ -284,7 +338,7 @@ class GuidedAgent:
                 return 'kill_jump'
 
             # Afficher des informations de débogage (réduites)
-            print(f"Position: {mario_pos}, Vitesse: {mario_vel}, Objets: {len(nearby_objects)}")
+            print(f"Position: {mario_pos}, Vitesse: {mario_vel}, Objets: {nearby['count']}")
             
             # Calculer les scores pour chaque action avec un meilleur équilibre
             action_scores = {
@@ -299,59 +353,29 @@ class GuidedAgent:
                 self.jump_cooldown -= 1
                 action_scores['jump'] -= 5.0  # Pénalité plus forte pendant le cooldown
             
-            # Détecter les ennemis à l'avant
-            enemies_ahead = False
-            enemies_close = False
-            
-            # Analyser les objets proches
-            ground_tiles_ahead = []
-            ground_tiles_below = []
-            coins_above = False
-            blocks_ahead = False  # NOUVEAU: Détection des blocs devant Mario
-            
-            for obj in nearby_objects:
-                rel_x, rel_y, obj_type = obj
-                
-                # Détecter les ennemis
-                if "Goomba" in obj_type or "Koopa" in obj_type:
-                    if 0 < rel_x < 80 and abs(rel_y) < 50:  # Ennemi à droite proche
-                        enemies_ahead = True
-                        if rel_x < 40:  # Très proche
-                            enemies_close = True
-                            action_scores['jump'] += self.weights["jump_over_enemy"] * 2.0
-                            print("OBSTACLE: Ennemi très proche, je saute!")
-                        else:
-                            action_scores['jump'] += self.weights["jump_over_enemy"] * 1.5
-                            print("OBSTACLE: Ennemi détecté devant, je saute!")
-                
-                # Détecter les objets à collecter
-                if any(item in obj_type for item in ["Coin", "CoinBox", "RandomBox", "Mushroom"]):
-                    # Item au-dessus de Mario
-                    if abs(rel_x) < 16 and -150 < rel_y < -20:
-                        coins_above = True
-                        action_scores['jump'] += self.weights["distance_to_coin"] * 2.0
-                        print("OBSTACLE: Bonus au-dessus, je saute!")
-                    # Item devant Mario
-                    elif 0 < rel_x < 100:
-                        action_scores['right'] += self.weights["distance_to_coin"] * 1.5
-                
-                # NOUVEAU: Détecter les blocs devant Mario qui nécessitent un saut
-                if "Tile" in obj_type or "Block" in obj_type or "Brick" in obj_type:
-                    # Tuiles directement devant Mario à hauteur de son corps
-                    if 10 < rel_x < 40 and -40 < rel_y < 5:
-                        blocks_ahead = True
-                        action_scores['jump'] += 10.0  # Bonus important pour sauter
-                        print("OBSTACLE: Bloc devant Mario, je dois sauter!")
-                    
-                    # Tuiles directement sous Mario
-                    if abs(rel_x) < 16 and 0 < rel_y < 32:
-                        ground_tiles_below.append(obj)
-                    # Tuiles devant Mario (pour détecter les trous)
-                    elif 16 < rel_x < 96 and -10 < rel_y < 40:
-                        ground_tiles_ahead.append(obj)
+            # Ennemis à droite proches : sauter, d'autant plus qu'ils sont très proches
+            enemies_ahead = enemy_ahead
+            if nearby["enemies_close"]:
+                action_scores['jump'] += self.weights["jump_over_enemy"] * 2.0 * nearby["enemies_close"]
+                print("OBSTACLE: Ennemi très proche, je saute!")
+            if nearby["enemies_ahead"] > nearby["enemies_close"]:
+                action_scores['jump'] += self.weights["jump_over_enemy"] * 1.5 * (nearby["enemies_ahead"] - nearby["enemies_close"])
+                print("OBSTACLE: Ennemi détecté devant, je saute!")
+            
+            # Objets à collecter au-dessus de Mario, ou devant lui
+            if nearby["items_above"]:
+                action_scores['jump'] += self.weights["distance_to_coin"] * 2.0 * nearby["items_above"]
+                print("OBSTACLE: Bonus au-dessus, je saute!")
+            action_scores['right'] += self.weights["distance_to_coin"] * 1.5 * nearby["items_ahead"]
+            
+            # NOUVEAU: Blocs directement devant Mario à hauteur de son corps, qui nécessitent un saut
+            blocks_ahead = obstacle_ahead
+            if blocks_ahead:
+                action_scores['jump'] += 10.0 * nearby["blocks_ahead"]  # Bonus important pour sauter
+                print("OBSTACLE: Bloc devant Mario, je dois sauter!")
             
             # Vérifier s'il y a un sol devant (sinon, c'est un trou)
-            if len(ground_tiles_ahead) == 0 and mario_vel[0] >= 0:
+            if nearby["ground_ahead"] == 0 and mario_vel[0] >= 0:
                 # Pas de sol détecté devant = probablement un trou
                 action_scores['jump'] += self.weights["jump_over_gap"] * 3
                 print("OBSTACLE: Trou détecté, je saute!")
@@ -453,6 +477,11 @@ class GuidedAgent:
         """
         Entraîne l'agent avec une nouvelle expérience
         """
+        # Les tableaux d'ArrayObservation sont réécrits à chaque étape : garder l'état limité
+        if isinstance(state, ArrayObservation):
+            state = self.filter_state(state)
+        if isinstance(next_state, ArrayObservation):
+            next_state = self.filter_state(next_state)
         # Mettre à jour la table Q
         self.update(state, action, reward, next_state, done)
         
@@ -487,7 +516,7 @@ class GuidedAgent:
         if len(self.experience_buffer) > 10:
             # Échantillonner aléatoirement des expériences du tampon
             batch_size = min(10, len(self.experience_buffer))
-            batch = random.sample(self.experience_buffer, batch_size)
+            batch = self.random.sample(self.experience_buffer, batch_size)
             
             # Mettre à jour la table Q pour chaque expérience du lot
             for exp_state, exp_action, exp_reward, exp_next_state, exp_done in batch:
@@ -2,17 +2,53 @@
 
 import pygame
 import numpy as np
+import random
 import time
 import os
 import cv2
+from classes.Assets import convertAssets
 from classes.Dashboard import Dashboard
+from classes.DirtyRects import screenUpdater
 from classes.Level import Level
 from classes.Menu import Menu
+from classes.Sprites import Sprites
 from classes.Sound import Sound
 from entities.Mario import Mario
+from ai.observation import ArrayObservation
 
 class MarioEnv:
-    def __init__(self, agent_type="guided"):
+    def __init__(self, agent_type="guided", headless=False, verbose=True, max_speed=False, seed=None, observation="dict"):
+        """
+        Args:
+            agent_type (str): 'guided' ou 'exploratory'
+            headless (bool): si True, simulation sans affichage (pilotes SDL "dummy",
+                aucun blit ni envoi à l'écran), pour les machines sans écran
+            verbose (bool): si False, supprime les traces affichées à chaque étape
+            max_speed (bool): si True, aucune attente en temps réel (clock.tick limité,
+                pauses des écrans de fin, animation de mort) : la partie avance aussi vite
+                que le CPU le permet, le temps du niveau restant compté en ticks de simulation
+            seed (int): graine des mondes successifs ; avec la même graine et les mêmes actions,
+                les parties sont identiques (None : graines tirées au hasard)
+            observation (str): 'dict' (état en dictionnaire) ou 'array' (ArrayObservation,
+                tableaux NumPy préalloués, voir ai/observation.py)
+        """
+        if observation not in ("dict", "array"):
+            raise ValueError(f"Observation inconnue: {observation}")
+        self.observation = observation
+        # Deux tampons utilisés en alternance : l'observation précédente reste valide une étape
+        self.observation_buffers = (ArrayObservation(), ArrayObservation())
+        self.observation_index = 0
+        # Tire la graine de chaque nouveau monde ; la graine du monde courant est level_seed
+        self.seed_sequence = random.Random(seed)
+        self.level_seed = None
+        self.recorder = None  # TraceRecorder optionnel : action de chaque tick de jeu (classes.Trace)
+        self.headless = headless
+        self.verbose = verbose
+        self.max_speed = max_speed
+        if headless:
+            # Doit être défini avant l'initialisation de pygame pour être pris en compte
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
         pygame.init()
         self.window_size = (640, 480)
         self.screen = pygame.display.set_mode(self.window_size)
@@ -22,12 +58,16 @@ class MarioEnv:
         self.agent_type = agent_type
 
         # État du jeu
-        self.game_state = "menu"  # Valeurs possibles: "menu", "level_start", "playing", "game_over"
+        self.game_state = "menu"  # Valeurs possibles: "menu", "level_start", "playing", "game_over", "checkpoint_reached"
         
         # Initialiser les composants du jeu
         self.dashboard = Dashboard("./img/font.png", 8, self.screen)
         self.sound = Sound()
-        self.level = Level(self.screen, self.sound, self.dashboard)  # Créer le niveau avant le menu
+        self.sprites = Sprites()  # Chargées une seule fois, partagées par tous les niveaux
+        self.backdrop = None  # Ciel et sol fixes de draw_gameplay, rendus au premier dessin
+        if not headless:
+            convertAssets()  # Sprites et polices au format de l'écran (rien à dessiner en headless)
+        self.level = Level(self.screen, self.sound, self.dashboard, self.sprites)  # Créer le niveau avant le menu
         self.menu = Menu(self.screen, self.dashboard, self.level, self.sound)  # Corriger l'ordre des paramètres
         
         # Ajouter un attribut pour vérifier si Mario est mort
@@ -59,24 +99,114 @@ class MarioEnv:
         # Initialiser l'environnement
         self.reset()
 
-    def reset(self):
-        """Réinitialise l'environnement au début d'un épisode"""
-        print("Réinitialisation de l'environnement...")
+    def log(self, *args):
+        """Affiche une trace uniquement en mode verbeux"""
+        if self.verbose:
+            print(*args)
+
+    def wait(self, seconds):
+        """Pause en temps réel, ignorée en mode max_speed"""
+        if not self.max_speed:
+            time.sleep(seconds)
+
+    def reset(self, level=None, seed=None):
+        """Réinitialise l'environnement au début d'un épisode
+
+        Args:
+            level (str): si fourni (ex. "Level1-1"), la partie démarre directement dans ce
+                niveau, construit à partir du modèle en cache, sans passer par le menu
+            seed (int): graine de ce monde ; par défaut, tirée de la graine de l'environnement
+        """
+        self.log("Réinitialisation de l'environnement...")
         
-        # Remettre à zéro l'état du jeu et retourner au menu
-        self.game_state = "menu"
-        self.level = Level(self.screen, self.sound, self.dashboard)  # Réinitialiser le niveau
-        self.menu = Menu(self.screen, self.dashboard, self.level, self.sound)  # Corriger l'ordre des paramètres
+        if level is None:
+            # Remettre à zéro l'état du jeu et retourner au menu
+            self.game_state = "menu"
+            self.level = Level(self.screen, self.sound, self.dashboard, self.sprites)  # Réinitialiser le niveau
+            self.menu = Menu(self.screen, self.dashboard, self.level, self.sound)  # Corriger l'ordre des paramètres
         self.done = False
         self.total_reward = 0
+        self.end_screen = None  # Message de fin à afficher au prochain rendu
+        self.death_animation_played = False
         
         # Initialiser les variables de suivi
         self.last_x_pos = 0
         self.steps_since_progress = 0
         self.dashboard.coins_collected_last_step = 0
+
+        if level is not None:
+            # Même remise à zéro du tableau de bord que lors d'un choix de niveau dans le menu
+            self.dashboard.state = "start"
+            self.dashboard.levelName = level.split("Level")[1]
+            self.dashboard.time = 0
+            self.dashboard.ticks = 0
+            self.start_world(level, seed)
+            self.game_state = "playing"
         
         return self.get_state()
 
+    def start_world(self, levelName, seed=None):
+        """Construit le niveau (avec sa graine) et Mario à leur position de départ"""
+        if seed is None:
+            seed = self.seed_sequence.getrandbits(32)
+        self.level_seed = seed
+        self.level = Level(self.screen, self.sound, self.dashboard, self.sprites, seed)
+        self.log(f"Chargement du niveau: {levelName}")
+        self.level.loadLevel(levelName)
+        # Décaler Mario de 3 pixels vers la droite
+        self.mario = Mario(3, 0, self.level, self.screen, self.dashboard, self.sound)
+        # Forcer la position de départ de Mario au début du niveau
+        self.mario.rect.x = 80 + 3  # Position X initiale (au début du niveau + 3px)
+        self.mario.rect.y = 350  # Position Y initiale (sur le sol)
+        self.last_x_pos = self.mario.rect.x
+        
+        # Réinitialiser le compteur de blocage
+        self.steps_since_progress = 0
+        
+        self.log(f"Mario initialisé à la position: {self.mario.rect.x}, {self.mario.rect.y}")
+
+    def clone_state(self):
+        """
+        Capture l'état complet de la partie en cours : Mario, entités du niveau, tuiles
+        modifiées, tableau de bord, caméra et suivi de la récompense.
+        L'instantané ne contient que des données simples : il est compact et picklable,
+        donc transmissible à un processus de travail (voir MarioVecEnv).
+        """
+        if self.game_state == "menu":
+            raise RuntimeError("Aucune partie en cours à capturer (état menu)")
+        return {
+            "game_state": self.game_state,
+            "seed": self.level_seed,
+            "done": self.done,
+            "total_reward": self.total_reward,
+            "last_x_pos": self.last_x_pos,
+            "steps_since_progress": self.steps_since_progress,
+            "coins_collected_last_step": self.dashboard.coins_collected_last_step,
+            "dashboard": self.dashboard.getState(),
+            "level": self.level.getState(),
+            "mario": self.mario.getState(),
+        }
+
+    def restore_state(self, snapshot):
+        """Restaure un instantané de clone_state, sans rejouer la partie depuis le début"""
+        # Même niveau et même graine : la table d'apparition (directions des ennemis pas
+        # encore apparus) est celle du monde de l'instantané ; sinon, le monde est reconstruit
+        if (self.game_state == "menu" or self.level.name != snapshot["level"]["name"]
+                or self.level.seed != snapshot["seed"]):
+            self.start_world(snapshot["level"]["name"], snapshot["seed"])
+        self.level.setState(snapshot["level"])
+        self.mario.setState(snapshot["mario"])
+        self.dashboard.setState(snapshot["dashboard"])
+        self.dashboard.coins_collected_last_step = snapshot["coins_collected_last_step"]
+        self.game_state = snapshot["game_state"]
+        self.done = snapshot["done"]
+        self.total_reward = snapshot["total_reward"]
+        self.last_x_pos = snapshot["last_x_pos"]
+        self.steps_since_progress = snapshot["steps_since_progress"]
+        self.end_screen = None
+        self.death_animation_played = self.mario.dead
+        return self.get_state()
+
     def handle_menu(self, action):
         """Gère les actions dans le menu"""
         # Plutôt que d'essayer d'utiliser un attribut input qui n'existe pas,
@@ -103,23 +233,9 @@ class MarioEnv:
         
         # Vérifier si un niveau a été sélectionné
         if self.menu.start:
-            print("Niveau sélectionné, passage à l'état de jeu...")
+            self.log("Niveau sélectionné, passage à l'état de jeu...")
             self.game_state = "level_start"
-            self.level = Level(self.screen, self.sound, self.dashboard)
-            levelName = "Level1-1"  # Revenir au niveau 1-1 par défaut
-            print(f"Chargement du niveau: {levelName}")
-            self.level.loadLevel(levelName)
-            # Décaler Mario de 3 pixels vers la droite
-            self.mario = Mario(3, 0, self.level, self.screen, self.dashboard, self.sound)
-            # Forcer la position de départ de Mario au début du niveau
-            self.mario.rect.x = 80 + 3  # Position X initiale (au début du niveau + 3px)
-            self.mario.rect.y = 350  # Position Y initiale (sur le sol)
-            self.last_x_pos = self.mario.rect.x
-            
-            # Réinitialiser le compteur de blocage
-            self.steps_since_progress = 0
-            
-            print(f"Mario initialisé à la position: {self.mario.rect.x}, {self.mario.rect.y}")
+            self.start_world("Level1-1")  # Revenir au niveau 1-1 par défaut
             return True
         
         return False
@@ -138,7 +254,7 @@ class MarioEnv:
             
             # Vérifier que l'écran n'est pas vide
             if screen_array.shape[0] == 0 or screen_array.shape[1] == 0:
-                print("Écran de jeu vide, impossible de détecter le checkpoint")
+                self.log("Écran de jeu vide, impossible de détecter le checkpoint")
                 return False
                 
             # S'assurer que l'image modèle est plus petite que l'écran
@@ -147,27 +263,27 @@ class MarioEnv:
             
             # Si le template est plus grand que l'écran, le redimensionner
             if template.shape[0] > screen_height or template.shape[1] > screen_width:
-                print(f"Redimensionnement du template: {template.shape} -> max({screen_width}, {screen_height})")
+                self.log(f"Redimensionnement du template: {template.shape} -> max({screen_width}, {screen_height})")
                 scale = min(screen_width / template.shape[1], screen_height / template.shape[0]) * 0.8
                 new_width = int(template.shape[1] * scale)
                 new_height = int(template.shape[0] * scale)
                 template = cv2.resize(template, (new_width, new_height))
-                print(f"Nouvelles dimensions du template: {template.shape}")
+                self.log(f"Nouvelles dimensions du template: {template.shape}")
             
             # Convertir les images au format compatible avec OpenCV (transposer pour corriger l'orientation)
             screen_array = np.transpose(screen_array, (1, 0, 2))
             
             # Vérifier à nouveau les dimensions
-            print(f"Dimensions de l'écran: {screen_array.shape}")
-            print(f"Dimensions du template: {template.shape}")
+            self.log(f"Dimensions de l'écran: {screen_array.shape}")
+            self.log(f"Dimensions du template: {template.shape}")
             
             if template.shape[0] > screen_array.shape[0] or template.shape[1] > screen_array.shape[1]:
-                print("Le template est toujours plus grand que l'écran après redimensionnement")
+                self.log("Le template est toujours plus grand que l'écran après redimensionnement")
                 scale = min(screen_array.shape[1] / template.shape[1], screen_array.shape[0] / template.shape[0]) * 0.5
                 new_width = int(template.shape[1] * scale)
                 new_height = int(template.shape[0] * scale)
                 template = cv2.resize(template, (new_width, new_height))
-                print(f"Redimensionnement forcé du template: {template.shape}")
+                self.log(f"Redimensionnement forcé du template: {template.shape}")
             
             # Appliquer la méthode de correspondance de modèle
             result = cv2.matchTemplate(screen_array, template, cv2.TM_CCOEFF_NORMED)
@@ -175,13 +291,13 @@ class MarioEnv:
             # Trouver la position du meilleur match
             _, max_val, _, _ = cv2.minMaxLoc(result)
             
-            print(f"Score de correspondance: {max_val:.4f}")
+            self.log(f"Score de correspondance: {max_val:.4f}")
             
             # Si la correspondance est suffisamment bonne, considérer le checkpoint comme détecté
             threshold = 0.6  # Seuil plus bas pour être plus permissif
             
             if max_val >= threshold:
-                print(f"CHECKPOINT DÉTECTÉ! Score de correspondance: {max_val:.4f}")
+                self.log(f"CHECKPOINT DÉTECTÉ! Score de correspondance: {max_val:.4f}")
                 return True
             
             return False
@@ -196,8 +312,8 @@ class MarioEnv:
         """Gère les actions pendant le gameplay"""
         reward = 0
         
-        print(f"===== DÉBUT HANDLE_GAMEPLAY =====")
-        print(f"Action: {action}")
+        self.log(f"===== DÉBUT HANDLE_GAMEPLAY =====")
+        self.log(f"Action: {action}")
         
         # Réinitialiser TOUTES les actions à chaque frame
         self.mario.traits["goTrait"].direction = 0
@@ -206,20 +322,20 @@ class MarioEnv:
         # Simuler les touches de clavier pour contrôler Mario
         if action == 'left':
             self.mario.traits["goTrait"].direction = -1
-            print("Mario se déplace vers la gauche")
+            self.log("Mario se déplace vers la gauche")
         elif action == 'right':
             self.mario.traits["goTrait"].direction = 1
-            print("Mario se déplace vers la droite")
+            self.log("Mario se déplace vers la droite")
         elif action == 'jump':
             # Important: définir start à True UNIQUEMENT pour l'action de saut
             self.mario.traits["jumpTrait"].start = True
             # Appeler explicitement la méthode jump() pour que Mario saute réellement
             if hasattr(self.mario.traits["jumpTrait"], "jump"):
                 self.mario.traits["jumpTrait"].jump(True)  # Passer True pour indiquer que le saut est activé
-            print("Mario saute")
+            self.log("Mario saute")
         elif action == 'idle':
             # Ne rien faire, toutes les actions sont déjà réinitialisées
-            print("Mario est immobile")
+            self.log("Mario est immobile")
         
         # Force exécution des traits pour appliquer immédiatement les actions
         self.mario.updateTraits()
@@ -233,91 +349,11 @@ class MarioEnv:
         if self.mario.onGround:
             self.mario.traits["jumpTrait"].reset()
         
-        print(f"Position de Mario avant mise à jour: {self.mario.rect.x}, {self.mario.rect.y}")
+        self.log(f"Position de Mario avant mise à jour: {self.mario.rect.x}, {self.mario.rect.y}")
         
-        # ÉTAPE 1: Efface l'écran avec une couleur de fond
-        print("Effacement de l'écran...")
-        self.screen.fill((104, 136, 252))  # Couleur bleu ciel
-        
-        # ÉTAPE 2: Mise à jour des positions et états
-        print("Mise à jour de Mario...")
-        self.mario.update()
-        print(f"Position de Mario après mise à jour: {self.mario.rect.x}, {self.mario.rect.y}")
-        
-        # ÉTAPE 3: Dessiner tous les éléments du jeu
-        # Forcer le dessin du niveau complet
-        try:
-            print("Dessin du ciel et du sol...")
-            # Dessiner le ciel et le sol d'abord
-            for y in range(0, 13):
-                for x in range(0, 20):
-                    self.screen.blit(
-                        self.level.sprites.spriteCollection.get("sky").image,
-                        (x * 32, y * 32)  # N'utilise pas la position de la caméra pour le ciel
-                    )
-            for y in range(13, 15):
-                for x in range(0, 20):
-                    self.screen.blit(
-                        self.level.sprites.spriteCollection.get("ground").image,
-                        (x * 32, y * 32)  # N'utilise pas la position de la caméra pour le sol
-                    )
-            
-            # Ensuite dessiner le niveau avec ses objets
-            print("Dessin du niveau...")
-            self.level.drawLevel(self.mario.camera)
-            
-            # Puis dessiner le tableau de bord
-            print("Mise à jour du tableau de bord...")
-            self.dashboard.update()
-            
-            # Dessiner un texte d'information pour l'agent IA
-            font = pygame.font.Font(None, 20)
-            stats_text = f"IA Mario - Agent {self.agent_type} - Position: {int(self.mario.rect.x)},{int(self.mario.rect.y)}"
-            self.screen.blit(font.render(stats_text, True, (255, 255, 255)), (10, 10))
-            
-            # Afficher les statistiques de jeu
-            score_text = f"Parties jouées: {self.games_played} | Score: {self.dashboard.points} | Max distance: {self.max_distance}"
-            self.screen.blit(font.render(score_text, True, (255, 255, 255)), (10, 30))
-            fps_text = f"FPS: {int(self.clock.get_fps())} | Immobile: {self.steps_since_progress}/240 frames"
-            self.screen.blit(font.render(fps_text, True, (255, 255, 255)), (10, 50))
-            
-            # Dessiner Mario explicitement - CORRECTION POUR L'ORIENTATION
-            print("Dessin de Mario via goTrait...")
-            animation = self.mario.traits["goTrait"].animation
-            # Correction pour l'orientation de Mario (il ne doit pas être à l'envers)
-            # Utiliser le heading de Mario plutôt que sa direction de mouvement
-            mario_draw_x = self.mario.rect.x - self.mario.camera.x
-            mario_draw_y = self.mario.rect.y
-            if self.mario.traits["goTrait"].heading == 1:  # Facing right
-                self.screen.blit(animation.image, (mario_draw_x, mario_draw_y))
-            else:  # Facing left
-                self.screen.blit(
-                    pygame.transform.flip(animation.image, True, False),
-                    (mario_draw_x, mario_draw_y)
-                )
-            # Affichage de la hitbox de Mario pour le debug
-            pygame.draw.rect(self.screen, (255,0,0), pygame.Rect(mario_draw_x, mario_draw_y, self.mario.rect.width, self.mario.rect.height), 2)
-
-            # --- Ajout : Suivi de la position Y de la hitbox de Mario avec le sprite de Mario ---
-            # Récupérer la position Y de la hitbox de Mario (au centre de la hitbox)
-            mario_hitbox_center_y = self.mario.rect.y + self.mario.rect.height // 2
-            # Afficher le sprite de Mario au centre de l'écran, aligné sur la position Y de la hitbox de Mario
-            screen_center_x = self.screen.get_width() // 2
-            # Décaler de 15 pixels vers la droite (10 précédemment + 5 supplémentaires)
-            sprite_image = animation.image
-            sprite_rect = sprite_image.get_rect()
-            sprite_draw_x = screen_center_x - sprite_rect.width // 2 + 15
-            sprite_draw_y = mario_hitbox_center_y - sprite_rect.height // 2
-            if self.mario.traits["goTrait"].heading == 1:
-                self.screen.blit(sprite_image, (sprite_draw_x, sprite_draw_y))
-            else:
-                self.screen.blit(pygame.transform.flip(sprite_image, True, False), (sprite_draw_x, sprite_draw_y))
-            # --- Fin ajout ---
-        
-        except Exception as e:
-            print(f"ERREUR lors du dessin du niveau: {e}")
-            import traceback
-            traceback.print_exc()
+        # Une étape de simulation du monde : Mario, les entités du niveau, le chronomètre
+        self.simulate()
+        self.log(f"Position de Mario après mise à jour: {self.mario.rect.x}, {self.mario.rect.y}")
     
         # Initialiser l'indicateur de mort par blocage
         blocked_death = False
@@ -334,19 +370,13 @@ class MarioEnv:
             self.steps_since_progress += 1
         # Punir Mario s'il reste immobile trop longtemps (4 secondes = 240 frames à 60 FPS)
         if self.steps_since_progress > 240:  # 4 secondes à 60 FPS
-            print("Mario est resté immobile trop longtemps - MORT AUTOMATIQUE!")
+            self.log("Mario est resté immobile trop longtemps - MORT AUTOMATIQUE!")
             reward -= 100
             self.game_state = "game_over"
             self.done = True
             self.games_played += 1
             blocked_death = True
-            # Afficher un message d'erreur sur l'écran
-            font = pygame.font.Font(None, 48)
-            death_text = font.render("MARIO EST TROP LENT!", True, (255, 0, 0))
-            text_rect = death_text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2))
-            self.screen.blit(death_text, text_rect)
-            pygame.display.update()
-            time.sleep(1)  # Afficher le message pendant 1 seconde
+            self.end_screen = "blocked"
         # Pénalité moins sévère si Mario commence à être immobile
         elif self.steps_since_progress > 60:
             reward -= 1
@@ -377,11 +407,44 @@ class MarioEnv:
         
         # Vérifier si Mario a atteint le checkpoint
         if self.mario.rect.x >= self.checkpoint_position:
-            print("VICTOIRE! Mario a atteint le checkpoint!")
+            self.log("VICTOIRE! Mario a atteint le checkpoint!")
             reward += 1000  # Grosse récompense pour avoir atteint le checkpoint
             self.game_state = "checkpoint_reached"
             self.done = True
             self.games_played += 1
+            self.end_screen = "checkpoint"
+        
+        self.log(f"===== FIN HANDLE_GAMEPLAY =====")
+        return reward
+
+    def simulate(self):
+        """Fait avancer le monde d'une étape de simulation, sans aucun dessin"""
+        self.mario.simulate()
+        self.level.simulate(self.mario.camera)
+        self.dashboard.tick()
+
+    def render(self):
+        """Dessine l'image courante du jeu (sans effet en mode headless)"""
+        if self.headless:
+            return
+        self.draw_gameplay()
+        self.draw_end_screen()
+
+    def draw_end_screen(self):
+        """Affiche l'animation ou le message de fin de partie, une seule fois"""
+        if self.mario.dead and not self.death_animation_played:
+            self.death_animation_played = True
+            if not self.max_speed:
+                self.mario.playDeathAnimation()
+        if self.end_screen == "blocked":
+            # Afficher un message d'erreur sur l'écran
+            font = pygame.font.Font(None, 48)
+            death_text = font.render("MARIO EST TROP LENT!", True, (255, 0, 0))
+            text_rect = death_text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2))
+            self.screen.blit(death_text, text_rect)
+            screenUpdater.presentAll()
+            self.wait(1)  # Afficher le message pendant 1 seconde
+        elif self.end_screen == "checkpoint":
             # Afficher l'image de checkpoint si elle existe
             if self.checkpoint_img_surface:
                 img_rect = self.checkpoint_img_surface.get_rect()
@@ -392,14 +455,111 @@ class MarioEnv:
             victory_text = font.render("CHECKPOINT ATTEINT!", True, (255, 255, 0))
             text_rect = victory_text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2 + 60))
             self.screen.blit(victory_text, text_rect)
-            pygame.display.update()
-            time.sleep(2)  # Afficher le message pendant 2 secondes
+            screenUpdater.presentAll()
+            self.wait(2)  # Afficher le message pendant 2 secondes
+        self.end_screen = None
+
+    def get_backdrop(self):
+        """Fond bleu ciel, rangées de ciel puis de sol, rendus une seule fois (ne suivent pas la caméra)"""
+        if self.backdrop is None:
+            self.backdrop = pygame.Surface(self.window_size)
+            self.backdrop.fill((104, 136, 252))  # Couleur bleu ciel
+            sky = self.level.sprites.spriteCollection.get("sky").image
+            ground = self.level.sprites.spriteCollection.get("ground").image
+            for y in range(0, 15):
+                for x in range(0, 20):
+                    self.backdrop.blit(sky if y < 13 else ground, (x * 32, y * 32))
+        return self.backdrop
+
+    def draw_gameplay(self):
+        """Dessine le niveau, le tableau de bord et Mario"""
+        # Forcer le dessin du niveau complet
+        try:
+            self.log("Dessin du ciel et du sol...")
+            # Dessiner le ciel et le sol d'abord : une seule image, fixe à l'écran
+            self.screen.blit(self.get_backdrop(), (0, 0))
+            
+            # Ensuite dessiner le niveau avec ses objets
+            self.log("Dessin du niveau...")
+            self.level.render(self.mario.camera)
+            
+            # Puis dessiner le tableau de bord
+            self.log("Dessin du tableau de bord...")
+            self.dashboard.draw()
+            
+            # Dessiner un texte d'information pour l'agent IA
+            font = pygame.font.Font(None, 20)
+            stats_text = f"IA Mario - Agent {self.agent_type} - Position: {int(self.mario.rect.x)},{int(self.mario.rect.y)}"
+            screenUpdater.add(self.screen.blit(font.render(stats_text, True, (255, 255, 255)), (10, 10)))
+            
+            # Afficher les statistiques de jeu
+            score_text = f"Parties jouées: {self.games_played} | Score: {self.dashboard.points} | Max distance: {self.max_distance}"
+            screenUpdater.add(self.screen.blit(font.render(score_text, True, (255, 255, 255)), (10, 30)))
+            # Sans limite d'images (max_speed), get_fps() peut valoir l'infini sur des frames de 0 ms
+            fps = self.clock.get_fps()
+            fps_text = f"FPS: {int(fps) if fps != float('inf') else 0} | Immobile: {self.steps_since_progress}/240 frames"
+            screenUpdater.add(self.screen.blit(font.render(fps_text, True, (255, 255, 255)), (10, 50)))
+            
+            # Dessiner Mario explicitement - CORRECTION POUR L'ORIENTATION
+            self.log("Dessin de Mario via goTrait...")
+            animation = self.mario.traits["goTrait"].animation
+            # Correction pour l'orientation de Mario (il ne doit pas être à l'envers)
+            # Utiliser le heading de Mario plutôt que sa direction de mouvement
+            mario_draw_x = self.mario.rect.x - self.mario.camera.x
+            mario_draw_y = self.mario.rect.y
+            if self.mario.traits["goTrait"].heading == 1:  # Facing right
+                screenUpdater.add(self.screen.blit(animation.image, (mario_draw_x, mario_draw_y)))
+            else:  # Facing left
+                screenUpdater.add(self.screen.blit(
+                    pygame.transform.flip(animation.image, True, False),
+                    (mario_draw_x, mario_draw_y)
+                ))
+            # Affichage de la hitbox de Mario pour le debug
+            screenUpdater.add(pygame.draw.rect(self.screen, (255,0,0), pygame.Rect(mario_draw_x, mario_draw_y, self.mario.rect.width, self.mario.rect.height), 2))
+
+            # --- Ajout : Suivi de la position Y de la hitbox de Mario avec le sprite de Mario ---
+            # Récupérer la position Y de la hitbox de Mario (au centre de la hitbox)
+            mario_hitbox_center_y = self.mario.rect.y + self.mario.rect.height // 2
+            # Afficher le sprite de Mario au centre de l'écran, aligné sur la position Y de la hitbox de Mario
+            screen_center_x = self.screen.get_width() // 2
+            # Décaler de 15 pixels vers la droite (10 précédemment + 5 supplémentaires)
+            sprite_image = animation.image
+            sprite_rect = sprite_image.get_rect()
+            sprite_draw_x = screen_center_x - sprite_rect.width // 2 + 15
+            sprite_draw_y = mario_hitbox_center_y - sprite_rect.height // 2
+            if self.mario.traits["goTrait"].heading == 1:
+                screenUpdater.add(self.screen.blit(sprite_image, (sprite_draw_x, sprite_draw_y)))
+            else:
+                screenUpdater.add(self.screen.blit(pygame.transform.flip(sprite_image, True, False), (sprite_draw_x, sprite_draw_y)))
+            # --- Fin ajout ---
         
-        print(f"===== FIN HANDLE_GAMEPLAY =====")
-        return reward
+        except Exception as e:
+            print(f"ERREUR lors du dessin du niveau: {e}")
+            import traceback
+            traceback.print_exc()
 
-    def step(self, action):
-        """Exécute une action dans l'environnement"""
+    def step(self, action, repeat=1):
+        """Exécute une action dans l'environnement
+
+        Args:
+            action (str): action choisie par l'agent
+            repeat (int): nombre de ticks de jeu pendant lesquels l'action est appliquée
+                (frame-skip). Les récompenses sont additionnées et seule l'observation
+                finale est calculée ; arrêt anticipé dès que la partie se termine.
+                La répétition ne s'applique qu'en jeu, jamais dans les menus.
+        """
+        total_reward = 0
+        for _ in range(max(1, repeat)):
+            reward, info = self.step_tick(action)
+            total_reward += reward
+            if self.done or self.game_state != "playing":
+                break
+        return self.get_state(), total_reward, self.done, info
+
+    def step_tick(self, action):
+        """Exécute un seul tick de jeu et retourne (récompense, info), sans calculer l'observation"""
+        if self.recorder is not None and self.game_state == "playing":
+            self.recorder.recordAction(action)
         reward = 0
         blocked_death = False  # Toujours défini, évite le NameError
         
@@ -419,10 +579,11 @@ class MarioEnv:
         
         elif self.game_state == "playing":
             reward += self.handle_gameplay(action)
+            self.render()
         
         elif self.game_state in ["game_over", "checkpoint_reached"]:
             # Attendre un moment avant de réinitialiser
-            time.sleep(1)
+            self.wait(1)
             self.done = True
             
             # Ajouter la récompense totale à l'historique
@@ -433,30 +594,38 @@ class MarioEnv:
             # Afficher des statistiques
             if len(self.total_reward_history) > 0:
                 avg_reward = sum(self.total_reward_history) / len(self.total_reward_history)
-                print(f"Parties jouées: {self.games_played}, Récompense moyenne: {avg_reward:.2f}")
-                print(f"Distance maximale atteinte: {self.max_distance}")
+                self.log(f"Parties jouées: {self.games_played}, Récompense moyenne: {avg_reward:.2f}")
+                self.log(f"Distance maximale atteinte: {self.max_distance}")
         
         # --- GESTION DU SAUT INUTILE (mortelle) ---
         if action == 'kill_jump':
-            print("L'agent a sauté sans raison valable : MORT INSTANTANÉE !")
+            self.log("L'agent a sauté sans raison valable : MORT INSTANTANÉE !")
             self.game_state = "game_over"
             self.done = True
             self.dashboard.points -= 500  # Pénalité très forte
             self.mario.restart = True
-            return self.get_state(), -500, True, {"game_state": "game_over", "kill_jump": True}
-        
-        # Mettre à jour l'écran
-        pygame.display.update()
-        self.clock.tick(self.max_frame_rate)
+            return -500, {"game_state": "game_over", "kill_jump": True}
+        
+        # Mettre à jour l'écran (seules les zones modifiées, voir classes.DirtyRects)
+        if not self.headless:
+            screenUpdater.present()
+        if self.max_speed:
+            # Pas de limite : le temps du jeu avance uniquement avec les ticks de simulation
+            self.clock.tick()
+        else:
+            self.clock.tick(self.max_frame_rate)
         
         self.total_reward += reward
         info = {"game_state": self.game_state}
         if blocked_death:
             info["blocked_death"] = True
-        return self.get_state(), reward, self.done, info
+        return reward, info
 
     def get_state(self):
         """Retourne une représentation de l'état actuel du jeu"""
+        if self.observation == "array":
+            self.observation_index ^= 1
+            return self.observation_buffers[self.observation_index].fill(self)
         if self.game_state == "menu":
             # État simplifié pour le menu
             return {
@@ -525,10 +694,6 @@ class MarioEnv:
                     self.mario.powerUpState
                 ])
     
-    def render(self):
-        """Cette méthode est implicitement appelée dans step()"""
-        pass
-
     def close(self):
         """Ferme l'environnement"""
         pygame.quit()
\ No newline at end of file
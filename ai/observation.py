@@ -0,0 +1,170 @@
+# observation.py
+
+"""
+Observation de MarioEnv sous forme de tableaux NumPy préalloués.
+
+Contrairement à l'état en dictionnaire (MarioEnv.get_state avec observation="dict"),
+aucun objet Python n'est créé à chaque étape : les valeurs sont écrites dans des
+tableaux de forme fixe, les types d'objets sont des codes entiers et les lignes
+inutilisées sont masquées.
+
+- mario   : float32[len(MARIO_FIELDS)], voir MARIO_FIELDS
+- objects : int32[MAX_OBJECTS, 3], lignes (rel_x, rel_y, code de type), entités puis tuiles,
+            dans le même ordre que nearby_objects
+- mask    : bool[MAX_OBJECTS], True pour les lignes valides
+- count   : nombre de lignes valides
+- solid   : uint8[SOLID_WINDOW, SOLID_WINDOW], codes de collision (TILE_* de classes.Tile)
+            des cases autour de celle de Mario, lus dans Level.solidGrid ; Mario est au centre
+
+Les tableaux sont réécrits à chaque appel de fill() : utiliser copy() pour conserver
+une observation plus longtemps.
+"""
+
+import numpy as np
+from classes.Tile import GRID_PADDING, TILE_EMPTY
+
+MARIO_FIELDS = ("x", "y", "vel_x", "vel_y", "size", "coins", "score", "time", "camera_x", "camera_y", "game_state")
+MARIO_INDEX = {name: index for index, name in enumerate(MARIO_FIELDS)}
+# Nombre de valeurs de tête équivalentes aux caractéristiques du dictionnaire (position, vitesse, taille)
+MARIO_FEATURES = 5
+
+# Tous les états de MarioEnv.game_state ; un état absent est une erreur (voir clear)
+GAME_STATES = ("menu", "level_start", "playing", "game_over", "checkpoint_reached")
+GAME_STATE_CODES = {name: code for code, name in enumerate(GAME_STATES)}
+
+# Code 0 : ligne vide (remplissage) ; "Other" pour les classes d'entités non listées
+OBJECT_TYPES = ("None", "Tile", "Goomba", "Koopa", "Coin", "CoinBox", "RandomBox", "CoinBrick", "RedMushroom", "Checkpoint", "Other")
+OBJECT_CODES = {name: code for code, name in enumerate(OBJECT_TYPES)}
+ENEMY_CODES = (OBJECT_CODES["Goomba"], OBJECT_CODES["Koopa"])
+
+# Fenêtre de ±200 px : au plus 14 x 14 tuiles, plus les entités proches
+MAX_OBJECTS = 256
+VIEW_RADIUS = 200
+TILE_OFFSETS = np.arange(0, 32 * 16, 32, dtype=np.int32)
+SOLID_RADIUS = 6
+SOLID_WINDOW = 2 * SOLID_RADIUS + 1
+
+
+class ArrayObservation:
+    def __init__(self, max_objects=MAX_OBJECTS):
+        self.mario = np.zeros(len(MARIO_FIELDS), dtype=np.float32)
+        self.objects = np.zeros((max_objects, 3), dtype=np.int32)
+        self.mask = np.zeros(max_objects, dtype=bool)
+        self.count = 0
+        self.solid = np.zeros((SOLID_WINDOW, SOLID_WINDOW), dtype=np.uint8)
+        # Code de type par classe d'entité, calculé une seule fois par classe
+        self.type_codes = {}
+
+    @property
+    def game_state(self):
+        return GAME_STATES[int(self.mario[MARIO_INDEX["game_state"]])]
+
+    def type_code(self, entity):
+        entity_class = entity.__class__
+        code = self.type_codes.get(entity_class)
+        if code is None:
+            code = OBJECT_CODES.get(entity_class.__name__, OBJECT_CODES["Other"])
+            self.type_codes[entity_class] = code
+        return code
+
+    def clear(self, game_state):
+        code = GAME_STATE_CODES.get(game_state)
+        if code is None:
+            raise ValueError("État de jeu inconnu: {}".format(game_state))
+        self.mario[:] = 0
+        self.mario[MARIO_INDEX["game_state"]] = code
+        self.objects[:self.count] = 0
+        self.mask[:self.count] = False
+        self.count = 0
+        self.solid[:] = TILE_EMPTY
+
+    def fill(self, env):
+        """Écrit l'état courant de `env` (MarioEnv) dans les tableaux et retourne self"""
+        self.clear(env.game_state)
+        if env.game_state not in ("playing", "level_start"):
+            return self
+        mario = env.mario
+        mario_x, mario_y = mario.rect.x, mario.rect.y
+        dashboard = env.dashboard
+        self.mario[:10] = (mario_x, mario_y, mario.vel.x, mario.vel.y, mario.powerUpState,
+                           dashboard.coins, dashboard.points, dashboard.time, mario.camera.x, mario.camera.y)
+
+        objects = self.objects
+        capacity = len(objects)
+        count = 0
+        # Entités proches
+        for entity in env.level.entityList:
+            rect = getattr(entity, "rect", None)
+            if rect is None or entity is mario:
+                continue
+            rel_x = rect.x - mario_x
+            if -VIEW_RADIUS < rel_x < VIEW_RADIUS:
+                rel_y = rect.y - mario_y
+                if -VIEW_RADIUS < rel_y < VIEW_RADIUS and count < capacity:
+                    objects[count] = (rel_x, rel_y, self.type_code(entity))
+                    count += 1
+
+        # Tuiles de la fenêtre, écrites en bloc (lignes puis colonnes, comme le dictionnaire) :
+        # bornes calculées en entiers pour ne garder que les tuiles à moins de VIEW_RADIUS
+        level = env.level
+        x_first = max(0, int((mario_x - VIEW_RADIUS) / 32), (mario_x - VIEW_RADIUS) // 32 + 1)
+        x_last = min(level.levelLength, int((mario_x + VIEW_RADIUS) / 32) + 1) - 1
+        x_last = min(x_last, (mario_x + VIEW_RADIUS - 1) // 32)
+        y_first = max(0, int((mario_y - VIEW_RADIUS) / 32), (mario_y - VIEW_RADIUS) // 32 + 1)
+        y_last = min(15, int((mario_y + VIEW_RADIUS) / 32) + 1) - 1
+        y_last = min(y_last, (mario_y + VIEW_RADIUS - 1) // 32)
+        columns = max(0, x_last - x_first + 1)
+        rows = max(0, y_last - y_first + 1)
+        if columns:
+            rows = min(rows, (capacity - count) // columns)
+        tiles = rows * columns
+        if tiles:
+            block = objects[count:count + tiles].reshape(rows, columns, 3)
+            block[:, :, 0] = TILE_OFFSETS[:columns] + (x_first * 32 - mario_x)
+            block[:, :, 1] = (TILE_OFFSETS[:rows] + (y_first * 32 - mario_y))[:, None]
+            block[:, :, 2] = OBJECT_CODES["Tile"]
+            count += tiles
+
+        self.count = count
+        self.mask[:count] = True
+
+        # Fenêtre de la grille de collision, découpée aux bords de la grille (marge comprise)
+        grid = level.solidGrid
+        top = mario_y // 32 - SOLID_RADIUS + GRID_PADDING
+        left = mario_x // 32 - SOLID_RADIUS + GRID_PADDING
+        y0, x0 = max(top, 0), max(left, 0)
+        y1, x1 = min(top + SOLID_WINDOW, grid.shape[0]), min(left + SOLID_WINDOW, grid.shape[1])
+        if y1 > y0 and x1 > x0:
+            self.solid[y0 - top:y1 - top, x0 - left:x1 - left] = grid[y0:y1, x0:x1]
+        return self
+
+    def copy(self):
+        """Copie indépendante, qui n'est pas réécrite par les appels suivants de fill()"""
+        other = ArrayObservation(len(self.objects))
+        other.mario[:] = self.mario
+        other.objects[:] = self.objects
+        other.mask[:] = self.mask
+        other.count = self.count
+        other.solid[:] = self.solid
+        other.type_codes = self.type_codes
+        return other
+
+    def valid_objects(self):
+        """Vue des lignes valides de objects (sans copie)"""
+        return self.objects[:self.count]
+
+    def to_dict(self):
+        """Conversion vers l'état en dictionnaire de MarioEnv (pour l'affichage ou le débogage)"""
+        values = self.mario
+        return {
+            "game_state": self.game_state,
+            "mario_pos": [int(values[0]), int(values[1])],
+            "mario_vel": [float(values[2]), float(values[3])],
+            "mario_size": int(values[4]),
+            "nearby_objects": [[int(x), int(y), OBJECT_TYPES[code]] for x, y, code in self.valid_objects()],
+            "coins": int(values[5]),
+            "score": int(values[6]),
+            "time": int(values[7]),
+            "camera_x": float(values[8]),
+            "camera_y": float(values[9]),
+        }
@@ -14,9 +14,11 @@ import datetime
 from ai.mario_env import MarioEnv
 from ai.agents.GuidedAgent import GuidedAgent
 from ai.agents.ExploratoryAgent import ExploratoryAgent
+from classes.DirtyRects import screenUpdater
+from classes.Trace import TraceRecorder
 from utils import suppress_pygame_warnings
 
-def run_ai_mario(agent_type="guided", max_games=None, return_to_menu=True):
+def run_ai_mario(agent_type="guided", max_games=None, return_to_menu=True, max_speed=False, action_repeat=1, seed=None, trace_dir="traces"):
     """
     Fonction principale qui exécute Mario avec un agent IA en mode apprentissage continu.
     
@@ -24,6 +26,10 @@ def run_ai_mario(agent_type="guided", max_games=None, return_to_menu=True):
         agent_type (str): Le type d'agent IA à utiliser ('guided' ou 'exploratory')
         max_games (int): Nombre maximum de parties à jouer (None = illimité)
         return_to_menu (bool): Si True, retourne 'menu_principal' à la fin
+        max_speed (bool): Si True, supprime toutes les attentes en temps réel (entraînement)
+        action_repeat (int): Nombre de ticks de jeu pendant lesquels chaque décision de l'agent est appliquée
+        seed (int): Graine du monde et de l'agent ; même graine => mêmes parties (None = hasard)
+        trace_dir (str): Dossier où enregistrer la trace d'entrées de chaque partie (None = aucune)
         
     Returns:
         str: 'menu_principal' si return_to_menu est True, sinon None
@@ -36,15 +42,16 @@ def run_ai_mario(agent_type="guided", max_games=None, return_to_menu=True):
     # Utiliser le gestionnaire de contexte pour supprimer les avertissements
     with stderr_redirect():
         # Créer l'environnement
-        env = MarioEnv(agent_type=agent_type)
+        env = MarioEnv(agent_type=agent_type, max_speed=max_speed, seed=seed)
     
     # Créer l'agent selon le type choisi
     if agent_type == "guided":
-        agent = GuidedAgent()
+        agent = GuidedAgent(seed=seed)
     elif agent_type == "exploratory":
-        agent = ExploratoryAgent()
+        agent = ExploratoryAgent(seed=seed)
     else:  # Mode test ou autre
         agent = None
+    test_random = random.Random(seed)  # Actions aléatoires du mode test
     
     # Variables pour suivre l'état du jeu
     total_games = 0
@@ -61,29 +68,16 @@ def run_ai_mario(agent_type="guided", max_games=None, return_to_menu=True):
         print(f"\n--- Partie {total_games + 1} ---")
         total_games += 1
         
-        # Réinitialiser l'environnement
-        state = env.reset()
+        # Réinitialiser l'environnement directement au début du NIVEAU 1, sans passer par le menu
+        state = env.reset(level="Level1-1")
+        if trace_dir:
+            env.recorder = TraceRecorder("ai", [env.level.name], env.level_seed)
         done = False
         steps = 0
         total_reward = 0
         last_state = None
         last_action = None
         
-        # Séquence de navigation dans le menu pour sélectionner le NIVEAU 1
-        # Étape 1: Naviguer jusqu'à "Choose Level"
-        print("Navigation dans les menus...")
-        
-        # Attendre un peu pour s'assurer que le menu est chargé
-        pygame.time.delay(500)
-        
-        # Étape 2: Sélectionner "Choose Level" (première option)
-        env.step('select')
-        pygame.time.delay(300)
-        
-        # Étape 3: Sélectionner le premier niveau (déjà sélectionné par défaut)
-        env.step('select')
-        pygame.time.delay(1000)  # Attendre que le niveau se charge
-        
         print(f"Début du jeu avec l'agent {agent_type}...")
         # Boucle de jeu principale
         while not done and steps < 5000:  # Limite augmentée pour permettre des niveaux plus longs
@@ -111,14 +105,14 @@ def run_ai_mario(agent_type="guided", max_games=None, return_to_menu=True):
                 action = agent.choose_action(state)
             else:
                 # Mode test: actions aléatoires
-                action = env.actions[random.randint(0, len(env.actions)-1)]
+                action = env.actions[test_random.randint(0, len(env.actions)-1)]
             
             # Sauvegarder l'état et l'action actuels
             last_state = state
             last_action = action
             
             # Exécuter l'action dans l'environnement
-            next_state, reward, done, info = env.step(action)
+            next_state, reward, done, info = env.step(action, repeat=action_repeat)
             total_reward += reward
             
             # Mettre à jour l'état pour la prochaine itération
@@ -126,7 +120,8 @@ def run_ai_mario(agent_type="guided", max_games=None, return_to_menu=True):
             steps += 1
             
             # Ralentir un peu pour que le jeu soit visible mais pas trop lent
-            pygame.time.delay(5)  # Délai minimal pour permettre un apprentissage rapide
+            if not max_speed:
+                pygame.time.delay(5)  # Délai minimal pour permettre un apprentissage rapide
             
             # Afficher des statistiques moins fréquemment pour optimiser les performances
             if steps % 200 == 0:
@@ -145,6 +140,11 @@ def run_ai_mario(agent_type="guided", max_games=None, return_to_menu=True):
                 agent.train(last_state, last_action, final_reward, state, done)
             else:
                 agent.train(last_state, last_action, final_reward, state, done, info)
+        # Sauvegarder la trace d'entrées : de quoi rejouer la partie (classes.Trace.replayTrace)
+        if env.recorder is not None:
+            now = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            env.recorder.save(os.path.join(trace_dir, f"ia_{agent_type}_{now}_{total_games}.mtr"))
+            env.recorder = None
         # Afficher les statistiques de la partie
         if done:
             result_message = "Checkpoint atteint!" if info["game_state"] == "checkpoint_reached" else "Mario est mort"
@@ -208,7 +208,7 @@ def run_ai_mario(agent_type="guided", max_games=None, return_to_menu=True):
             text = font.render(f"Partie {total_games} terminée, prochaine partie...", True, (255, 255, 255))
             env.screen.fill((0, 0, 0))
             env.screen.blit(text, (100, 200))
-            pygame.display.update()
+            screenUpdater.presentAll()
             
             # Vérifier si l'utilisateur veut quitter
             for i in range(30):  # 3 secondes pour permettre à l'utilisateur d'annuler
@@ -7,6 +7,8 @@ from ai.mario_env import MarioEnv  # L'environnement que tu as créé
 env = MarioEnv()
 episodes = 10  # Nombre d’épisodes à jouer
 epsilon = 0.2  # Exploration vs exploitation
+action_repeat = 1  # Ticks de jeu par étape, pour toutes les actions (frame-skip, voir MarioEnv.step)
+jump_hold = 120  # Étapes pendant lesquelles un saut choisi est maintenu
 actions = env.actions
 
 # Table Q simplifiée (pas optimale pour un vrai entraînement)
@@ -29,18 +31,19 @@ for episode in range(episodes):
         if jump_frames > 0:
             action = 'jump'  # Maintenir l'action de saut
             jump_frames -= 1
-        elif np.random.rand() < epsilon:
-            action = np.random.choice(actions)
         else:
-            q_vals = [q_table.get((state_key, a), 0) for a in actions]
-            action = actions[np.argmax(q_vals)]
+            if np.random.rand() < epsilon:
+                action = np.random.choice(actions)
+            else:
+                q_vals = [q_table.get((state_key, a), 0) for a in actions]
+                action = actions[np.argmax(q_vals)]
+            # Si l'action choisie est 'jump', la maintenir pendant les jump_hold étapes
+            # suivantes, chacune avec sa propre mise à jour de la table Q
+            if action == 'jump':
+                jump_frames = jump_hold
 
-        # Si l'action choisie est 'jump', maintenir le saut pendant 25 frames
-        if action == 'jump':
-            jump_frames = 120
-
-        # Exécuter l’action
-        next_state, reward, done, _ = env.step(action)
+        # Exécuter l’action (même répétition pour toutes les actions)
+        next_state, reward, done, _ = env.step(action, repeat=action_repeat)
         env.render()  # Affiche le jeu à chaque frame
         time.sleep(0.2)  # Pour ralentir et rendre visible
 
@@ -0,0 +1,130 @@
+# vec_env.py
+
+"""
+Exécution de plusieurs mondes MarioEnv en parallèle, un par processus.
+
+Chaque processus de travail possède son propre MarioEnv en mode headless et
+max_speed. Le processus principal envoie un lot d'actions et reçoit en retour
+les observations, récompenses et fins de partie de tous les mondes. Une partie
+terminée est automatiquement réinitialisée : l'observation finale est alors
+transmise dans info["terminal_observation"].
+"""
+
+import multiprocessing
+import os
+import time
+import numpy as np
+
+
+def worker(remote, parent_remote, agent_type, level, action_repeat, seed):
+    """Boucle d'un processus de travail : exécute les commandes reçues par le pipe"""
+    parent_remote.close()
+    # Import local : pygame doit être initialisé dans le processus de travail
+    from ai.mario_env import MarioEnv
+
+    env = MarioEnv(agent_type=agent_type, headless=True, verbose=False, max_speed=True, seed=seed)
+    steps = 0
+    episodes = 0
+    busy_time = 0.0
+    try:
+        while True:
+            command, data = remote.recv()
+            if command == "step":
+                start = time.perf_counter()
+                state, reward, done, info = env.step(data, repeat=action_repeat)
+                if done:
+                    # Réinitialisation automatique de la partie terminée
+                    info["terminal_observation"] = state
+                    state = env.reset(level=level)
+                    episodes += 1
+                busy_time += time.perf_counter() - start
+                steps += 1
+                remote.send((state, reward, done, info))
+            elif command == "reset":
+                remote.send(env.reset(level=level))
+            elif command == "stats":
+                remote.send({
+                    "pid": os.getpid(),
+                    "steps": steps,
+                    "episodes": episodes,
+                    "busy_time": busy_time,
+                    "steps_per_second": steps / busy_time if busy_time > 0 else 0.0,
+                })
+            elif command == "close":
+                break
+            else:
+                raise ValueError(f"Commande inconnue: {command}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        env.close()
+        remote.close()
+
+
+class MarioVecEnv:
+    def __init__(self, num_envs=None, agent_type="guided", level="Level1-1", action_repeat=1, seed=None):
+        """
+        Args:
+            num_envs (int): nombre de mondes (et de processus) ; par défaut un par cœur
+            agent_type (str): 'guided' ou 'exploratory', transmis à chaque MarioEnv
+            level (str): niveau dans lequel chaque partie démarre (voir MarioEnv.reset)
+            action_repeat (int): ticks de jeu par action (voir MarioEnv.step)
+            seed (int): graine du premier monde ; le monde i reçoit seed + i (None : hasard)
+        """
+        self.num_envs = num_envs or os.cpu_count() or 1
+        self.closed = False
+        # "spawn" : chaque processus démarre avec un pygame neuf, sans état hérité
+        ctx = multiprocessing.get_context("spawn")
+        self.remotes, work_remotes = zip(*[ctx.Pipe() for _ in range(self.num_envs)])
+        self.processes = []
+        for index, (work_remote, remote) in enumerate(zip(work_remotes, self.remotes)):
+            worker_seed = seed + index if seed is not None else None
+            process = ctx.Process(
+                target=worker,
+                args=(work_remote, remote, agent_type, level, action_repeat, worker_seed),
+                daemon=True,
+            )
+            process.start()
+            self.processes.append(process)
+            work_remote.close()
+
+    def reset(self):
+        """Réinitialise tous les mondes et retourne la liste des premiers états de jeu"""
+        for remote in self.remotes:
+            remote.send(("reset", None))
+        return [remote.recv() for remote in self.remotes]
+
+    def step(self, actions):
+        """
+        Exécute une action dans chaque monde.
+
+        Args:
+            actions: une action par monde, dans l'ordre des mondes
+
+        Returns:
+            tuple: (états, récompenses, fins de partie, infos) ; les récompenses et
+            fins de partie sont des tableaux numpy de taille num_envs
+        """
+        if len(actions) != self.num_envs:
+            raise ValueError(f"{len(actions)} actions reçues pour {self.num_envs} mondes")
+        for remote, action in zip(self.remotes, actions):
+            remote.send(("step", action))
+        results = [remote.recv() for remote in self.remotes]
+        states, rewards, dones, infos = zip(*results)
+        return list(states), np.array(rewards, dtype=np.float32), np.array(dones, dtype=bool), list(infos)
+
+    def get_throughput(self):
+        """Retourne les statistiques de débit mesurées par chaque processus de travail"""
+        for remote in self.remotes:
+            remote.send(("stats", None))
+        return [remote.recv() for remote in self.remotes]
+
+    def close(self):
+        """Arrête les processus de travail"""
+        if self.closed:
+            return
+        for remote in self.remotes:
+            remote.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self.closed = True
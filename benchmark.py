@@ -0,0 +1,545 @@
+"""
+Mesures de performance de la simulation Super Mario Python.
+
+Usage :
+    python benchmark.py env [--steps 3000] [--repeat 1] [--observation dict|array]
+    python benchmark.py vec [--envs N] [--steps 1000] [--repeat 1]
+    python benchmark.py replay traces/*.mtr
+    python benchmark.py trace [--rounds 3] [--ticks 10]
+    python benchmark.py collider [traces/*.mtr]
+    python benchmark.py crowd [--mobs 300] [--ticks 600] [--batch] [--all-active]
+    python benchmark.py startup [--resets 20]
+    python benchmark.py render [--steps 600]
+    python benchmark.py hud [--frames 600]
+    python benchmark.py snapshot [--at 60] [--steps 600]
+
+Chaque mode est mesuré dans un processus séparé, car le pilote vidéo SDL
+est choisi une seule fois, à l'initialisation de pygame.
+"""
+
+import argparse
+import importlib
+import multiprocessing
+import os
+import queue
+import sys
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Séquence d'actions fixe, pour que les deux modes jouent la même partie
+ACTION_PATTERN = ['right', 'right', 'right', 'jump']
+LEVEL = "Level1-1"
+OTHER_LEVEL = "Level1-2"  # Second niveau, pour vérifier un reset() direct vers un autre niveau
+SEED = 0  # Graine fixe : les deux modes et deux versions du code jouent exactement la même partie
+POLL_SECONDS = 1.0  # Attente entre deux vérifications que le processus de mesure est vivant
+
+
+def run_measure(target, *args):
+    """
+    Lance target(*args, queue) dans un processus neuf et renvoie ce qu'il a mis dans la file.
+    Si le processus s'arrête sans résultat (exception, pilote absent...), le signale et quitte
+    au lieu d'attendre indéfiniment.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    proc = ctx.Process(target=target, args=args + (results,))
+    proc.start()
+    while True:
+        try:
+            result = results.get(timeout=POLL_SECONDS)
+            break
+        except queue.Empty:
+            if not proc.is_alive():
+                proc.join()
+                sys.exit(f"{target.__name__} : le processus de mesure s'est arrêté sans résultat (code {proc.exitcode})")
+    proc.join()
+    return result
+
+
+def run_env(headless, steps, repeat, observation, queue):
+    """Joue `steps` décisions dans un MarioEnv et renvoie le débit via `queue`"""
+    from ai.mario_env import MarioEnv
+
+    # max_speed : pas de limite d'images par seconde, on mesure le coût brut
+    env = MarioEnv(agent_type="guided", headless=headless, verbose=False, max_speed=True, seed=SEED,
+                   observation=observation)
+    env.reset(level=LEVEL)
+    done_steps = 0
+    episodes = 1
+    start = time.perf_counter()
+    while done_steps < steps:
+        action = ACTION_PATTERN[done_steps % len(ACTION_PATTERN)]
+        _, _, done, _ = env.step(action, repeat=repeat)
+        done_steps += 1
+        if done:
+            env.reset(level=LEVEL)
+            episodes += 1
+    elapsed = time.perf_counter() - start
+    env.close()
+    queue.put((done_steps, elapsed, episodes))
+
+
+def bench_env(args):
+    results = {}
+    for label, headless in (("avec affichage", False), ("headless", True)):
+        done_steps, elapsed, episodes = run_measure(run_env, headless, args.steps, args.repeat, args.observation)
+        results[label] = done_steps / elapsed
+        print(f"{label:>15}: {done_steps} étapes en {elapsed:.2f} s "
+              f"({episodes} parties) -> {results[label]:.0f} étapes/s")
+    print(f"Accélération headless : x{results['headless'] / results['avec affichage']:.2f}")
+
+
+def bench_vec(args):
+    from ai.vec_env import MarioVecEnv
+
+    vec_env = MarioVecEnv(num_envs=args.envs, level=LEVEL, action_repeat=args.repeat, seed=SEED)
+    vec_env.reset()
+    start = time.perf_counter()
+    for step in range(args.steps):
+        action = ACTION_PATTERN[step % len(ACTION_PATTERN)]
+        vec_env.step([action] * vec_env.num_envs)
+    elapsed = time.perf_counter() - start
+    for stats in vec_env.get_throughput():
+        print(f"  processus {stats['pid']}: {stats['steps']} étapes, {stats['episodes']} parties "
+              f"-> {stats['steps_per_second']:.0f} étapes/s")
+    vec_env.close()
+    total = args.steps * vec_env.num_envs
+    print(f"{vec_env.num_envs} mondes: {total} étapes en {elapsed:.2f} s -> {total / elapsed:.0f} étapes/s au total")
+
+
+def bench_replay(args):
+    """Rejoue des traces d'entrées sans affichage : débit brut de la physique"""
+    from classes.Trace import Trace, replayTrace
+
+    total_ticks = 0
+    total_seconds = 0.0
+    for path in args.traces:
+        trace = Trace.load(path)
+        result = replayTrace(trace)
+        total_ticks += result["ticks"]
+        total_seconds += result["seconds"]
+        print(f"{path}: trace {trace.kind}, {'/'.join(trace.levels)}, graine {trace.seed} -> "
+              f"{result['ticks']} ticks en {result['seconds']:.2f} s ({result['ticks_per_second']:.0f} ticks/s), "
+              f"x={result['x']} points={result['points']}")
+    if len(args.traces) > 1 and total_seconds > 0:
+        print(f"Total : {total_ticks} ticks -> {total_ticks / total_seconds:.0f} ticks/s")
+
+
+def bench_trace(args):
+    """
+    Vérifie l'aller-retour des traces "ai" : une partie qui joue chaque action de MarioEnv
+    (kill_jump en dernier, elle termine la partie) est enregistrée, encodée, relue puis rejouée
+    """
+    from ai.mario_env import MarioEnv
+    from classes.Trace import AI_ACTIONS, Trace, TraceRecorder, replayTrace
+
+    env = MarioEnv(agent_type="guided", headless=True, verbose=False, max_speed=True, seed=SEED)
+    actions = list(env.actions) + ['kill_jump']
+    missing = sorted(set(actions) - set(AI_ACTIONS))
+    if missing:
+        sys.exit(f"actions de MarioEnv sans code de trace : {missing}")
+    try:
+        TraceRecorder("ai", [LEVEL], SEED).recordAction('select')
+        sys.exit("recordAction('select') aurait dû lever ValueError")
+    except ValueError:
+        pass
+
+    env.reset(level=LEVEL)
+    env.recorder = TraceRecorder("ai", [env.level.name], env.level_seed)
+    played = []
+    for action in [action for _ in range(args.rounds) for action in env.actions for _ in range(args.ticks)] + ['kill_jump']:
+        if env.done:
+            break
+        env.step_tick(action)
+        played.append(action)
+    data = env.recorder.toBytes()
+    trace = Trace.fromBytes(data)
+    decoded = [AI_ACTIONS[code] for code in trace.codes]
+    result = replayTrace(trace)
+    expected = (env.mario.rect.x, env.mario.rect.y, env.dashboard.points, env.game_state)
+    replayed = (result["x"], result["y"], result["points"], result["game_state"])
+    env.close()
+    if decoded != played:
+        step = next((i for i, (a, b) in enumerate(zip(decoded, played)) if a != b), min(len(decoded), len(played)))
+        sys.exit(f"trace relue différente de la partie à l'étape {step}")
+    if replayed != expected:
+        sys.exit(f"rejeu différent de la partie : {replayed}, attendu {expected}")
+    if set(played) != set(actions):
+        sys.exit(f"partie terminée avant d'avoir joué {sorted(set(actions) - set(played))} : réduire --rounds ou --ticks")
+    print(f"{len(played)} ticks ({', '.join(sorted(set(played)))}) -> {len(data)} octets, "
+          f"relus et rejoués à l'identique : {replayed}")
+
+
+# Modules qui construisent des Collider (nom importé à la construction des entités)
+COLLIDER_MODULES = ("entities.Mario", "entities.Goomba", "entities.Koopa", "entities.Mushroom", "traits.leftrightwalk")
+
+
+def record_pattern_trace():
+    """Enregistre une partie jouée avec ACTION_PATTERN (graine SEED), jusqu'à la fin de la partie"""
+    from ai.mario_env import MarioEnv
+    from classes.Trace import TraceRecorder
+
+    env = MarioEnv(agent_type="guided", headless=True, verbose=False, max_speed=True, seed=SEED)
+    env.reset(level=LEVEL)
+    env.recorder = TraceRecorder("ai", [env.level.name], env.level_seed)
+    step = 0
+    while not env.done and step < 5000:
+        env.step(ACTION_PATTERN[step % len(ACTION_PATTERN)])
+        step += 1
+    return env.recorder
+
+
+def timed_collider(colliderClass):
+    """Sous-classe qui cumule le nombre d'appels et le temps passé dans checkX/checkY"""
+    class TimedCollider(colliderClass):
+        calls = 0
+        seconds = 0.0
+
+        def checkX(self):
+            start = time.perf_counter()
+            colliderClass.checkX(self)
+            TimedCollider.seconds += time.perf_counter() - start
+            TimedCollider.calls += 1
+
+        def checkY(self):
+            start = time.perf_counter()
+            colliderClass.checkY(self)
+            TimedCollider.seconds += time.perf_counter() - start
+            TimedCollider.calls += 1
+
+    return TimedCollider
+
+
+def replay_with_collider(trace, colliderClass):
+    """Rejoue la trace avec `colliderClass` ; retourne l'empreinte de chaque tick et le chronométrage"""
+    from classes.Trace import replayTrace
+
+    timed = timed_collider(colliderClass)
+    for name in COLLIDER_MODULES:
+        importlib.import_module(name).Collider = timed
+    fingerprints = []
+
+    def on_tick(level, mario):
+        state = (mario.getState(), [entity.getState() for entity in level.entityList])
+        fingerprints.append(zlib.crc32(repr(state).encode()))
+
+    replayTrace(trace, on_tick)
+    return fingerprints, timed.calls, timed.seconds
+
+
+def bench_collider(args):
+    """Vérifie que Collider reproduit ReferenceCollider tick par tick, et compare leur coût"""
+    from classes.Collider import Collider, ReferenceCollider
+    from classes.Trace import Trace
+
+    traces = [(path, Trace.load(path)) for path in args.traces] or [("partie ACTION_PATTERN", record_pattern_trace())]
+    totals = {"référence": [0, 0.0], "grille": [0, 0.0]}
+    try:
+        for path, trace in traces:
+            reference, calls, seconds = replay_with_collider(trace, ReferenceCollider)
+            totals["référence"][0] += calls
+            totals["référence"][1] += seconds
+            fingerprints, calls, seconds = replay_with_collider(trace, Collider)
+            totals["grille"][0] += calls
+            totals["grille"][1] += seconds
+            mismatch = next((tick for tick, (a, b) in enumerate(zip(reference, fingerprints)) if a != b), None)
+            if mismatch is None and len(reference) == len(fingerprints):
+                print(f"{path}: {len(reference)} ticks identiques")
+            else:
+                print(f"{path}: DIVERGENCE au tick {mismatch if mismatch is not None else min(len(reference), len(fingerprints))}")
+    finally:
+        for name in COLLIDER_MODULES:
+            importlib.import_module(name).Collider = Collider
+    for label, (calls, seconds) in totals.items():
+        print(f"{label:>10}: {calls} appels checkX/checkY -> {seconds / calls * 1e6:.2f} µs par appel")
+    print(f"Accélération : x{(totals['référence'][1] / totals['référence'][0]) / (totals['grille'][1] / totals['grille'][0]):.2f}")
+
+
+def bench_crowd(args):
+    """Niveau peuplé de --mobs ennemis ajoutés au hasard (graine SEED) : coût par tick de simulation"""
+    import random
+    from ai.mario_env import MarioEnv
+
+    env = MarioEnv(agent_type="guided", headless=True, verbose=False, max_speed=True, seed=SEED)
+    env.reset(level=LEVEL)
+    if args.batch:
+        from classes.MobStore import MobStore
+        env.level.mobStore = MobStore(env.level)
+    if args.all_active:
+        env.level.activationMargins = None
+    rng = random.Random(SEED)
+    for _ in range(args.mobs):
+        # Coordonnées dans l'ordre des fichiers de niveau (voir Level.addGoomba / addKoopa)
+        column, row = rng.randrange(12, env.level.levelLength - 5), rng.randrange(2, 11)
+        if rng.random() < 0.7:
+            env.level.addGoomba(row, column + 1)
+        else:
+            env.level.addKoopa(row + 1, column)
+    start = time.perf_counter()
+    for tick in range(args.ticks):
+        if env.done:
+            env.level.simulate(env.mario.camera)  # Mario mort : le reste du niveau continue
+        else:
+            env.step_tick(ACTION_PATTERN[(tick // 8) % len(ACTION_PATTERN)])
+    elapsed = time.perf_counter() - start
+    env.close()
+    print(f"{args.mobs} ennemis ajoutés, {len(env.level.entityList)} entités restantes : "
+          f"{args.ticks} ticks en {elapsed:.2f} s -> {args.ticks / elapsed:.0f} ticks/s")
+
+
+def run_startup(resets, queue):
+    """
+    Chronomètre, dans un processus neuf, l'import de MarioEnv, sa création, ses reset(),
+    puis la création d'un second MarioEnv dans le même processus. Relève aussi le tableau
+    de bord après un reset() direct sur un autre niveau, qui doit être celui du menu
+    """
+    start_import = time.perf_counter()
+    from ai.mario_env import MarioEnv
+    imported = time.perf_counter()
+    env = MarioEnv(agent_type="guided", headless=True, verbose=False, max_speed=True, seed=SEED)
+    created = time.perf_counter()
+    env.reset(level=LEVEL)
+    first_reset = time.perf_counter()
+    for _ in range(resets):
+        env.reset(level=LEVEL)
+    elapsed = time.perf_counter() - first_reset
+    env.step('right')
+    env.reset(level=OTHER_LEVEL)
+    dashboard = (env.dashboard.getState(), env.clone_state()["dashboard"])
+    env.close()
+    start = time.perf_counter()
+    env = MarioEnv(agent_type="guided", headless=True, verbose=False, max_speed=True, seed=SEED)
+    env.reset(level=LEVEL)
+    second = time.perf_counter() - start
+    env.close()
+    queue.put((imported - start_import, created - imported, first_reset - created, elapsed / resets, second, dashboard))
+
+
+def bench_startup(args):
+    imported, created, first_reset, reset, second, dashboard = run_measure(run_startup, args.resets)
+    print(f"import de MarioEnv : {imported * 1e3:.0f} ms")
+    print(f"création de MarioEnv : {created * 1e3:.0f} ms")
+    print(f"premier reset : {first_reset * 1e3:.1f} ms")
+    print(f"reset suivants : {reset * 1e3:.2f} ms en moyenne ({args.resets})")
+    print(f"démarrage jusqu'au premier reset : {(imported + created + first_reset) * 1e3:.0f} ms")
+    print(f"second MarioEnv, création et reset : {second * 1e3:.0f} ms")
+    # Même tableau de bord qu'après le choix de OTHER_LEVEL dans le menu (Menu.checkInput)
+    expected = ("start", OTHER_LEVEL.split("Level")[1], 0, 0, 0, 0)
+    state, cloned = dashboard
+    if state != expected or cloned != expected:
+        sys.exit(f"tableau de bord après reset(level={OTHER_LEVEL!r}) : {state}, instantané {cloned}, attendu {expected}")
+    print(f"tableau de bord après reset(level={OTHER_LEVEL!r}) : {state}")
+
+
+def run_render(convert, steps, queue):
+    """Coût du dessin d'une image (Level.render puis MarioEnv.render complet), ressources converties ou non"""
+    import ai.mario_env as mario_env
+    if not convert:
+        mario_env.convertAssets = lambda: False
+    env = mario_env.MarioEnv(agent_type="guided", headless=False, verbose=False, max_speed=True, seed=SEED)
+    env.reset(level=LEVEL)
+    level_time = frame_time = 0.0
+    for step in range(steps):
+        _, _, done, _ = env.step(ACTION_PATTERN[step % len(ACTION_PATTERN)])
+        if done:
+            env.reset(level=LEVEL)
+        start = time.perf_counter()
+        env.level.render(env.mario.camera)
+        drawn = time.perf_counter()
+        env.render()
+        frame_time += time.perf_counter() - drawn
+        level_time += drawn - start
+    env.close()
+    queue.put((level_time / steps, frame_time / steps))
+
+
+def bench_render(args):
+    results = {}
+    for label, convert in (("sans conversion", False), ("convertAssets", True)):
+        results[label] = run_measure(run_render, convert, args.steps)
+        level_time, frame_time = results[label]
+        print(f"{label:>15}: Level.render {level_time * 1e6:.0f} us, image complète {frame_time * 1e6:.0f} us")
+    before, after = results["sans conversion"], results["convertAssets"]
+    print(f"Gain : Level.render x{before[0] / after[0]:.2f}, image complète x{before[1] / after[1]:.2f}")
+
+
+def draw_text_uncached(dashboard, text, x, y, size):
+    """Dashboard.drawText d'origine : chaque caractère remis à l'échelle à chaque appel"""
+    import pygame
+    for char in text:
+        charSprite = pygame.transform.scale(dashboard.charSprites[char], (size, size))
+        dashboard.screen.blit(charSprite, (x, y))
+        if char == " ":
+            x += size//2
+        else:
+            x += size
+
+
+def run_hud(cached, frames, queue):
+    """Coût de Dashboard.draw et nombre de pygame.transform.scale par image, pendant une partie"""
+    import pygame
+    from ai.mario_env import MarioEnv
+    from classes.Dashboard import Dashboard
+    if not cached:
+        Dashboard.drawText = draw_text_uncached
+    scales = [0]
+    scale = pygame.transform.scale
+
+    def counted_scale(*args):
+        scales[0] += 1
+        return scale(*args)
+
+    env = MarioEnv(agent_type="guided", headless=False, verbose=False, max_speed=True, seed=SEED)
+    env.reset(level=LEVEL)
+    pygame.transform.scale = counted_scale
+    elapsed = 0.0
+    for step in range(frames):
+        _, _, done, _ = env.step(ACTION_PATTERN[step % len(ACTION_PATTERN)])
+        if done:
+            env.reset(level=LEVEL)
+        scales[0] = 0
+        start = time.perf_counter()
+        env.dashboard.draw()
+        elapsed += time.perf_counter() - start
+    env.close()
+    queue.put((elapsed / frames, scales[0]))
+
+
+def bench_hud(args):
+    results = {}
+    for label, cached in (("sans cache", False), ("avec cache", True)):
+        results[label] = run_measure(run_hud, cached, args.frames)
+        draw_time, scales = results[label]
+        print(f"{label:>10}: Dashboard.draw {draw_time * 1e6:.0f} us, {scales} transform.scale (dernière image)")
+    print(f"Gain : x{results['sans cache'][0] / results['avec cache'][0]:.1f}")
+
+
+def snapshot_fingerprint(env):
+    """Empreinte de la partie : Mario, entités, tableau de bord et graine du monde"""
+    state = (env.level.seed, env.mario.getState(), env.dashboard.getState(),
+             [(entity.uid, entity.getState()) for entity in env.level.entityList if not entity.removed])
+    return zlib.crc32(repr(state).encode())
+
+
+def bench_snapshot(args):
+    """
+    Vérifie qu'un instantané restauré rejoue la même partie : dans le même MarioEnv après avoir
+    continué à jouer, et dans un second MarioEnv (autre graine, autre niveau en cours)
+    """
+    import random
+    from ai.mario_env import MarioEnv
+
+    # Partie qui dépasse les Koopa de Level1-1 (x=1024 et 1248), apparus après la capture
+    rng = random.Random(SEED)
+    actions = [rng.choice(['right', 'right', 'jump', 'right', 'idle']) for _ in range(args.at + args.steps)]
+    before, actions = actions[:args.at], actions[args.at:]
+
+    def play(env):
+        fingerprints = []
+        for action in actions:
+            _, _, done, _ = env.step(action)
+            fingerprints.append(snapshot_fingerprint(env))
+            if done:
+                break
+        return fingerprints
+
+    env = MarioEnv(agent_type="guided", headless=True, verbose=False, max_speed=True, seed=SEED)
+    env.reset(level=LEVEL)
+    for action in before:
+        env.step(action)
+    start = time.perf_counter()
+    snapshot = env.clone_state()
+    clone_time = time.perf_counter() - start
+    reference = play(env)
+
+    other = MarioEnv(agent_type="guided", headless=True, verbose=False, max_speed=True, seed=SEED + 1)
+    other.reset(level=LEVEL)
+    for step in range(args.at // 2):
+        other.step(ACTION_PATTERN[step % len(ACTION_PATTERN)])
+    failed = False
+    for label, target in (("même MarioEnv", env), ("second MarioEnv", other)):
+        start = time.perf_counter()
+        target.restore_state(snapshot)
+        restore_time = time.perf_counter() - start
+        fingerprints = play(target)
+        mismatch = next((step for step, (a, b) in enumerate(zip(reference, fingerprints)) if a != b), None)
+        if mismatch is None and len(reference) == len(fingerprints):
+            print(f"{label:>16}: {len(reference)} étapes identiques (restore_state {restore_time * 1e3:.2f} ms)")
+        else:
+            failed = True
+            print(f"{label:>16}: DIVERGENCE à l'étape {mismatch if mismatch is not None else min(len(reference), len(fingerprints))}")
+    env.close()
+    other.close()
+    print(f"clone_state : {clone_time * 1e3:.2f} ms")
+    if failed:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    env_parser = sub.add_parser("env", help="débit de MarioEnv.step(), avec affichage vs headless")
+    env_parser.add_argument("--steps", type=int, default=3000)
+    env_parser.add_argument("--repeat", type=int, default=1, help="ticks de jeu par décision (frame-skip)")
+    env_parser.add_argument("--observation", choices=("dict", "array"), default="dict",
+                            help="format de l'état retourné par step()")
+    env_parser.set_defaults(func=bench_env)
+
+    vec_parser = sub.add_parser("vec", help="débit total de MarioVecEnv.step() sur plusieurs processus")
+    vec_parser.add_argument("--envs", type=int, default=None, help="nombre de mondes (défaut : un par cœur)")
+    vec_parser.add_argument("--steps", type=int, default=1000)
+    vec_parser.add_argument("--repeat", type=int, default=1, help="ticks de jeu par décision (frame-skip)")
+    vec_parser.set_defaults(func=bench_vec)
+
+    replay_parser = sub.add_parser("replay", help="rejeu headless de traces d'entrées (ticks/s)")
+    replay_parser.add_argument("traces", nargs="+", type=os.path.abspath, help="fichiers .mtr (dossier traces/)")
+    replay_parser.set_defaults(func=bench_replay)
+
+    trace_parser = sub.add_parser("trace", help="aller-retour des traces : chaque action de MarioEnv enregistrée, relue et rejouée")
+    trace_parser.add_argument("--rounds", type=int, default=3, help="passages sur la liste des actions")
+    trace_parser.add_argument("--ticks", type=int, default=10, help="ticks consécutifs par action")
+    trace_parser.set_defaults(func=bench_trace)
+
+    collider_parser = sub.add_parser("collider", help="Collider vs implémentation d'origine : rejeu identique et coût par appel")
+    collider_parser.add_argument("traces", nargs="*", type=os.path.abspath,
+                                 help="fichiers .mtr (défaut : une partie jouée avec ACTION_PATTERN)")
+    collider_parser.set_defaults(func=bench_collider)
+
+    crowd_parser = sub.add_parser("crowd", help="débit de simulation d'un niveau peuplé de nombreux ennemis")
+    crowd_parser.add_argument("--mobs", type=int, default=300)
+    crowd_parser.add_argument("--ticks", type=int, default=600)
+    crowd_parser.add_argument("--batch", action="store_true", help="physique groupée des ennemis (MobStore)")
+    crowd_parser.add_argument("--all-active", action="store_true",
+                              help="simuler tout le niveau, sans fenêtre d'activation autour de la caméra")
+    crowd_parser.set_defaults(func=bench_crowd)
+
+    startup_parser = sub.add_parser("startup", help="temps de démarrage et de reset() de MarioEnv (chargement des ressources)")
+    startup_parser.add_argument("--resets", type=int, default=20)
+    startup_parser.set_defaults(func=bench_startup)
+
+    render_parser = sub.add_parser("render", help="coût du dessin d'une image, avec et sans conversion des ressources")
+    render_parser.add_argument("--steps", type=int, default=600)
+    render_parser.set_defaults(func=bench_render)
+
+    hud_parser = sub.add_parser("hud", help="coût du tableau de bord, texte recomposé à chaque image vs mis en cache")
+    hud_parser.add_argument("--frames", type=int, default=600)
+    hud_parser.set_defaults(func=bench_hud)
+
+    snapshot_parser = sub.add_parser("snapshot", help="clone_state/restore_state : même partie rejouée, dans le même MarioEnv et dans un autre")
+    snapshot_parser.add_argument("--at", type=int, default=60, help="étape de la capture")
+    snapshot_parser.add_argument("--steps", type=int, default=540, help="étapes rejouées après la capture")
+    snapshot_parser.set_defaults(func=bench_snapshot)
+
+    args = parser.parse_args()
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    # Le son ne fait partie d'aucune mesure : sans périphérique audio, Sound() échouerait
+    # dans les modes avec affichage (les processus de mesure héritent de l'environnement)
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,25 @@ class Animation:
                 self.index = 0
         self.image = self.images[self.index]
 
+    def getState(self):
+        # L'image courante est repérée par son rôle, les surfaces n'étant pas picklables
+        if self.image is self.idleSprite and self.idleSprite is not None:
+            imageCode = "idle"
+        elif self.image is self.airSprite and self.airSprite is not None:
+            imageCode = "air"
+        else:
+            imageCode = None
+        return (self.timer, self.index, self.deltaTime, imageCode)
+
+    def setState(self, state):
+        self.timer, self.index, self.deltaTime, imageCode = state
+        if imageCode == "idle":
+            self.image = self.idleSprite
+        elif imageCode == "air":
+            self.image = self.airSprite
+        else:
+            self.image = self.images[self.index]
+
     def idle(self):
         self.image = self.idleSprite
 
@@ -0,0 +1,95 @@
+"""
+Finalisation des ressources graphiques partagées (planches, sprites, animations,
+caractères des polices) : une fois la fenêtre créée, leurs surfaces sont converties au
+format de l'écran. Sinon SDL convertit les pixels à chaque blit.
+
+Les ressources sont chargées avant la fenêtre (entities.Mario charge les sprites dès son
+import) : la conversion remplace donc les surfaces en place, dans les objets partagés.
+"""
+
+import pygame
+
+from classes.Font import Font
+from classes.Sprites import Sprites
+from classes.Spritesheet import Spritesheet
+
+# Format de l'écran visé et surfaces déjà converties pour lui : id(origine) -> (origine, copie).
+# L'origine reste référencée, pour que son id ne soit pas réutilisé par une autre surface.
+convertedFormat = None
+convertedSurfaces = {}
+
+
+def displayFormat():
+    screen = pygame.display.get_surface()
+    if screen is None:
+        return None
+    return screen.get_bitsize(), screen.get_masks()
+
+
+def convertSurface(surface):
+    """Copie de `surface` au format de l'écran ; garde la couche alpha, la couleur transparente et RLEACCEL"""
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+    return surface.convert()
+
+
+def convertAssets():
+    """
+    Convertit au format de l'écran courant les ressources chargées depuis le dernier appel
+    (les autres le sont déjà). Sans fenêtre (mode headless avant set_mode, pilote sans
+    affichage) ne fait rien et renvoie False : les surfaces d'origine restent utilisables.
+    """
+    global convertedFormat, convertedSurfaces
+    target = displayFormat()
+    if target is None:
+        return False
+    if target != convertedFormat:
+        convertedFormat = target
+        convertedSurfaces = {}
+    # Copies déjà converties : laissées telles quelles si on les retrouve
+    done = {id(copy) for _, copy in convertedSurfaces.values()}
+
+    def convert(surface):
+        if surface is None or id(surface) in done:
+            return surface
+        # Une surface partagée par plusieurs sprites n'est convertie qu'une fois
+        entry = convertedSurfaces.get(id(surface))
+        if entry is None:
+            parent = surface.get_parent()
+            if parent is None:
+                copy = convertSurface(surface)
+            else:
+                # Sprite de l'atlas : sous-surface de l'atlas converti, qui reste une seule image
+                copy = convert(parent).subsurface((surface.get_offset(), surface.get_size()))
+                if surface.get_colorkey() is not None:
+                    rle = pygame.RLEACCEL if surface.get_flags() & pygame.RLEACCELOK else 0
+                    copy.set_colorkey(surface.get_colorkey(), rle)
+            entry = convertedSurfaces[id(surface)] = (surface, copy)
+            done.add(id(copy))
+        return entry[1]
+
+    try:
+        for filename, sheet in Spritesheet.sheets.items():
+            Spritesheet.sheets[filename] = convert(sheet)
+        if Sprites.collection is not None:
+            for sprite in Sprites.collection.values():
+                sprite.image = convert(sprite.image)
+                animation = sprite.animation
+                if animation is not None:
+                    # En place : les copies d'animation des entités partagent cette liste
+                    animation.images[:] = [convert(image) for image in animation.images]
+                    animation.image = convert(animation.image)
+                    animation.idleSprite = convert(animation.idleSprite)
+                    animation.airSprite = convert(animation.airSprite)
+        glyphsChanged = False
+        for glyphs in Font.glyphs.values():
+            for char, glyph in glyphs.items():
+                glyphs[char] = convert(glyph)
+                glyphsChanged = glyphsChanged or glyphs[char] is not glyph
+        if glyphsChanged:
+            # Textes agrandis depuis les anciens caractères : refaits au format de l'écran
+            Font.clearRenderedText()
+    except pygame.error as e:
+        print(f"Conversion des ressources impossible: {e}")
+        return False
+    return True
@@ -0,0 +1,160 @@
+import math
+
+import pygame
+
+from classes.DirtyRects import screenUpdater
+
+SCREEN_ROWS = 15  # lignes de tuiles dessinées par Level.render
+CHUNK_COLUMNS = 20  # largeur d'un morceau de fond, en tuiles (une largeur d'écran)
+CHUNK_CAPACITY = 4  # morceaux gardés en mémoire ; les moins récemment dessinés sont réutilisés
+# Couleurs possibles pour les cases transparentes d'un morceau (sans sprite, ou sprite à
+# couleur transparente) ; la première absente des sprites est retenue
+TRANSPARENT_COLORS = ((255, 0, 255), (0, 255, 255), (1, 254, 3))
+
+
+class Chunk:
+    __slots__ = ("surface", "animated")
+
+    def __init__(self, surface, animated):
+        self.surface = surface
+        # Cases dont le sprite est animé, dessinées à chaque image : (y, x, sprite)
+        self.animated = animated
+
+
+class Background:
+    """
+    Fond statique d'un niveau, dessiné par morceaux de CHUNK_COLUMNS colonnes.
+
+    Chaque morceau est rendu une fois (ciel, sol, tuyaux, buissons, nuages), puis chaque
+    image de Level.render ne blitte que les un ou deux morceaux visibles au lieu de
+    15 x 22 tuiles. Seuls CHUNK_CAPACITY morceaux sont gardés : un long niveau n'a jamais
+    plus de quelques écrans de fond en mémoire. Les cases sans sprite restent transparentes
+    (couleur transparente du morceau) : ce qui est dessiné dessous reste visible, comme avant.
+
+    Level appelle invalidate() quand une tuile change et clear() à chaque chargement.
+    """
+
+    # Couleurs de TRANSPARENT_COLORS présentes dans chaque image : id(image) -> (image, couleurs)
+    colorsInImages = {}
+
+    def __init__(self, level):
+        self.level = level
+        self.chunks = {}  # indice -> Chunk, du moins au plus récemment dessiné
+        self.spare = []  # surfaces de morceaux évincés, réutilisées
+        self.transparentColor = None
+
+    def clear(self):
+        for chunk in self.chunks.values():
+            self.spare.append(chunk.surface)
+        self.chunks = {}
+
+    def invalidate(self, x):
+        """La colonne x a changé : son morceau sera rendu de nouveau"""
+        chunk = self.chunks.pop(x // CHUNK_COLUMNS, None)
+        if chunk is not None:
+            self.spare.append(chunk.surface)
+
+    def draw(self, camera):
+        """
+        Dessine le fond visible. Renvoie False si la fenêtre de la caméra sort du niveau
+        (ou si aucune couleur transparente n'est utilisable) : Level.render dessine alors
+        les tuiles une à une, comme avant.
+        """
+        level = self.level.level
+        offset = camera.pos.x
+        # Colonnes parcourues par Level.renderTiles : les indices négatifs y désignent la fin
+        # du niveau (visible si la caméra dépasse 0), et au-delà de la dernière colonne
+        # l'IndexError interrompt le dessin ; ces deux cas restent à Level.renderTiles
+        first = -int(offset + 1)
+        last = 20 - int(offset - 1)
+        if (first < 0 and offset > 0) or last > len(level[0]) or len(level) < SCREEN_ROWS:
+            return False
+        if self.transparentColor is None:
+            self.transparentColor = self.findTransparentColor()
+            if self.transparentColor is None:
+                return False
+        screen = self.level.screen
+        animated = []
+        for index in range(first // CHUNK_COLUMNS, (last - 1) // CHUNK_COLUMNS + 1):
+            x = (index * CHUNK_COLUMNS + offset) * 32
+            if x >= screen.get_width() or x + CHUNK_COLUMNS * 32 <= 0:
+                continue
+            chunk = self.chunks.pop(index, None)
+            if chunk is None:
+                chunk = self.buildChunk(index)
+            # Remis en fin de dictionnaire : évincé en dernier
+            self.chunks[index] = chunk
+            screen.blit(chunk.surface, (math.floor(x), 0))
+            animated.extend(cell for cell in chunk.animated if first <= cell[1] < last)
+        if animated:
+            # Dans l'ordre de Level.renderTiles : chaque dessin fait avancer l'animation partagée
+            animated.sort(key=lambda cell: (cell[0], cell[1]))
+            sky = self.level.sprites.spriteCollection.get("sky")
+            for y, x, sprite in animated:
+                if sprite.redrawBackground:
+                    screen.blit(sky.image, ((x + offset) * 32, y * 32))
+                screenUpdater.add(sprite.drawSprite(x + offset, y, screen))
+        return True
+
+    def buildChunk(self, index):
+        level = self.level.level
+        start = index * CHUNK_COLUMNS
+        columns = min(CHUNK_COLUMNS, len(level[0]) - start)
+        size = (columns * 32, SCREEN_ROWS * 32)
+        if len(self.chunks) >= CHUNK_CAPACITY:
+            self.spare.append(self.chunks.pop(next(iter(self.chunks))).surface)
+        surface = next((spare for spare in self.spare if spare.get_size() == size), None)
+        if surface is None:
+            surface = pygame.Surface(size)
+        else:
+            self.spare.remove(surface)
+        surface.set_colorkey(None)
+        surface.fill(self.transparentColor)
+
+        sky = self.level.sprites.spriteCollection.get("sky").image
+        skyOpaque = isOpaque(sky)
+        transparent = False
+        animated = []
+        for y in range(SCREEN_ROWS):
+            row = level[y]
+            for x in range(start, start + columns):
+                sprite = row[x].sprite
+                if sprite is None:
+                    transparent = True
+                    continue
+                redraw = sprite.redrawBackground
+                image = sprite.image
+                # Animé, ou alpha par pixel sans ciel opaque dessous : dessiné à chaque image
+                if sprite.animation is not None or (image.get_flags() & pygame.SRCALPHA and not (redraw and skyOpaque)):
+                    animated.append((y, x, sprite))
+                    transparent = True
+                    continue
+                position = ((x - start) * 32, y * 32)
+                if redraw:
+                    surface.blit(sky, position)
+                if not (isOpaque(image) or (redraw and skyOpaque)):
+                    transparent = True
+                surface.blit(image, position)
+        if transparent:
+            # RLE : les longues suites de pixels opaques se copient d'un bloc (blit ~3x plus rapide)
+            surface.set_colorkey(self.transparentColor, pygame.RLEACCEL)
+        chunk = self.chunks[index] = Chunk(surface, animated)
+        return chunk
+
+    def findTransparentColor(self):
+        """Première couleur de TRANSPARENT_COLORS absente de tous les sprites, ou None"""
+        used = set()
+        for sprite in self.level.sprites.spriteCollection.values():
+            images = sprite.animation.images if sprite.animation is not None else [sprite.image]
+            for image in images:
+                entry = Background.colorsInImages.get(id(image))
+                if entry is None:
+                    colors = {color for color in TRANSPARENT_COLORS
+                              if pygame.mask.from_threshold(image, color, (1, 1, 1, 255)).count()}
+                    entry = Background.colorsInImages[id(image)] = (image, colors)
+                used |= entry[1]
+        return next((color for color in TRANSPARENT_COLORS if color not in used), None)
+
+
+def isOpaque(image):
+    return image.get_colorkey() is None and not image.get_flags() & pygame.SRCALPHA
@@ -44,4 +44,10 @@ class Camera:
 
         # Conversion finale en pixels
         self.x = self.pos.x * 32
-        self.y = self.pos.y * 32
\ No newline at end of file
+        self.y = self.pos.y * 32
+
+    def getState(self):
+        return (self.pos.x, self.pos.y, self.x, self.y, self.last_vel_x)
+
+    def setState(self, state):
+        self.pos.x, self.pos.y, self.x, self.y, self.last_vel_x = state
@@ -1,4 +1,128 @@
+from classes.Tile import GRID_PADDING, TILE_EMPTY, TILE_SOLID, TILE_SOLID_BOX
+
+
 class Collider:
+    """
+    Collisions d'une entité avec les tuiles du niveau, en coordonnées de cases entières.
+
+    Les cases sont lues dans la grille de collision du niveau (Level.solidGrid) sans créer
+    d'objet à chaque appel. Les résultats sont ceux de ReferenceCollider, l'implémentation
+    d'origine, y compris ses particularités : l'entité couvre trois lignes et deux colonnes
+    à partir de la case de son coin haut-gauche, et un indice de ligne négatif désigne une
+    ligne comptée depuis le bas du niveau (indexation des listes Python).
+    """
+
+    def __init__(self, entity, level):
+        self.entity = entity
+        self.level = level.level
+        self.levelObj = level
+        self.result = []
+        # Vue à plat de la grille (même mémoire) : cells[i] est un int, sans objet numpy
+        self.cells = memoryview(level.solidGrid).cast("B")
+        self.height = len(self.level)
+        self.width = len(self.level[0])
+        self.stride = self.width + 2 * GRID_PADDING
+
+    def checkX(self):
+        if self.leftLevelBorderReached() or self.rightLevelBorderReached():
+            return
+        rect = self.entity.rect
+        y = rect.y >> 5
+        # Lignes hors du niveau : l'original s'arrêtait sur IndexError
+        if y < -self.height or y + 2 >= self.height:
+            return
+        # Sans vitesse, une collision ne déplace rien
+        if self.entity.vel.x != 0:
+            self.resolve(rect, y, True)
+
+    def checkY(self):
+        self.entity.onGround = False
+        rect = self.entity.rect
+        y = rect.y >> 5
+        if y < -self.height or y + 2 >= self.height:
+            try:
+                self.entity.gameOver()
+            except Exception:
+                self.entity.alive = None
+            return
+        if self.entity.vel.y != 0:
+            self.resolve(rect, y, False)
+
+    def resolve(self, rect, y, horizontal):
+        """
+        Parcourt les cases couvertes dans l'ordre de l'original et corrige la première
+        collision : la vitesse passe alors à zéro et les collisions suivantes sont sans effet.
+        """
+        x = rect.x >> 5
+        # Tranche vide (ou tuiles lointaines qui ne touchent pas l'entité) dans l'original
+        if x < 0 or x >= self.width:
+            return
+        cells = self.cells
+        stride = self.stride
+        offset = GRID_PADDING * stride + GRID_PADDING + x
+        entityLeft, entityTop = rect.x, rect.y
+        entityRight, entityBottom = entityLeft + rect.width, entityTop + rect.height
+        for row in (y, y + 1, y + 2):
+            tileY = row if row >= 0 else row + self.height
+            index = tileY * stride + offset
+            # Cas le plus fréquent : les deux cases de la ligne sont vides
+            if cells[index] == TILE_EMPTY and cells[index + 1] == TILE_EMPTY:
+                continue
+            for column in (0, 1):
+                code = cells[index + column]
+                if code == TILE_EMPTY:
+                    continue
+                if code == TILE_SOLID or code == TILE_SOLID_BOX:
+                    left = (x + column) * 32
+                    top = tileY * 32 if code == TILE_SOLID else tileY * 32 - 1
+                    if entityLeft < left + 32 and left < entityRight and entityTop < top + 32 and top < entityBottom:
+                        self.collide(left, top, left + 32, top + 32, horizontal)
+                        return
+                else:
+                    tileRect = self.level[tileY][x + column].rect
+                    if rect.colliderect(tileRect):
+                        self.collide(tileRect.left, tileRect.top, tileRect.right, tileRect.bottom, horizontal)
+                        return
+
+    def collide(self, left, top, right, bottom, horizontal):
+        entity = self.entity
+        if horizontal:
+            if entity.vel.x > 0:
+                entity.rect.right = left
+            else:
+                entity.rect.left = right
+            entity.vel.x = 0
+            return
+        if entity.vel.y > 0:
+            entity.onGround = True
+            entity.rect.bottom = top
+            entity.vel.y = 0
+            # reset jump on bottom
+            if entity.traits is not None:
+                if "JumpTrait" in entity.traits:
+                    entity.traits["JumpTrait"].reset()
+                if "bounceTrait" in entity.traits:
+                    entity.traits["bounceTrait"].reset()
+        else:
+            entity.rect.top = bottom
+            entity.vel.y = 0
+
+    def rightLevelBorderReached(self):
+        if self.entity.rect.x / 32.0 > self.levelObj.levelLength - 1:
+            self.entity.rect.x = (self.levelObj.levelLength - 1) * 32
+            self.entity.vel.x = 0
+            return True
+
+    def leftLevelBorderReached(self):
+        if self.entity.rect.x < 0:
+            self.entity.rect.x = 0
+            self.entity.vel.x = 0
+            return True
+
+
+class ReferenceCollider:
+    """Implémentation d'origine, conservée pour vérifier Collider (voir benchmark.py collider)"""
+
     def __init__(self, entity, level):
         self.entity = entity
         self.level = level.level
@@ -30,7 +154,7 @@ class Collider:
 
     def checkY(self):
         self.entity.onGround = False
-        
+
         try:
             rows = [
                 self.level[self.entity.getPosIndex().y],
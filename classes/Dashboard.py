@@ -1,5 +1,4 @@
-import pygame
-
+from classes.DirtyRects import screenUpdater
 from classes.Font import Font
 
 
@@ -15,6 +14,10 @@ class Dashboard(Font):
         self.time = 0
 
     def update(self):
+        self.draw()
+        self.tick()
+
+    def draw(self):
         self.drawText("MARIO", 50, 20, 15)
         self.drawText(self.pointString(), 50, 37, 15)
 
@@ -27,16 +30,28 @@ class Dashboard(Font):
         if self.state != "menu":
             self.drawText(self.timeString(), 535, 37, 15)
 
+    def tick(self):
         # update Time
         self.ticks += 1
         if self.ticks == 60:
             self.ticks = 0
             self.time += 1
 
+    def getState(self):
+        return (self.state, self.levelName, self.points, self.coins, self.ticks, self.time)
+
+    def setState(self, state):
+        self.state, self.levelName, self.points, self.coins, self.ticks, self.time = state
+
     def drawText(self, text, x, y, size):
+        if x >= 0 or x == int(x):
+            # Texte composé une fois (voir Font.renderText) : un seul blit
+            screenUpdater.add(self.screen.blit(self.renderText(text, size), (x, y)))
+            return
+        # x négatif non entier : blit tronque chaque position vers zéro, les caractères
+        # ne sont pas tous décalés d'autant que le texte entier
         for char in text:
-            charSprite = pygame.transform.scale(self.charSprites[char], (size, size))
-            self.screen.blit(charSprite, (x, y))
+            screenUpdater.add(self.screen.blit(self.glyphAt(char, size), (x, y)))
             if char == " ":
                 x += size//2
             else:
@@ -0,0 +1,115 @@
+"""
+Envoi à l'écran des seules zones modifiées (dirty rects).
+
+Le jeu redessine toute l'image à chaque frame, mais tant que le fond n'a pas défilé d'un
+pixel entier (voir scrollKey), le ciel, les tuiles fixes et le fond de MarioEnv sont
+identiques d'une image à l'autre : seuls changent les dessins mobiles (entités, Mario,
+textes, tuiles animées). Chacun de ces dessins déclare la zone qu'il touche avec add()
+(le Rect renvoyé par blit), et present() envoie ces zones ainsi que celles de l'image
+précédente, là où les objets ne sont plus.
+
+Level.render ouvre l'image suivie (beginFrame) ; les boucles de jeu l'envoient avec present().
+Les écrans dessinés autrement (menus, écrans de fin, animation de mort) sont envoyés en entier
+avec presentAll(). present() envoie aussi toute l'image quand elle n'est pas suivie (pause),
+quand le fond a défilé, quand une tuile a changé (invalidate), quand les zones couvrent plus
+de FULL_RATIO de l'écran, et au moins toutes les FULL_EVERY images.
+"""
+
+import math
+
+import pygame
+
+FULL_RATIO = 0.5
+FULL_EVERY = 60
+
+
+def scrollKey(camera):
+    """
+    Position du fond à l'écran pour cette caméra : le fond pré-rendu est placé par floor,
+    les tuiles une à une par troncature vers zéro. Deux caméras de même clé dessinent le
+    même fond, au pixel près ; un défilement de moins d'un pixel n'en change pas.
+    """
+    return math.floor(camera.x), math.ceil(camera.x)
+
+
+class DirtyRects:
+    def __init__(self):
+        # False : chaque image est envoyée en entier, comme pygame.display.update()
+        self.enabled = True
+        self.screen = None
+        self.tracking = False  # beginFrame appelé depuis le dernier envoi
+        self.rects = []  # zones des dessins mobiles de l'image en cours
+        # Zones de la dernière image envoyée ; None : elle n'était pas suivie (envoi complet)
+        self.previousRects = None
+        self.scroll = None
+        self.previousScroll = None
+        self.sinceFull = 0
+        # Statistiques : images présentées, pixels envoyés
+        self.frames = 0
+        self.pushedPixels = 0
+
+    def beginFrame(self, camera):
+        """Appelé par Level.render : l'image en cours est suivie, son fond suit `camera`"""
+        self.tracking = True
+        self.scroll = scrollKey(camera)
+
+    def add(self, rect):
+        """Zone touchée par un dessin mobile (Rect renvoyé par blit ou pygame.draw), renvoyée telle quelle"""
+        if self.tracking and rect:
+            self.rects.append(rect)
+        return rect
+
+    def invalidate(self):
+        """L'image change hors des zones suivies (tuile modifiée...) : le prochain envoi est complet"""
+        self.previousRects = None
+
+    def presentAll(self):
+        """Envoie toute l'image : écran dessiné sans déclarer ses zones"""
+        self.rects = []
+        self.tracking = False
+        self.previousRects = None
+        screen = pygame.display.get_surface()
+        if screen is None:
+            return
+        self.frames += 1
+        self.sinceFull = 0
+        self.pushedPixels += screen.get_width() * screen.get_height()
+        pygame.display.update()
+
+    def present(self):
+        """Envoie l'image de jeu dessinée depuis beginFrame : seules ses zones mobiles si possible"""
+        rects, previous, tracked = self.rects, self.previousRects, self.tracking
+        self.rects = []
+        self.tracking = False
+        screen = pygame.display.get_surface()
+        if screen is None:
+            self.previousRects = None
+            return
+        self.frames += 1
+        if screen is not self.screen:
+            self.screen = screen
+            previous = None
+        full = (not self.enabled or not tracked or previous is None
+                or self.scroll != self.previousScroll or self.sinceFull >= FULL_EVERY)
+        self.previousRects = rects if tracked else None
+        self.previousScroll = self.scroll
+        width, height = screen.get_size()
+        if not full:
+            rects = previous + rects
+            # Surface cumulée, recouvrements compris
+            pixels = sum(rect.width * rect.height for rect in rects)
+            full = pixels > FULL_RATIO * width * height
+        if full:
+            self.sinceFull = 0
+            self.pushedPixels += width * height
+            pygame.display.update()
+            return
+        self.sinceFull += 1
+        if rects:
+            self.pushedPixels += pixels
+            pygame.display.update(rects)
+
+
+# Un seul écran par processus : toutes les boucles d'affichage passent par cet objet,
+# pour que les zones de l'image précédente soient celles réellement affichées
+screenUpdater = DirtyRects()
@@ -1,3 +1,6 @@
+from collections import namedtuple
+
+
 class EntityCollider:
     def __init__(self, entity):
         self.entity = entity
@@ -5,7 +8,7 @@ class EntityCollider:
     def check(self, target):
         if self.entity.rect.colliderect(target.rect):
             return self.determineSide(target.rect, self.entity.rect)
-        return CollisionState(False, False)
+        return NO_COLLISION
 
     def determineSide(self, rect1, rect2):
         if (
@@ -16,14 +19,16 @@ class EntityCollider:
             if rect2.collidepoint(
                 (rect1.midleft[0] / 2, rect1.midleft[1] / 2)
             ) or rect2.collidepoint((rect1.midright[0] / 2, rect1.midright[1] / 2)):
-                return CollisionState(True, False)
+                return SIDE_COLLISION
             else:
                 if self.entity.vel.y > 0:
-                    return CollisionState(True, True)
-        return CollisionState(True, False)
+                    return TOP_COLLISION
+        return SIDE_COLLISION
+
 
+# Résultat immuable (tuple nommé) : les trois cas possibles sont partagés, check() n'alloue rien
+CollisionState = namedtuple("CollisionState", ("isColliding", "isTop"))
 
-class CollisionState:
-    def __init__(self, _isColliding, _isTop):
-        self.isColliding = _isColliding
-        self.isTop = _isTop
+NO_COLLISION = CollisionState(False, False)
+SIDE_COLLISION = CollisionState(True, False)
+TOP_COLLISION = CollisionState(True, True)
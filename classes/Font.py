@@ -1,12 +1,29 @@
+from types import MappingProxyType
+
 from classes.Spritesheet import Spritesheet
 import pygame
 
+TEXT_CACHE_SIZE = 256  # textes rendus gardés (les plus anciens sont oubliés)
+
 
 class Font(Spritesheet):
+    # Caractères découpés une seule fois par fichier de police, partagés en lecture seule
+    # (chaque Dashboard et chaque Item de bloc à pièce est une Font). Les vues charSprites
+    # suivent ces dictionnaires, que convertAssets met au format de l'écran.
+    glyphs = {}
+    # Caractères agrandis : (fichier, taille) -> {caractère: image}
+    scaledGlyphs = {}
+    # Textes déjà composés : (fichier, texte, taille) -> image du texte entier
+    renderedText = {}
+
     def __init__(self, filePath, size):
         Spritesheet.__init__(self, filename=filePath)
+        self.fontFile = filePath
         self.chars = " !\"#$%&'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ[\\]^_`abcdefghijklmnopqrstuvwxyz{|}~"
-        self.charSprites = self.loadFont()
+        glyphs = Font.glyphs.get(filePath)
+        if glyphs is None:
+            glyphs = Font.glyphs[filePath] = self.loadFont()
+        self.charSprites = MappingProxyType(glyphs)
 
     def loadFont(self):
         font = {}
@@ -31,3 +48,44 @@ class Font(Spritesheet):
             )
             charAt += 1
         return font
+
+    def glyphAt(self, char, size):
+        """Caractère agrandi à size x size, mis à l'échelle une seule fois par taille"""
+        glyphs = Font.scaledGlyphs.get((self.fontFile, size))
+        if glyphs is None:
+            glyphs = Font.scaledGlyphs[(self.fontFile, size)] = {}
+        glyph = glyphs.get(char)
+        if glyph is None:
+            glyph = glyphs[char] = pygame.transform.scale(self.charSprites[char], (size, size))
+        return glyph
+
+    def renderText(self, text, size):
+        """
+        Image de `text` entier, identique aux caractères dessinés un à un : fond noir
+        transparent, comme la couleur transparente des caractères de la police.
+        """
+        key = (self.fontFile, text, size)
+        image = Font.renderedText.get(key)
+        if image is None:
+            glyphs = [self.glyphAt(char, size) for char in text]
+            x = width = 0
+            for char in text:
+                width = max(width, x + size)
+                x += size // 2 if char == " " else size
+            image = pygame.Surface((max(width, 1), size))
+            image.fill((0, 0, 0))
+            x = 0
+            for char, glyph in zip(text, glyphs):
+                image.blit(glyph, (x, 0))
+                x += size // 2 if char == " " else size
+            image.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+            if len(Font.renderedText) >= TEXT_CACHE_SIZE:
+                del Font.renderedText[next(iter(Font.renderedText))]
+            Font.renderedText[key] = image
+        return image
+
+    @staticmethod
+    def clearRenderedText():
+        """Oublie les caractères agrandis et les textes composés (caractères remplacés)"""
+        Font.scaledGlyphs.clear()
+        Font.renderedText.clear()
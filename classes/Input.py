@@ -3,11 +3,30 @@ from pygame.locals import *
 import sys
 
 
+def spawnAtMouse(entity, button, mouseX, mouseY):
+    """Clic droit : Koopa, Goomba et champignon ; clic gauche : pièce, sous le pointeur"""
+    if button == 3:
+        entity.levelObj.addKoopa(
+            mouseY / 32, mouseX / 32 - entity.camera.pos.x
+        )
+        entity.levelObj.addGoomba(
+            mouseY / 32, mouseX / 32 - entity.camera.pos.x
+        )
+        entity.levelObj.addRedMushroom(
+            mouseY / 32, mouseX / 32 - entity.camera.pos.x
+        )
+    elif button == 1:
+        entity.levelObj.addCoin(
+            mouseX / 32 - entity.camera.pos.x, mouseY / 32
+        )
+
+
 class Input:
     def __init__(self, entity):
         self.mouseX = 0
         self.mouseY = 0
         self.entity = entity
+        self.recorder = None  # TraceRecorder optionnel (classes.Trace)
 
     def checkForInput(self):
         events = pygame.event.get()
@@ -19,33 +38,35 @@ class Input:
         pressedKeys = pygame.key.get_pressed()
 
         if pressedKeys[K_LEFT] or pressedKeys[K_h] and not pressedKeys[K_RIGHT]:
-            self.entity.traits["goTrait"].direction = -1
+            direction = -1
         elif pressedKeys[K_RIGHT] or pressedKeys[K_l] and not pressedKeys[K_LEFT]:
-            self.entity.traits["goTrait"].direction = 1
+            direction = 1
         else:
-            self.entity.traits['goTrait'].direction = 0
+            direction = 0
 
         isJumping = pressedKeys[K_SPACE] or pressedKeys[K_UP] or pressedKeys[K_k]
-        self.entity.traits['jumpTrait'].jump(isJumping)
+        self.applyInput(direction, isJumping, pressedKeys[K_LSHIFT])
 
-        self.entity.traits['goTrait'].boost = pressedKeys[K_LSHIFT]
+    def applyInput(self, direction, jumping, boost):
+        """Applique les commandes d'un tick à Mario (clavier ou rejeu d'une trace)"""
+        self.entity.traits["goTrait"].direction = direction
+        self.entity.traits['jumpTrait'].jump(jumping)
+        self.entity.traits['goTrait'].boost = boost
+        if self.recorder is not None:
+            self.recorder.recordInput(direction, jumping, boost)
 
     def checkForMouseInput(self, events):
         mouseX, mouseY = pygame.mouse.get_pos()
         if self.isRightMouseButtonPressed(events):
-            self.entity.levelObj.addKoopa(
-                mouseY / 32, mouseX / 32 - self.entity.camera.pos.x
-            )
-            self.entity.levelObj.addGoomba(
-                mouseY / 32, mouseX / 32 - self.entity.camera.pos.x
-            )
-            self.entity.levelObj.addRedMushroom(
-                mouseY / 32, mouseX / 32 - self.entity.camera.pos.x
-            )
+            self.applyMouse(3, mouseX, mouseY)
         if self.isLeftMouseButtonPressed(events):
-            self.entity.levelObj.addCoin(
-                mouseX / 32 - self.entity.camera.pos.x, mouseY / 32
-            )
+            self.applyMouse(1, mouseX, mouseY)
+
+    def applyMouse(self, button, mouseX, mouseY):
+        """Clic de souris : objets ajoutés au niveau, enregistrés pour que le rejeu les recrée"""
+        spawnAtMouse(self.entity, button, mouseX, mouseY)
+        if self.recorder is not None:
+            self.recorder.recordMouse(button, mouseX, mouseY)
 
     def checkForQuitAndRestartInputEvents(self, events):
         for event in events:
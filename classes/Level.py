@@ -1,8 +1,14 @@
 import json
+import random
+import numpy as np
 import pygame
 
+from classes.Background import Background
+from classes.DirtyRects import screenUpdater
+from classes.LevelCache import CompiledLevel, loadCompiledLevel, saveCompiledLevel, sourceStamp
+from classes.SpatialHash import SpatialHash
 from classes.Sprites import Sprites
-from classes.Tile import Tile
+from classes.Tile import Tile, TILE_EMPTY, GRID_PADDING
 from entities.Coin import Coin
 from entities.CoinBrick import CoinBrick
 from entities.Goomba import Goomba
@@ -12,35 +18,153 @@ from entities.CoinBox import CoinBox
 from entities.RandomBox import RandomBox
 
 
+# Fenêtre d'activation autour de la caméra (pixels avant le bord gauche, après le bord droit) :
+# comme sur NES, les entités hors de la fenêtre sont figées jusqu'à ce qu'elle les atteigne
+ACTIVATION_MARGINS = (2 * 32, 4 * 32)
+SCREEN_WIDTH = 20 * 32
+
+# Clés des entités dans les fichiers de niveau -> classe, dans l'ordre de chargement
+LEVEL_ENTITY_KEYS = (
+    ("CoinBox", "CoinBox"),
+    ("Goomba", "Goomba"),
+    ("Koopa", "Koopa"),
+    ("coin", "Coin"),
+    ("coinBrick", "CoinBrick"),
+    ("RandomBox", "RandomBox"),
+)
+# Blocs dont la tuile solide est posée dès le chargement, avant l'apparition de l'entité
+BLOCK_CLASSES = ("CoinBox", "CoinBrick", "RandomBox")
+# Ennemis dont la direction de départ est tirée au hasard (LeftRightWalkTrait)
+WALKER_CLASSES = ("Goomba", "Koopa")
+
+
 class Level:
-    def __init__(self, screen, sound, dashboard):
-        self.sprites = Sprites()
+    # Niveaux déjà chargés dans ce processus, partagés par toutes les instances :
+    # nom -> ((date de modification, taille) du JSON, niveau compilé, grille de tuiles)
+    templates = {}
+
+    def __init__(self, screen, sound, dashboard, sprites=None, seed=None):
+        self.sprites = sprites if sprites is not None else Sprites()
+        # Hasard propre à ce monde : même graine et mêmes actions => même partie.
+        # Sans graine fournie, on en tire une pour pouvoir rejouer la partie (voir classes.Trace)
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.random = random.Random(self.seed)
+        # Horloge de simulation, en ticks (60 par seconde de jeu)
+        self.ticks = 0
         self.dashboard = dashboard
         self.sound = sound
         self.screen = screen
         self.level = None
+        # Grille parallèle à self.level (uint8, codes TILE_* de classes.Tile), bordée de
+        # GRID_PADDING cases vides : la case (x, y) est solidGrid[y + GRID_PADDING, x + GRID_PADDING]
+        self.solidGrid = None
         self.levelLength = 0
         self.entityList = []
+        self.removedCount = 0  # Entités marquées par removeEntity, encore dans entityList
+        # Phase large des collisions entre entités (voir entitiesNear)
+        self.spatialHash = SpatialHash()
+        # (marge gauche, marge droite) de la fenêtre d'activation ; None : tout le niveau est actif
+        self.activationMargins = ACTIVATION_MARGINS
+        # Physique groupée des ennemis (MobStore), désactivée par défaut
+        self.mobStore = None
+        # Entités du niveau pas encore construites : (abscisse en pixels, rang, classe, arguments de createEntity),
+        # triées ; spawnCursor indique la prochaine à faire apparaître
+        self.spawnTable = []
+        self.spawnCursor = 0
+        self.nextSpawnOrder = 0
+        self.name = None
+        self.loadedLevels = []  # Niveaux chargés dans ce monde, dans l'ordre (pour le rejeu)
+        # Entités vivantes de ce monde, par identifiant (pour restaurer un instantané) ; les
+        # entités retirées en sortent à la compaction
+        self.entityIndex = {}
+        self.nextEntityId = 0
+        # Tuiles modifiées depuis le chargement : (x, y) -> (nom du sprite, rect)
+        self.tileChanges = {}
+        self.baseLevel = None
+        # Fond statique pré-rendu (morceaux construits au premier dessin, jamais en headless)
+        self.background = Background(self)
 
     def loadLevel(self, levelname):
-        with open("./levels/{}.json".format(levelname)) as jsonData:
-            data = json.load(jsonData)
+        path = "./levels/{}.json".format(levelname)
+        # Comme pour le cache disque : un JSON modifié depuis le dernier chargement est recompilé
+        stamp = sourceStamp(path)[:2]
+        template = Level.templates.get(levelname)
+        if template is None or template[0] != stamp:
+            compiled = self.compileLevel(path)
+            template = (stamp, compiled, compiled.buildTiles(self.sprites.spriteCollection))
+            Level.templates[levelname] = template
+        _, compiled, grid = template
+        # Les tuiles sont partagées, seules les lignes sont copiées
+        self.level = [row[:] for row in grid]
+        self.background.clear()
+        self.solidGrid = compiled.solid.copy()
+        self.loadEntities(compiled.entityRecords())
+        self.levelLength = compiled.length
+        self.name = levelname
+        self.loadedLevels.append(levelname)
+        self.tileChanges = {}
+        self.baseLevel = [row[:] for row in self.level]
+        # Entités visibles avec la caméra au début du niveau : construites dès le chargement
+        if self.activationMargins is None:
+            self.spawnEntities(float("inf"))
+        else:
+            self.spawnEntities(SCREEN_WIDTH + self.activationMargins[1])
+
+    def compileLevel(self, path):
+        """Niveau compilé du fichier JSON `path`, lu dans le cache disque ou compilé puis enregistré"""
+        compiled = loadCompiledLevel(path)
+        if compiled is None:
+            with open(path, "rb") as jsonFile:
+                content = jsonFile.read()
+            data = json.loads(content)
             self.loadLayers(data)
             self.loadObjects(data)
-            self.loadEntities(data)
-            self.levelLength = data["length"]
+            compiled = CompiledLevel.compile(data, self.level, self.buildSolidGrid(),
+                                             self.sprites.spriteCollection, sourceStamp(path, content))
+            saveCompiledLevel(path, compiled)
+        return compiled
 
-    def loadEntities(self, data):
-        try:
-            [self.addCoinBox(x, y) for x, y in data["level"]["entities"]["CoinBox"]]
-            [self.addGoomba(x, y) for x, y in data["level"]["entities"]["Goomba"]]
-            [self.addKoopa(x, y) for x, y in data["level"]["entities"]["Koopa"]]
-            [self.addCoin(x, y) for x, y in data["level"]["entities"]["coin"]]
-            [self.addCoinBrick(x, y) for x, y in data["level"]["entities"]["coinBrick"]]
-            [self.addRandomBox(x, y, item) for x, y, item in data["level"]["entities"]["RandomBox"]]
-        except:
-            # if no entities in Level
-            pass
+    def loadEntities(self, entities):
+        """
+        Ajoute les entités du niveau à la table d'apparition, triée par abscisse : elles ne
+        sont construites qu'à l'approche de la caméra (voir spawnEntities). Les tuiles
+        solides des blocs sont posées tout de suite, et les directions des ennemis tirées
+        dans l'ordre du fichier : une graine donne la même partie qu'avec un chargement immédiat.
+        """
+        spawns = self.spawnTable[self.spawnCursor:]
+        for key, className in LEVEL_ENTITY_KEYS:
+            for args in entities.get(key, []):
+                x, y = args[0], args[1]
+                options = {"x": x, "y": y}
+                if className in BLOCK_CLASSES:
+                    self.placeTile(x, y, Tile(None, pygame.Rect(x * 32, y * 32 - 1, 32, 32)))
+                if className == "RandomBox":
+                    options["item"] = args[2]
+                elif className in WALKER_CLASSES:
+                    options["direction"] = self.random.choice([-1, 1])
+                spawns.append((self.spawnPosition(className, x, y), self.nextSpawnOrder, className, options))
+                self.nextSpawnOrder += 1
+        spawns.sort()
+        self.spawnTable = spawns
+        self.spawnCursor = 0
+
+    @staticmethod
+    def spawnPosition(className, x, y):
+        """Abscisse (rect.x) de l'entité construite avec ces coordonnées de fichier de niveau"""
+        # Goomba et Koopa reçoivent (ligne, colonne) : voir leurs constructeurs
+        if className == "Goomba":
+            return y * 32
+        if className == "Koopa":
+            return (y - 1) * 32
+        return x * 32
+
+    def spawnEntities(self, limit):
+        """Construit, dans l'ordre de la table, les entités dont l'abscisse ne dépasse pas `limit`"""
+        table = self.spawnTable
+        while self.spawnCursor < len(table) and table[self.spawnCursor][0] <= limit:
+            _, _, className, options = table[self.spawnCursor]
+            self.spawnCursor += 1
+            self.addEntity(self.createEntity(className, **options))
 
     def loadLayers(self, data):
         layers = []
@@ -77,13 +201,72 @@ class Level:
                 pygame.Rect(x * 32, y * 32, 32, 32),
             )
 
-    def updateEntities(self, cam):
+    def buildSolidGrid(self):
+        """Construit la grille de collision de self.level, avec sa marge de cases vides"""
+        rows, columns = len(self.level), len(self.level[0])
+        grid = np.full((rows + 2 * GRID_PADDING, columns + 2 * GRID_PADDING), TILE_EMPTY, dtype=np.uint8)
+        for y, row in enumerate(self.level):
+            for x, tile in enumerate(row):
+                grid[y + GRID_PADDING, x + GRID_PADDING] = tile.collisionCode(x, y)
+        return grid
+
+    def placeTile(self, x, y, tile):
+        """Place une tuile et met à jour la grille de collision"""
+        self.level[y][x] = tile
+        self.solidGrid[y + GRID_PADDING, x + GRID_PADDING] = tile.collisionCode(x, y)
+        self.background.invalidate(x)
+        screenUpdater.invalidate()
+
+    def tileCode(self, x, y):
+        """Code de collision de la case (x, y) ; TILE_EMPTY dans la marge autour du niveau"""
+        return self.solidGrid[y + GRID_PADDING, x + GRID_PADDING]
+
+    def isSolid(self, x, y):
+        return self.solidGrid[y + GRID_PADDING, x + GRID_PADDING] != TILE_EMPTY
+
+    def activeRange(self, camera):
+        """Bornes horizontales (en pixels) de la fenêtre d'activation pour cette caméra"""
+        if camera is None or self.activationMargins is None:
+            return float("-inf"), float("inf")
+        marginLeft, marginRight = self.activationMargins
+        return -camera.x - marginLeft, -camera.x + SCREEN_WIDTH + marginRight
+
+    def simulate(self, camera=None):
+        """
+        Avance le monde d'une étape (physique et logique des entités), sans rien dessiner.
+        Avec une caméra, seules les entités de la fenêtre d'activation avancent.
+        """
+        self.ticks += 1
+        left, right = self.activeRange(camera)
+        self.spawnEntities(right)
+        if self.mobStore is not None:
+            self.mobStore.simulate(left, right)
         for entity in self.entityList:
-            entity.update(cam)
+            if entity.removed:
+                continue
+            rect = entity.rect
+            if rect.right < left or rect.left > right:
+                continue
+            entity.simulate()
+            self.spatialHash.move(entity)
             if entity.alive is None:
-                self.entityList.remove(entity)
+                self.removeEntity(entity)
+        self.compactEntities()
 
-    def drawLevel(self, camera):
+    def render(self, camera):
+        """Dessine les tuiles visibles puis les entités, sans faire avancer la simulation"""
+        screenUpdater.beginFrame(camera)
+        # Fond pré-rendu ; aux bords du niveau, tuile par tuile
+        if not self.background.draw(camera):
+            self.renderTiles(camera)
+        left, right = self.activeRange(camera)
+        for entity in self.entityList:
+            if entity.rect.right < left or entity.rect.left > right:
+                continue
+            entity.render(camera)
+
+    def renderTiles(self, camera):
+        """Dessine les tuiles visibles une à une, sans le fond pré-rendu"""
         try:
             for y in range(0, 15):
                 for x in range(0 - int(camera.pos.x + 1), 20 - int(camera.pos.x - 1)):
@@ -93,12 +276,18 @@ class Level:
                                 self.sprites.spriteCollection.get("sky").image,
                                 ((x + camera.pos.x) * 32, y * 32),
                             )
-                        self.level[y][x].sprite.drawSprite(
+                        rect = self.level[y][x].sprite.drawSprite(
                             x + camera.pos.x, y, self.screen
                         )
-            self.updateEntities(camera)
+                        if self.level[y][x].sprite.animation is not None:
+                            # Tuile animée : change sans que la caméra bouge
+                            screenUpdater.add(rect)
         except IndexError:
-            return
+            pass
+
+    def drawLevel(self, camera):
+        self.simulate(camera)
+        self.render(camera)
 
     def addCloudSprite(self, x, y):
         try:
@@ -146,8 +335,8 @@ class Level:
             return
 
     def addCoinBox(self, x, y):
-        self.level[y][x] = Tile(None, pygame.Rect(x * 32, y * 32 - 1, 32, 32))
-        self.entityList.append(
+        self.placeTile(x, y, Tile(None, pygame.Rect(x * 32, y * 32 - 1, 32, 32)))
+        self.addEntity(
             CoinBox(
                 self.screen,
                 self.sprites.spriteCollection,
@@ -159,8 +348,8 @@ class Level:
         )
 
     def addRandomBox(self, x, y, item):
-        self.level[y][x] = Tile(None, pygame.Rect(x * 32, y * 32 - 1, 32, 32))
-        self.entityList.append(
+        self.placeTile(x, y, Tile(None, pygame.Rect(x * 32, y * 32 - 1, 32, 32)))
+        self.addEntity(
             RandomBox(
                 self.screen,
                 self.sprites.spriteCollection,
@@ -174,11 +363,11 @@ class Level:
         )
 
     def addCoin(self, x, y):
-        self.entityList.append(Coin(self.screen, self.sprites.spriteCollection, x, y))
+        self.addEntity(Coin(self.screen, self.sprites.spriteCollection, x, y))
 
     def addCoinBrick(self, x, y):
-        self.level[y][x] = Tile(None, pygame.Rect(x * 32, y * 32 - 1, 32, 32))
-        self.entityList.append(
+        self.placeTile(x, y, Tile(None, pygame.Rect(x * 32, y * 32 - 1, 32, 32)))
+        self.addEntity(
             CoinBrick(
                 self.screen,
                 self.sprites.spriteCollection,
@@ -190,16 +379,126 @@ class Level:
         )
 
     def addGoomba(self, x, y):
-        self.entityList.append(
+        self.addEntity(
             Goomba(self.screen, self.sprites.spriteCollection, x, y, self, self.sound)
         )
 
     def addKoopa(self, x, y):
-        self.entityList.append(
+        self.addEntity(
             Koopa(self.screen, self.sprites.spriteCollection, x, y, self, self.sound)
         )
 
     def addRedMushroom(self, x, y):
-        self.entityList.append(
+        self.addEntity(
             RedMushroom(self.screen, self.sprites.spriteCollection, x, y, self, self.sound)
-        )
\ No newline at end of file
+        )
+
+    def addEntity(self, entity):
+        entity.uid = self.nextEntityId
+        self.nextEntityId += 1
+        self.entityIndex[entity.uid] = entity
+        self.entityList.append(entity)
+        self.spatialHash.insert(entity)
+
+    def removeEntity(self, entity):
+        """
+        Retire l'entité en temps constant : elle est marquée et quitte l'index spatial tout de
+        suite, mais ne sort de entityList qu'à la fin du tick (compactEntities). Une boucle en
+        cours sur entityList n'est donc pas décalée.
+        """
+        if entity.removed:
+            return
+        entity.removed = True
+        self.removedCount += 1
+        self.spatialHash.remove(entity)
+
+    def compactEntities(self):
+        """Retire de entityList et de entityIndex, en un seul passage, les entités marquées par removeEntity"""
+        if self.removedCount:
+            entities = []
+            for entity in self.entityList:
+                if not entity.removed:
+                    entities.append(entity)
+                elif self.entityIndex.get(entity.uid) is entity:
+                    del self.entityIndex[entity.uid]
+            self.entityList[:] = entities
+            self.removedCount = 0
+
+    def entitiesNear(self, rect):
+        """Entités pouvant toucher `rect`, dans l'ordre de entityList (phase large)"""
+        return self.spatialHash.query(rect)
+
+    def createEntity(self, className, x=0, y=0, item=None, direction=None):
+        """
+        Construit une entité de la classe donnée, aux coordonnées du fichier de niveau ;
+        sans coordonnées, une entité vierge dont l'état sera ensuite restauré
+        """
+        spriteCollection = self.sprites.spriteCollection
+        if className == "Goomba":
+            return Goomba(self.screen, spriteCollection, x, y, self, self.sound, direction)
+        if className == "Koopa":
+            return Koopa(self.screen, spriteCollection, x, y, self, self.sound, direction)
+        if className == "RedMushroom":
+            return RedMushroom(self.screen, spriteCollection, x, y, self, self.sound)
+        if className == "Coin":
+            return Coin(self.screen, spriteCollection, x, y)
+        if className == "CoinBox":
+            return CoinBox(self.screen, spriteCollection, x, y, self.sound, self.dashboard)
+        if className == "CoinBrick":
+            return CoinBrick(self.screen, spriteCollection, x, y, self.sound, self.dashboard)
+        if className == "RandomBox":
+            return RandomBox(self.screen, spriteCollection, x, y, item, self.sound, self.dashboard, self)
+        raise ValueError("Type d'entité inconnu: {}".format(className))
+
+    def setTile(self, x, y, spriteName, rect):
+        """Remplace une tuile en cours de partie ; la modification est conservée dans les instantanés"""
+        sprite = self.sprites.spriteCollection.get(spriteName) if spriteName is not None else None
+        self.placeTile(x, y, Tile(sprite, pygame.Rect(rect) if rect is not None else None))
+        self.tileChanges[(x, y)] = (spriteName, tuple(rect) if rect is not None else None)
+
+    def getState(self):
+        """Instantané du niveau : entités (dans l'ordre de mise à jour) et tuiles modifiées"""
+        return {
+            "name": self.name,
+            "ticks": self.ticks,
+            "random": self.random.getstate(),
+            "nextEntityId": self.nextEntityId,
+            "spawnCursor": self.spawnCursor,
+            "entities": [
+                (entity.uid, entity.__class__.__name__, entity.getState())
+                for entity in self.entityList
+                if not entity.removed
+            ],
+            "tiles": dict(self.tileChanges),
+        }
+
+    def setState(self, state):
+        """Restaure un instantané de getState, en réutilisant les objets existants quand c'est possible"""
+        entities = []
+        for uid, className, entityState in state["entities"]:
+            entity = self.entityIndex.get(uid)
+            if entity is None or entity.__class__.__name__ != className:
+                # Entité absente de ce monde (instantané venant d'un autre processus)
+                entity = self.createEntity(className)
+                entity.uid = uid
+                self.entityIndex[uid] = entity
+            entity.setState(entityState)
+            entity.removed = False
+            entities.append(entity)
+        self.entityList[:] = entities
+        # Les entités absentes de l'instantané ne font plus partie du monde
+        self.entityIndex = {entity.uid: entity for entity in entities}
+        self.removedCount = 0
+        self.spatialHash.rebuild(entities)
+        self.nextEntityId = state["nextEntityId"]
+        self.spawnCursor = state["spawnCursor"]
+        # Annuler les modifications de tuiles absentes de l'instantané, puis appliquer les siennes
+        for x, y in self.tileChanges:
+            if (x, y) not in state["tiles"]:
+                self.placeTile(x, y, self.baseLevel[y][x])
+        self.tileChanges = {}
+        for (x, y), (spriteName, rect) in state["tiles"].items():
+            self.setTile(x, y, spriteName, rect)
+        # En dernier : la création d'entités ci-dessus consomme du hasard
+        self.ticks = state["ticks"]
+        self.random.setstate(state["random"])
@@ -0,0 +1,211 @@
+"""
+Niveaux compilés : le fichier JSON d'un niveau est lu et ses couches (ciel, sol, décors,
+tuyaux) sont construites une seule fois, puis le résultat est gardé dans un fichier
+binaire à côté des niveaux (levels/.cache/). Les processus suivants chargent directement
+les tableaux, sans relire le JSON.
+
+Format binaire (petit-boutiste) : en-tête MAGIC, version, marge de la grille de collision,
+date de modification, taille et CRC32 du fichier JSON source, dimensions du niveau, puis
+la table des noms (sprites, sortes d'entités, objets des blocs) séparés par "\\n", et les
+tableaux :
+- sprites  : uint16[hauteur, largeur], indice du nom du sprite de chaque case (NO_NAME : aucun)
+- solid    : uint8, grille de collision avec sa marge (voir Level.buildSolidGrid)
+- others   : int32[n, 6], cases au rect particulier (x, y, left, top, width, height)
+- entities : int32[n, 4], entités dans l'ordre du fichier (sorte, x, y, objet ou -1)
+
+Le fichier compilé est périmé quand la date ou la taille du JSON ont changé et que son
+CRC32 ne correspond plus : il est alors recompilé.
+"""
+
+import os
+import struct
+import tempfile
+import zlib
+
+import numpy as np
+import pygame
+
+from classes.Tile import Tile, GRID_PADDING, TILE_EMPTY, TILE_SOLID, TILE_SOLID_BOX
+
+MAGIC = b"MLVL"
+VERSION = 1
+HEADER = struct.Struct("<4sBBqQIHHHIII")
+CACHE_DIRECTORY = "./levels/.cache"
+NO_NAME = 0xFFFF
+
+
+def compiledPath(sourcePath):
+    name = os.path.splitext(os.path.basename(sourcePath))[0]
+    return os.path.join(CACHE_DIRECTORY, name + ".mlvl")
+
+
+class CompiledLevel:
+    def __init__(self, names, sprites, solid, others, entities, length, source=(0, 0, 0)):
+        self.names = names
+        self.sprites = sprites
+        self.solid = solid
+        self.others = others
+        self.entities = entities
+        self.length = length
+        # (date de modification en ns, taille, CRC32) du fichier JSON compilé
+        self.source = source
+
+    @staticmethod
+    def compile(data, level, solidGrid, spriteCollection, source=(0, 0, 0)):
+        """Compile un niveau déjà construit par Level.loadLayers / loadObjects"""
+        names = []
+        indices = {}
+
+        def nameIndex(name):
+            if name not in indices:
+                indices[name] = len(names)
+                names.append(name)
+            return indices[name]
+
+        spriteNames = {id(sprite): name for name, sprite in spriteCollection.items()}
+        height, width = len(level), len(level[0])
+        sprites = np.full((height, width), NO_NAME, dtype=np.uint16)
+        others = []
+        for y, row in enumerate(level):
+            for x, tile in enumerate(row):
+                if tile.sprite is not None:
+                    sprites[y, x] = nameIndex(spriteNames[id(tile.sprite)])
+                if solidGrid[y + GRID_PADDING, x + GRID_PADDING] > TILE_SOLID_BOX:
+                    others.append((x, y, tile.rect.left, tile.rect.top, tile.rect.width, tile.rect.height))
+
+        entities = []
+        for kind, records in data["level"].get("entities", {}).items():
+            for record in records:
+                item = nameIndex(record[2]) if len(record) > 2 else -1
+                entities.append((nameIndex(kind), record[0], record[1], item))
+
+        return CompiledLevel(
+            names, sprites, solidGrid.copy(),
+            np.array(others, dtype=np.int32).reshape(-1, 6),
+            np.array(entities, dtype=np.int32).reshape(-1, 4),
+            data["length"], source,
+        )
+
+    def buildTiles(self, spriteCollection):
+        """
+        Grille de Tile du niveau. Les cases sans rect (ciel, décors) d'un même sprite
+        partagent une seule Tile : Level remplace les tuiles, il ne les modifie jamais.
+        """
+        sprites = [spriteCollection.get(name) for name in self.names]
+        shared = {}
+        codes = self.solid[GRID_PADDING:-GRID_PADDING, GRID_PADDING:-GRID_PADDING].tolist()
+        level = []
+        for y, (spriteRow, codeRow) in enumerate(zip(self.sprites.tolist(), codes)):
+            row = []
+            for x, (index, code) in enumerate(zip(spriteRow, codeRow)):
+                sprite = sprites[index] if index != NO_NAME else None
+                if code == TILE_EMPTY:
+                    tile = shared.get(index)
+                    if tile is None:
+                        tile = shared[index] = Tile(sprite, None)
+                elif code == TILE_SOLID:
+                    tile = Tile(sprite, pygame.Rect(x * 32, y * 32, 32, 32))
+                else:
+                    # Rect remonté d'un pixel ; les autres rects sont remplacés ci-dessous
+                    tile = Tile(sprite, pygame.Rect(x * 32, y * 32 - 1, 32, 32))
+                row.append(tile)
+            level.append(row)
+        for x, y, left, top, width, height in self.others.tolist():
+            level[y][x] = Tile(level[y][x].sprite, pygame.Rect(left, top, width, height))
+        return level
+
+    def entityRecords(self):
+        """Entités sous la forme de data["level"]["entities"] du fichier JSON"""
+        entities = {}
+        for kind, x, y, item in self.entities.tolist():
+            record = [x, y] if item < 0 else [x, y, self.names[item]]
+            entities.setdefault(self.names[kind], []).append(record)
+        return entities
+
+    def toBytes(self):
+        names = "\n".join(self.names).encode("utf-8")
+        height, width = self.sprites.shape
+        mtime, size, crc = self.source
+        header = HEADER.pack(MAGIC, VERSION, GRID_PADDING, mtime, size, crc, width, height, self.length,
+                             len(names), len(self.others), len(self.entities))
+        return b"".join((
+            header, names,
+            self.sprites.astype("<u2").tobytes(), self.solid.astype(np.uint8).tobytes(),
+            self.others.astype("<i4").tobytes(), self.entities.astype("<i4").tobytes(),
+        ))
+
+    @staticmethod
+    def fromBytes(data):
+        (magic, version, padding, mtime, size, crc, width, height, length,
+         namesLength, otherCount, entityCount) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION or padding != GRID_PADDING:
+            raise ValueError("Niveau compilé invalide ou de version inconnue")
+        offset = HEADER.size
+        names = data[offset:offset + namesLength].decode("utf-8").split("\n") if namesLength else []
+        offset += namesLength
+        # Tableaux lus en place dans les octets du fichier (lecture seule, sans copie)
+        arrays = []
+        for dtype, shape in (("<u2", (height, width)),
+                             (np.uint8, (height + 2 * GRID_PADDING, width + 2 * GRID_PADDING)),
+                             ("<i4", (otherCount, 6)), ("<i4", (entityCount, 4))):
+            count = int(np.prod(shape))
+            array = np.frombuffer(data, dtype=dtype, count=count, offset=offset).reshape(shape)
+            offset += array.nbytes
+            arrays.append(array)
+        sprites, solid, others, entities = arrays
+        return CompiledLevel(names, sprites, solid, others, entities, length, (mtime, size, crc))
+
+    def save(self, path):
+        """
+        Écrit dans un fichier temporaire du même dossier, puis le renomme : un autre processus
+        (MarioVecEnv) qui lit le fichier voit l'ancien ou le nouveau, jamais un fichier à moitié écrit
+        """
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temporaryPath = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as levelFile:
+                levelFile.write(self.toBytes())
+            os.replace(temporaryPath, path)
+        except BaseException:
+            os.unlink(temporaryPath)
+            raise
+
+    @staticmethod
+    def load(path):
+        with open(path, "rb") as levelFile:
+            return CompiledLevel.fromBytes(levelFile.read())
+
+
+def sourceStamp(sourcePath, content=None):
+    """(date de modification en ns, taille, CRC32) du fichier source ; CRC32 à 0 sans `content`"""
+    stat = os.stat(sourcePath)
+    return stat.st_mtime_ns, stat.st_size, zlib.crc32(content) if content is not None else 0
+
+
+def loadCompiledLevel(sourcePath):
+    """Niveau compilé à jour pour ce fichier JSON, ou None s'il est absent, illisible ou périmé"""
+    try:
+        compiled = CompiledLevel.load(compiledPath(sourcePath))
+        mtime, size, _ = sourceStamp(sourcePath)
+    except (OSError, ValueError, struct.error):
+        return None
+    compiledMtime, compiledSize, compiledCrc = compiled.source
+    if (mtime, size) == (compiledMtime, compiledSize):
+        return compiled
+    # Date ou taille différente (copie, checkout...) : comparer le contenu
+    with open(sourcePath, "rb") as sourceFile:
+        content = sourceFile.read()
+    if zlib.crc32(content) != compiledCrc:
+        return None
+    compiled.source = sourceStamp(sourcePath, content)
+    saveCompiledLevel(sourcePath, compiled)
+    return compiled
+
+
+def saveCompiledLevel(sourcePath, compiled):
+    try:
+        compiled.save(compiledPath(sourcePath))
+    except OSError as e:
+        # Cache facultatif (dossier en lecture seule...) : le niveau reste utilisable
+        print(f"Niveau compilé non enregistré ({sourcePath}): {e}")
@@ -1,4 +1,6 @@
 class Vec2D:
+    __slots__ = ("x", "y")
+
     def __init__(self, x=0, y=0):
         self.x = x
         self.y = y
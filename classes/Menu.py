@@ -3,6 +3,7 @@ import sys
 import os
 import pygame
 
+from classes.DirtyRects import screenUpdater
 from classes.Spritesheet import Spritesheet
 
 # Ajout de la classe Button
@@ -317,4 +318,4 @@ class Menu:
                             self.saveSettings("./settings.json")
                         elif self.state == 2:
                             self.inSettings = False
-        pygame.display.update()
+        screenUpdater.presentAll()
@@ -0,0 +1,179 @@
+import numpy as np
+
+from classes.Tile import GRID_PADDING, TILE_SOLID, TILE_SOLID_BOX, TILE_SOLID_OTHER
+
+# Cases parcourues par Collider.resolve, dans son ordre : trois lignes de deux colonnes
+CELL_ROWS = np.array([0, 0, 1, 1, 2, 2])
+CELL_COLUMNS = np.array([0, 1, 0, 1, 0, 1])
+
+# Colonnes du magasin : une ligne de tableau par champ, un ennemi par colonne
+FIELDS = ("x", "y", "width", "height", "velX", "velY", "gravity", "obeyGravity", "speed", "direction")
+
+
+def roundRect(values):
+    """Arrondi appliqué par pygame.Rect aux coordonnées non entières (demi-entiers loin de zéro)"""
+    return np.copysign(np.floor(np.abs(values) + 0.5), values)
+
+
+class MobStore:
+    """
+    Physique groupée des ennemis qui marchent (Goomba, Koopa, RedMushroom), optionnelle.
+
+    Au début de chaque tick, les positions, vitesses, directions et états des ennemis actifs
+    sont copiés dans des tableaux NumPy (un tableau par champ, un ennemi par case) ; la
+    gravité, la marche, les demi-tours et les collisions avec les tuiles sont calculés pour
+    tous à la fois. Chaque ennemi ne reçoit son résultat qu'à son tour dans Level.simulate,
+    quand son simulate() appelle LeftRightWalkTrait.walk : les collisions entre entités voient
+    donc les mêmes positions qu'avant, et les parties sont identiques à celles jouées sans
+    magasin (particularités de Collider comprises).
+
+    Activer avec level.mobStore = MobStore(level).
+    """
+
+    def __init__(self, level, capacity=64, minimum=80):
+        self.level = level
+        # En dessous de `minimum` ennemis, le coût fixe des calculs NumPy dépasse le gain :
+        # chaque ennemi garde alors son propre calcul
+        self.minimum = minimum
+        self.state = np.zeros((len(FIELDS), capacity))
+        self.mobs = []
+        # Numéro du calcul en cours, jamais remis à zéro (pas même par Level.setState)
+        self.generation = 0
+
+    def simulate(self, left, right):
+        """Calcule le tick des ennemis dont le rect touche [left, right] (fenêtre d'activation de Level.simulate)"""
+        level = self.level
+        mobs = self.mobs
+        mobs.clear()
+        self.generation += 1
+        rows = []
+        for entity in level.entityList:
+            rect = entity.rect
+            if rect.right < left or rect.left > right:
+                continue
+            walkSpeed = getattr(entity, "walkSpeed", None)
+            if walkSpeed is None or entity.traits is not None:
+                continue
+            speed = walkSpeed()
+            trait = entity.leftrightTrait
+            # Ennemi qui ne marche pas ce tick, ou créé avec la grille d'un niveau précédent
+            if speed is None or trait.collDetection.level is not level.level:
+                continue
+            vel = entity.vel
+            trait.batchGeneration = self.generation
+            trait.batchIndex = len(mobs)
+            mobs.append(entity)
+            rows.append((rect.x, rect.y, rect.width, rect.height, vel.x, vel.y,
+                         entity.gravity, entity.obeyGravity, speed, trait.direction))
+        count = len(mobs)
+        if count < self.minimum:
+            # Invalide les numéros déjà posés sur les ennemis : ils marchent seuls ce tick
+            self.generation += 1
+            return
+        if count > self.state.shape[1]:
+            self.state = np.zeros((len(FIELDS), max(count, 2 * self.state.shape[1])))
+        state = self.state[:, :count]
+        state[:] = np.array(rows, dtype=np.float64).T
+        self.step(state)
+
+        x, y, _, _, velX, velY, _, _, speed, direction = state
+        # Un tuple Python par ennemi, converti en une fois : apply() ne fait plus que des affectations
+        velY = velY.tolist()
+        self.results = list(zip(
+            x.astype(np.int64).tolist(), y.astype(np.int64).tolist(), velX.astype(np.int64).tolist(),
+            # Vitesse remise à zéro par une collision : entier, comme dans Collider
+            [0 if value == 0 else value for value in velY],
+            self.onGround.tolist(), speed.astype(np.int64).tolist(), direction.astype(np.int64).tolist(),
+            self.lost.tolist(),
+        ))
+
+    def apply(self, entity, index):
+        """Recopie dans `entity` le résultat calculé pour elle (appelé par LeftRightWalkTrait.walk)"""
+        x, y, velX, velY, onGround, speed, direction, lost = self.results[index]
+        entity.rect.topleft = (x, y)
+        vel = entity.vel
+        vel.x = velX
+        vel.y = velY
+        entity.onGround = onGround
+        trait = entity.leftrightTrait
+        trait.speed = speed
+        trait.direction = direction
+        if lost:
+            entity.alive = None
+
+    def step(self, state):
+        """Un tick de LeftRightWalkTrait.moveEntity pour toutes les colonnes de `state`"""
+        x, y, width, height, velX, velY, gravity, obeyGravity, speed, direction = state
+        levelHeight = len(self.level.level)
+        levelLength = self.level.levelLength
+
+        velY += gravity * obeyGravity
+        direction[velX == 0] *= -1
+        velX[:] = speed * direction
+
+        # Axe vertical (Collider.checkY) : sous le niveau, l'ennemi est perdu
+        y[:] = roundRect(y + velY)
+        self.onGround = np.zeros(len(x), dtype=bool)
+        row = np.floor(y / 32)
+        self.lost = (row < -levelHeight) | (row + 2 >= levelHeight)
+        self.resolve(state, ~self.lost & (velY != 0), False)
+
+        # Axe horizontal (Collider.checkX) : bords du niveau, puis tuiles
+        x += velX
+        x[:] = roundRect(x)
+        leftBorder = x < 0
+        x[leftBorder] = 0
+        rightBorder = ~leftBorder & (x / 32.0 > levelLength - 1)
+        x[rightBorder] = (levelLength - 1) * 32
+        velX[leftBorder | rightBorder] = 0
+        row = np.floor(y / 32)
+        inside = (row >= -levelHeight) & (row + 2 < levelHeight)
+        self.resolve(state, ~leftBorder & ~rightBorder & inside & (velX != 0), True)
+
+    def resolve(self, state, selected, horizontal):
+        """Collider.resolve vectorisé : corrige la première collision de chaque ennemi sélectionné"""
+        x, y, width, height, velX, velY = state[:6]
+        level = self.level
+        columnCount = len(level.level[0])
+        indices = np.flatnonzero(selected)
+        column = np.floor(x[indices] / 32)
+        keep = (column >= 0) & (column < columnCount)
+        indices, column = indices[keep], column[keep].astype(np.intp)
+        if len(indices) == 0:
+            return
+        row = np.floor(y[indices] / 32).astype(np.intp)
+        tileY = row[:, None] + CELL_ROWS
+        tileY[tileY < 0] += len(level.level)
+        tileX = column[:, None] + CELL_COLUMNS
+        codes = level.solidGrid[tileY + GRID_PADDING, tileX + GRID_PADDING]
+
+        left = tileX * 32
+        top = tileY * 32 - (codes == TILE_SOLID_BOX)
+        right = left + 32
+        bottom = top + 32
+        entityLeft, entityTop = x[indices, None], y[indices, None]
+        entityRight = entityLeft + width[indices, None]
+        entityBottom = entityTop + height[indices, None]
+        hits = (((codes == TILE_SOLID) | (codes == TILE_SOLID_BOX))
+                & (entityLeft < right) & (left < entityRight) & (entityTop < bottom) & (top < entityBottom))
+        # Tuiles au rect particulier : test exact de pygame, rare
+        for mob, cell in np.argwhere(codes == TILE_SOLID_OTHER):
+            tileRect = level.level[tileY[mob, cell]][tileX[mob, cell]].rect
+            index = indices[mob]
+            hits[mob, cell] = tileRect.colliderect((int(x[index]), int(y[index]), int(width[index]), int(height[index])))
+            left[mob, cell], top[mob, cell] = tileRect.left, tileRect.top
+            right[mob, cell], bottom[mob, cell] = tileRect.right, tileRect.bottom
+
+        colliding = hits.any(axis=1)
+        first = hits.argmax(axis=1)[colliding]
+        mobs = np.flatnonzero(colliding)
+        indices = indices[colliding]
+        if horizontal:
+            forward = velX[indices] > 0
+            x[indices] = np.where(forward, left[mobs, first] - width[indices], right[mobs, first])
+            velX[indices] = 0
+        else:
+            falling = velY[indices] > 0
+            self.onGround[indices[falling]] = True
+            y[indices] = np.where(falling, top[mobs, first] - height[indices], bottom[mobs, first])
+            velY[indices] = 0
@@ -11,7 +11,8 @@ class Pause:
         self.dashboard = dashboard
         self.state = 0
         self.spritesheet = Spritesheet("./img/title_screen.png")
-        self.pause_srfc = GaussianBlur().filter(self.screen, 0, 0, 640, 480)
+        # Le fond flouté est calculé à la mise en pause (createBackgroundBlur)
+        self.pause_srfc = None
         self.dot = self.spritesheet.image_at(
             0, 150, 2, colorkey=[255, 0, 220], ignoreTileSize=True
         )
@@ -25,7 +26,7 @@ class Pause:
         self.dashboard.drawText("CONTINUE", 150, 280, 32)
         self.dashboard.drawText("BACK TO MENU", 150, 320, 32)
         self.drawDot()
-        pygame.display.update()
+        # Envoyé à l'écran par la boucle de jeu (main_game), avec le reste de l'image
         self.checkInput()
 
     def drawDot(self):
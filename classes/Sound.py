@@ -2,6 +2,10 @@ from pygame import mixer
 
 
 class Sound:
+    # Sons décodés une seule fois par processus et par format du mixer (pygame.quit puis
+    # une nouvelle initialisation peuvent en changer)
+    sounds = {}
+
     def __init__(self):
         self.music_channel = mixer.Channel(0)
         self.music_channel.set_volume(0.2)
@@ -10,17 +14,25 @@ class Sound:
 
         self.allowSFX = True
 
-        self.soundtrack = mixer.Sound("./sfx/main_theme.ogg")
-        self.coin = mixer.Sound("./sfx/coin.ogg")
-        self.bump = mixer.Sound("./sfx/bump.ogg")
-        self.stomp = mixer.Sound("./sfx/stomp.ogg")
-        self.jump = mixer.Sound("./sfx/small_jump.ogg")
-        self.death = mixer.Sound("./sfx/death.wav")
-        self.kick = mixer.Sound("./sfx/kick.ogg")
-        self.brick_bump = mixer.Sound("./sfx/brick-bump.ogg")
-        self.powerup = mixer.Sound('./sfx/powerup.ogg')
-        self.powerup_appear = mixer.Sound('./sfx/powerup_appears.ogg')
-        self.pipe = mixer.Sound('./sfx/pipe.ogg')
+        self.soundtrack = Sound.load("./sfx/main_theme.ogg")
+        self.coin = Sound.load("./sfx/coin.ogg")
+        self.bump = Sound.load("./sfx/bump.ogg")
+        self.stomp = Sound.load("./sfx/stomp.ogg")
+        self.jump = Sound.load("./sfx/small_jump.ogg")
+        self.death = Sound.load("./sfx/death.wav")
+        self.kick = Sound.load("./sfx/kick.ogg")
+        self.brick_bump = Sound.load("./sfx/brick-bump.ogg")
+        self.powerup = Sound.load('./sfx/powerup.ogg')
+        self.powerup_appear = Sound.load('./sfx/powerup_appears.ogg')
+        self.pipe = Sound.load('./sfx/pipe.ogg')
+
+    @staticmethod
+    def load(path):
+        key = (path, mixer.get_init())
+        sound = Sound.sounds.get(key)
+        if sound is None:
+            sound = Sound.sounds[key] = mixer.Sound(path)
+        return sound
 
     def play_sfx(self, sfx):
         if self.allowSFX:
@@ -0,0 +1,70 @@
+class SpatialHash:
+    """
+    Index des entités d'un niveau par colonnes de `cellSize` pixels (selon rect.x).
+
+    Sert de phase large aux collisions entre entités : au lieu de parcourir tout
+    level.entityList, une entité ne teste que les entités des colonnes voisines.
+    L'index est tenu à jour au fil des déplacements (Level.simulate appelle move()
+    après chaque entité). La marge `reach` couvre la largeur des entités et les petits
+    déplacements faits hors de leur propre simulate (coup de pied dans une carapace).
+    """
+
+    def __init__(self, cellSize=64, reach=64):
+        self.cellSize = cellSize
+        self.reach = reach
+        self.cells = {}
+        self.entityCells = {}
+
+    def insert(self, entity):
+        cell = entity.rect.x // self.cellSize
+        self.entityCells[entity] = cell
+        bucket = self.cells.get(cell)
+        if bucket is None:
+            self.cells[cell] = [entity]
+        else:
+            bucket.append(entity)
+
+    def remove(self, entity):
+        cell = self.entityCells.pop(entity, None)
+        if cell is not None:
+            self.cells[cell].remove(entity)
+
+    def move(self, entity):
+        """Met à jour la colonne de l'entité si elle en a changé"""
+        cell = entity.rect.x // self.cellSize
+        previous = self.entityCells.get(entity)
+        if cell != previous:
+            if previous is not None:
+                self.cells[previous].remove(entity)
+            self.entityCells[entity] = cell
+            bucket = self.cells.get(cell)
+            if bucket is None:
+                self.cells[cell] = [entity]
+            else:
+                bucket.append(entity)
+
+    def rebuild(self, entities):
+        self.cells = {}
+        self.entityCells = {}
+        for entity in entities:
+            self.insert(entity)
+
+    def query(self, rect):
+        """
+        Entités susceptibles de toucher `rect`, dans l'ordre de level.entityList
+        (ordre croissant des identifiants uid) : le test exact reste à faire
+        """
+        first = (rect.left - self.reach) // self.cellSize
+        last = (rect.right + self.reach) // self.cellSize
+        cells = self.cells
+        found = []
+        for cell in range(first, last + 1):
+            bucket = cells.get(cell)
+            if bucket:
+                found.extend(bucket)
+        found.sort(key=entityOrder)
+        return found
+
+
+def entityOrder(entity):
+    return entity.uid
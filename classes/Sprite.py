@@ -1,4 +1,6 @@
 class Sprite:
+    __slots__ = ("image", "colliding", "animation", "redrawBackground")
+
     def __init__(self, image, colliding, animation=None, redrawBackground=False):
         self.image = image
         self.colliding = colliding
@@ -6,9 +8,9 @@ class Sprite:
         self.redrawBackground = redrawBackground
 
     def drawSprite(self, x, y, screen):
+        """Dessine le sprite à la case (x, y) ; renvoie la zone touchée (Rect de blit)"""
         dimensions = (x * 32, y * 32)
         if self.animation is None:
-            screen.blit(self.image, dimensions)
-        else:
-            self.animation.update()
-            screen.blit(self.animation.image, dimensions)
+            return screen.blit(self.image, dimensions)
+        self.animation.update()
+        return screen.blit(self.animation.image, dimensions)
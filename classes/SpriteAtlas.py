@@ -0,0 +1,131 @@
+"""
+Atlas des sprites : toutes les images découpées et agrandies par Sprites.loadSprites
+(d'après sprites/*.json) sont rangées une seule fois dans une image unique, à côté des
+définitions (sprites/.cache/). Les processus suivants chargent cette image et en tirent
+chaque sprite comme une sous-surface, sans relire les planches ni les fichiers JSON.
+
+L'index (atlas.json) donne, pour chaque sprite dans l'ordre de la collection :
+- collision, redrawBg : comme dans les fichiers JSON
+- deltaTime : cadence de l'animation, ou null pour une image fixe
+- images : [x, y, largeur, hauteur, couleur transparente ou null] dans l'atlas
+et le CRC32 de chaque fichier source (définitions JSON et planches).
+
+L'atlas est périmé dès qu'un de ces fichiers a changé : il est alors recréé.
+"""
+
+import json
+import os
+import zlib
+
+import pygame
+
+from classes.Animation import Animation
+from classes.Sprite import Sprite
+
+VERSION = 1
+ATLAS_DIRECTORY = "./sprites/.cache"
+ATLAS_IMAGE = os.path.join(ATLAS_DIRECTORY, "atlas.png")
+ATLAS_INDEX = os.path.join(ATLAS_DIRECTORY, "atlas.json")
+ATLAS_WIDTH = 512
+
+
+def sourceChecksums(urlList):
+    """CRC32 des définitions JSON et des planches qu'elles utilisent"""
+    checksums = {}
+    for url in urlList:
+        with open(url, "rb") as jsonFile:
+            content = jsonFile.read()
+        checksums[url] = zlib.crc32(content)
+        sheet = json.loads(content)["spriteSheetURL"]
+        if sheet not in checksums:
+            with open(sheet, "rb") as sheetFile:
+                checksums[sheet] = zlib.crc32(sheetFile.read())
+    return checksums
+
+
+def spriteImages(sprite):
+    if sprite.animation is not None:
+        return sprite.animation.images
+    return [sprite.image]
+
+
+def packImages(images):
+    """Rangement par étagères, des plus hautes aux plus basses : position (x, y) de chaque image"""
+    order = sorted(range(len(images)), key=lambda i: (-images[i].get_height(), i))
+    positions = [None] * len(images)
+    x = y = shelfHeight = 0
+    for i in order:
+        width, height = images[i].get_size()
+        if x + width > ATLAS_WIDTH:
+            x, y = 0, y + shelfHeight
+            shelfHeight = 0
+        positions[i] = (x, y)
+        x += width
+        shelfHeight = max(shelfHeight, height)
+    return positions, y + shelfHeight
+
+
+def saveAtlas(urlList, spriteCollection):
+    """Range la collection découpée par Sprites.loadSprites dans l'atlas et écrit son index"""
+    images = [image for sprite in spriteCollection.values() for image in spriteImages(sprite)]
+    positions, height = packImages(images)
+    atlas = pygame.Surface((ATLAS_WIDTH, max(height, 1)))
+    for image, position in zip(images, positions):
+        # Copie sans couleur transparente : l'atlas garde tous les pixels
+        raw = image.copy()
+        raw.set_colorkey(None)
+        atlas.blit(raw, position)
+
+    index = {}
+    placed = iter(zip(images, positions))
+    for name, sprite in spriteCollection.items():
+        records = []
+        for _ in spriteImages(sprite):
+            image, (x, y) = next(placed)
+            colorkey = image.get_colorkey()
+            records.append([x, y, image.get_width(), image.get_height(),
+                            list(colorkey) if colorkey is not None else None])
+        index[name] = {
+            "collision": sprite.colliding,
+            "redrawBg": sprite.redrawBackground,
+            "deltaTime": sprite.animation.deltaTime if sprite.animation is not None else None,
+            "images": records,
+        }
+    try:
+        os.makedirs(ATLAS_DIRECTORY, exist_ok=True)
+        pygame.image.save(atlas, ATLAS_IMAGE)
+        with open(ATLAS_INDEX, "w") as indexFile:
+            json.dump({"version": VERSION, "sources": sourceChecksums(urlList), "sprites": index}, indexFile)
+    except (OSError, pygame.error) as e:
+        # Atlas facultatif (dossier en lecture seule...) : les sprites restent utilisables
+        print(f"Atlas des sprites non enregistré: {e}")
+
+
+def loadAtlas(urlList):
+    """Collection de sprites tirée de l'atlas, ou None s'il est absent, illisible ou périmé"""
+    try:
+        with open(ATLAS_INDEX) as indexFile:
+            data = json.load(indexFile)
+        if data.get("version") != VERSION or data["sources"] != sourceChecksums(urlList):
+            return None
+        loaded = pygame.image.load(ATLAS_IMAGE)
+    except (OSError, ValueError, KeyError, pygame.error):
+        return None
+    # Même format que les images découpées par Spritesheet.image_at
+    atlas = pygame.Surface(loaded.get_size())
+    atlas.blit(loaded, (0, 0))
+
+    resDict = {}
+    for name, record in data["sprites"].items():
+        images = []
+        for x, y, width, height, colorkey in record["images"]:
+            image = atlas.subsurface((x, y, width, height))
+            if colorkey is not None:
+                image.set_colorkey(colorkey, pygame.RLEACCEL)
+            images.append(image)
+        if record["deltaTime"] is None:
+            resDict[name] = Sprite(images[0], record["collision"], None, record["redrawBg"])
+        else:
+            resDict[name] = Sprite(None, record["collision"],
+                                   Animation(images, deltaTime=record["deltaTime"]), record["redrawBg"])
+    return resDict
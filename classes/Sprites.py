@@ -1,25 +1,44 @@
 import json
+from types import MappingProxyType
 
 from classes.Animation import Animation
 from classes.Sprite import Sprite
+from classes.SpriteAtlas import loadAtlas, saveAtlas
 from classes.Spritesheet import Spritesheet
 
 
 class Sprites:
+    # Collection chargée une seule fois par processus et partagée en lecture seule par tous
+    # les Sprites() (Mario, chaque Level, MarioEnv...). Les entités copient les animations
+    # qu'elles font avancer ; les Sprite eux-mêmes ne sont jamais modifiés.
+    collection = None
+
     def __init__(self):
-        self.spriteCollection = self.loadSprites(
-            [
-                "./sprites/Mario.json",
-                "./sprites/Goomba.json",
-                "./sprites/Koopa.json",
-                "./sprites/Animations.json",
-                "./sprites/BackgroundSprites.json",
-                "./sprites/ItemAnimations.json",
-                "./sprites/RedMushroom.json"
-            ]
-        )
+        if Sprites.collection is None:
+            Sprites.collection = MappingProxyType(self.loadSprites(
+                [
+                    "./sprites/Mario.json",
+                    "./sprites/Goomba.json",
+                    "./sprites/Koopa.json",
+                    "./sprites/Animations.json",
+                    "./sprites/BackgroundSprites.json",
+                    "./sprites/ItemAnimations.json",
+                    "./sprites/RedMushroom.json"
+                ]
+            ))
+        self.spriteCollection = Sprites.collection
 
     def loadSprites(self, urlList):
+        # Atlas à jour : une seule image à charger, sans découpe ni agrandissement
+        resDict = loadAtlas(urlList)
+        if resDict is not None:
+            return resDict
+        resDict = self.cutSprites(urlList)
+        saveAtlas(urlList, resDict)
+        return resDict
+
+    def cutSprites(self, urlList):
+        """Découpe et agrandit chaque sprite dans les planches décrites par les fichiers JSON"""
         resDict = {}
         for url in urlList:
             with open(url) as jsonData:
@@ -2,15 +2,21 @@ import pygame
 
 
 class Spritesheet(object):
+    # Images chargées une seule fois par processus, par nom de fichier : les planches ne
+    # sont jamais modifiées après leur chargement, toutes les instances les partagent
+    sheets = {}
+
     def __init__(self, filename):
-        try:
-            self.sheet = pygame.image.load(filename)
-            self.sheet = pygame.image.load(filename)
-            if not self.sheet.get_alpha():
-                self.sheet.set_colorkey((0, 0, 0))
-        except pygame.error:
-            print("Unable to load spritesheet image:", filename)
-            raise SystemExit
+        self.sheet = Spritesheet.sheets.get(filename)
+        if self.sheet is None:
+            try:
+                self.sheet = pygame.image.load(filename)
+                if not self.sheet.get_alpha():
+                    self.sheet.set_colorkey((0, 0, 0))
+            except pygame.error:
+                print("Unable to load spritesheet image:", filename)
+                raise SystemExit
+            Spritesheet.sheets[filename] = self.sheet
 
     def image_at(self, x, y, scalingfactor, colorkey=None, ignoreTileSize=False,
                  xTileSize=16, yTileSize=16):
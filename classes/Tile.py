@@ -1,7 +1,20 @@
 import pygame
 
+# Codes de la grille de collision de Level (solidGrid), selon la position du rect dans sa case
+TILE_EMPTY = 0  # pas de rect : case traversable
+TILE_SOLID = 1  # rect de 32x32 aligné sur la case
+TILE_SOLID_BOX = 2  # rect remonté d'un pixel (CoinBox, RandomBox, CoinBrick)
+TILE_SOLID_OTHER = 3  # autre rect : consulter tile.rect
+
+# Marge de cases vides autour de la grille de collision : les lectures proches des bords
+# (y compris au-dessus de l'écran ou avant le début du niveau) ne lèvent pas d'exception
+GRID_PADDING = 8
+
 
 class Tile:
+    # Un niveau compte des milliers de tuiles : pas de __dict__ par instance
+    __slots__ = ("sprite", "rect")
+
     def __init__(self, sprite, rect):
         self.sprite = sprite
         self.rect = rect
@@ -11,3 +24,15 @@ class Tile:
             pygame.draw.rect(screen, pygame.Color(255, 0, 0), self.rect, 1)
         except Exception:
             pass
+
+    def collisionCode(self, x, y):
+        """Code de cette tuile dans la grille de collision, pour la case (x, y)"""
+        rect = self.rect
+        if rect is None:
+            return TILE_EMPTY
+        if rect.x == x * 32 and rect.width == 32 and rect.height == 32:
+            if rect.y == y * 32:
+                return TILE_SOLID
+            if rect.y == y * 32 - 1:
+                return TILE_SOLID_BOX
+        return TILE_SOLID_OTHER
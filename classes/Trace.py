@@ -0,0 +1,243 @@
+"""
+Traces d'entrées compactes : les commandes de chaque tick d'une partie, plus la
+graine et les niveaux chargés, suffisent à rejouer exactement cette partie.
+
+Deux sortes de traces :
+- "ai"    : actions de MarioEnv (idle, left, right, jump, kill_jump), 3 bits par tick
+- "human" : commandes clavier de main_game (direction, saut, accélération), 4 bits par tick
+
+Les clics de souris de main_game (ajout d'ennemis ou de pièces) sont enregistrés à part,
+comme événements (tick, bouton, x, y) : ils tirent dans level.random et prennent des
+identifiants d'entités, une partie rejouée sans eux ne serait plus la même.
+
+Format binaire (petit-boutiste) : en-tête MAGIC, version, sorte, bits par tick,
+graine, nombre de ticks, noms des niveaux séparés par "|", puis les codes
+empaquetés bit à bit, enfin (version 2) le nombre d'événements souris et ces
+événements. Les traces de version 1, sans événements, restent lisibles.
+"""
+
+import os
+import struct
+import time
+
+from classes.Input import spawnAtMouse
+
+MAGIC = b"MTRC"
+VERSION = 2
+HEADER = struct.Struct("<4sBBBIIH")
+EVENT_COUNT = struct.Struct("<I")
+MOUSE_EVENT = struct.Struct("<IBhh")  # tick, bouton, x, y
+
+KINDS = ("ai", "human")
+BITS = {"ai": 3, "human": 4}
+AI_ACTIONS = ("idle", "left", "right", "jump", "kill_jump")
+AI_CODES = {action: code for code, action in enumerate(AI_ACTIONS)}
+
+
+def encodeInput(direction, jumping, boost):
+    """Code humain sur 4 bits : direction (0 aucune, 1 gauche, 2 droite), saut, accélération"""
+    return (2 if direction == 1 else 1 if direction == -1 else 0) | (bool(jumping) << 2) | (bool(boost) << 3)
+
+
+def decodeInput(code):
+    direction = (0, -1, 1)[code & 3]
+    return direction, bool(code & 4), bool(code & 8)
+
+
+class Trace:
+    def __init__(self, kind, levels, seed, codes=None, events=None):
+        self.kind = kind
+        self.levels = list(levels)
+        self.seed = seed
+        self.codes = codes if codes is not None else []
+        # Clics de souris (tick, bouton, x, y), dans l'ordre du jeu
+        self.events = events if events is not None else []
+
+    def toBytes(self):
+        levels = "|".join(self.levels).encode("utf-8")
+        bits = BITS[self.kind]
+        data = bytearray(HEADER.pack(MAGIC, VERSION, KINDS.index(self.kind), bits, self.seed, len(self.codes), len(levels)))
+        data += levels
+        acc = 0
+        accBits = 0
+        for code in self.codes:
+            acc |= code << accBits
+            accBits += bits
+            while accBits >= 8:
+                data.append(acc & 0xFF)
+                acc >>= 8
+                accBits -= 8
+        if accBits:
+            data.append(acc & 0xFF)
+        data += EVENT_COUNT.pack(len(self.events))
+        for event in self.events:
+            data += MOUSE_EVENT.pack(*event)
+        return bytes(data)
+
+    @staticmethod
+    def fromBytes(data):
+        magic, version, kind, bits, seed, count, levelsLength = HEADER.unpack_from(data)
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ValueError("Fichier de trace invalide ou de version inconnue")
+        offset = HEADER.size
+        levels = data[offset:offset + levelsLength].decode("utf-8").split("|")
+        offset += levelsLength
+        codesLength = (count * bits + 7) // 8
+        mask = (1 << bits) - 1
+        codes = []
+        acc = 0
+        accBits = 0
+        for byte in data[offset:offset + codesLength]:
+            acc |= byte << accBits
+            accBits += 8
+            while accBits >= bits and len(codes) < count:
+                codes.append(acc & mask)
+                acc >>= bits
+                accBits -= bits
+        offset += codesLength
+        events = []
+        if version >= 2:
+            eventCount, = EVENT_COUNT.unpack_from(data, offset)
+            offset += EVENT_COUNT.size
+            for _ in range(eventCount):
+                events.append(MOUSE_EVENT.unpack_from(data, offset))
+                offset += MOUSE_EVENT.size
+        return Trace(KINDS[kind], levels, seed, codes, events)
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as traceFile:
+            traceFile.write(self.toBytes())
+
+    @staticmethod
+    def load(path):
+        with open(path, "rb") as traceFile:
+            return Trace.fromBytes(traceFile.read())
+
+
+class TraceRecorder(Trace):
+    """Trace en cours d'enregistrement : un code ajouté à chaque tick de simulation"""
+
+    def recordAction(self, action):
+        if action not in AI_CODES:
+            # Enregistrée comme idle, la partie rejouée ne serait plus la même
+            raise ValueError("Action inconnue pour une trace: {}".format(action))
+        self.codes.append(AI_CODES[action])
+
+    def recordInput(self, direction, jumping, boost):
+        self.codes.append(encodeInput(direction, jumping, boost))
+
+    def recordMouse(self, button, x, y):
+        """Clic du tick en cours, dont les commandes clavier viennent d'être enregistrées"""
+        self.events.append((len(self.codes) - 1, button, x, y))
+
+
+class ReplayInput:
+    """Remplace classes.Input.Input de Mario : applique les commandes et les clics lus dans une trace"""
+
+    def __init__(self, entity, codes, events=()):
+        self.entity = entity
+        self.codes = iter(codes)
+        self.events = list(events)
+        self.nextEvent = 0
+        self.tick = 0
+        self.recorder = None
+
+    def checkForInput(self):
+        direction, jumping, boost = decodeInput(next(self.codes, 0))
+        self.entity.traits["goTrait"].direction = direction
+        self.entity.traits["jumpTrait"].jump(jumping)
+        self.entity.traits["goTrait"].boost = boost
+        # Clics de ce tick, après les commandes clavier comme dans Input.checkForInput
+        while self.nextEvent < len(self.events) and self.events[self.nextEvent][0] <= self.tick:
+            _, button, x, y = self.events[self.nextEvent]
+            spawnAtMouse(self.entity, button, x, y)
+            self.nextEvent += 1
+        self.tick += 1
+
+
+def replayTrace(trace, onTick=None):
+    """
+    Re-simule une trace sans affichage (pilotes SDL "dummy"), aussi vite que possible.
+    onTick(level, mario), si fourni, est appelé après chaque tick (pour comparer deux rejeux).
+
+    Returns:
+        dict: ticks joués, durée, ticks par seconde et état final de la partie
+    """
+    if trace.kind == "ai":
+        return replayAiTrace(trace, onTick)
+    return replayHumanTrace(trace, onTick)
+
+
+def replayAiTrace(trace, onTick=None):
+    from ai.mario_env import MarioEnv
+
+    env = MarioEnv(headless=True, verbose=False, max_speed=True)
+    env.reset(level=trace.levels[0], seed=trace.seed)
+    totalReward = 0
+    ticks = 0
+    start = time.perf_counter()
+    for code in trace.codes:
+        reward, _ = env.step_tick(AI_ACTIONS[code])
+        totalReward += reward
+        ticks += 1
+        if onTick is not None:
+            onTick(env.level, env.mario)
+        if env.done:
+            break
+    elapsed = time.perf_counter() - start
+    return {
+        "ticks": ticks,
+        "seconds": elapsed,
+        "ticks_per_second": ticks / elapsed if elapsed > 0 else 0.0,
+        "x": env.mario.rect.x,
+        "y": env.mario.rect.y,
+        "points": env.dashboard.points,
+        "coins": env.dashboard.coins,
+        "reward": totalReward,
+        "game_state": env.game_state,
+    }
+
+
+def replayHumanTrace(trace, onTick=None):
+    """Même enchaînement que la boucle de main_game : niveau, tableau de bord, puis Mario"""
+    import pygame
+    from classes.Dashboard import Dashboard
+    from classes.Level import Level
+    from classes.Sound import Sound
+    from entities.Mario import Mario
+
+    if not pygame.get_init():
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.get_surface() or pygame.display.set_mode((640, 480))
+    dashboard = Dashboard("./img/font.png", 8, screen)
+    sound = Sound()
+    level = Level(screen, sound, dashboard, seed=trace.seed)
+    for levelName in trace.levels:
+        level.loadLevel(levelName)
+    mario = Mario(3, 0, level, screen, dashboard, sound)
+    mario.input = ReplayInput(mario, trace.codes, trace.events)
+    ticks = 0
+    start = time.perf_counter()
+    while not mario.restart and ticks < len(trace.codes):
+        level.simulate(mario.camera)
+        dashboard.tick()
+        mario.simulate()
+        ticks += 1
+        if onTick is not None:
+            onTick(level, mario)
+    elapsed = time.perf_counter() - start
+    return {
+        "ticks": ticks,
+        "seconds": elapsed,
+        "ticks_per_second": ticks / elapsed if elapsed > 0 else 0.0,
+        "x": mario.rect.x,
+        "y": mario.rect.y,
+        "points": dashboard.points,
+        "coins": dashboard.coins,
+        "dead": mario.dead,
+    }
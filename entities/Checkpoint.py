@@ -1,5 +1,7 @@
 import pygame
 import math
+
+from classes.DirtyRects import screenUpdater
 from entities.EntityBase import EntityBase
 
 class Checkpoint(EntityBase):
@@ -7,7 +9,12 @@ class Checkpoint(EntityBase):
     Classe représentant un checkpoint dans le jeu.
     Le checkpoint est une entité avec laquelle Mario peut interagir.
     """
-    
+
+    __slots__ = ("level", "sound", "triggered", "original_y", "image")
+
+    # Image chargée et redimensionnée une seule fois, partagée par tous les checkpoints
+    checkpointImage = None
+
     def __init__(self, x, y, level, sound):
         super(Checkpoint, self).__init__(x, y, 0)  # gravity = 0
         self.level = level
@@ -15,27 +22,37 @@ class Checkpoint(EntityBase):
         self.type = "Checkpoint"  # Type d'entité pour les collisions
         self.triggered = False
         self.original_y = y  # Sauvegarder la position Y d'origine pour l'animation de pulsation
-          # Charger l'image du checkpoint
+        self.image = Checkpoint.loadImage()
+        # Créer un rectangle légèrement plus grand que l'image pour une meilleure collision
+        self.rect = pygame.Rect(x, y - 32, 96, 96)  # Décaler vers le haut pour être visible au-dessus du sol
+
+    @staticmethod
+    def loadImage():
+        if Checkpoint.checkpointImage is not None:
+            return Checkpoint.checkpointImage
+        # Charger l'image du checkpoint
         try:
-            self.image = pygame.image.load("img/checkpoint.png").convert_alpha()
+            image = pygame.image.load("img/checkpoint.png")
+            # Au format de l'écran s'il existe déjà (sinon l'image reste utilisable telle quelle)
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
             # Redimensionner l'image pour la rendre plus visible (128x128 au lieu de 64x64)
-            self.image = pygame.transform.scale(self.image, (96, 96))
-            # Créer un rectangle légèrement plus grand que l'image pour une meilleure collision
-            self.rect = pygame.Rect(x, y - 32, 96, 96)  # Décaler vers le haut pour être visible au-dessus du sol
+            image = pygame.transform.scale(image, (96, 96))
         except Exception as e:
             print(f"Erreur lors du chargement de l'image checkpoint.png: {e}")
             # Image par défaut en cas d'erreur
-            self.image = pygame.Surface((96, 96))
-            self.image.fill((255, 0, 0))  # Rouge par défaut
-            self.rect = pygame.Rect(x, y - 32, 96, 96)
+            image = pygame.Surface((96, 96))
+            image.fill((255, 0, 0))  # Rouge par défaut
+        Checkpoint.checkpointImage = image
+        return image
     
-    def update(self, camera=None):
+    def simulate(self):
         """
         Mise à jour du checkpoint.
         Cette méthode est appelée à chaque frame.
         """
-        # Animation simple du checkpoint (pulsation)
-        current_time = pygame.time.get_ticks()
+        # Animation simple du checkpoint (pulsation), cadencée par l'horloge de simulation
+        current_time = self.level.ticks * 1000 / 60
         # Faire pulser légèrement le checkpoint pour attirer l'attention
         pulse = abs(math.sin(current_time / 500)) * 10  # Pulsation entre 0 et 10 pixels
         self.rect.y = self.original_y - int(pulse)
@@ -46,7 +63,7 @@ class Checkpoint(EntityBase):
         """
         if hasattr(self.level, 'screen'):
             # Dessiner le checkpoint avec une légère oscillation pour le rendre plus visible
-            self.level.screen.blit(self.image, (self.rect.x - camera.x, self.rect.y))
+            screenUpdater.add(self.level.screen.blit(self.image, (self.rect.x - camera.x, self.rect.y)))
             
             # Dessiner un petit texte d'indication au-dessus du checkpoint
             if hasattr(pygame, 'font') and pygame.font.get_init():
@@ -54,7 +71,7 @@ class Checkpoint(EntityBase):
                 text = font.render("CHECKPOINT", True, (255, 255, 0))
                 text_rect = text.get_rect(centerx=self.rect.x - camera.x + self.rect.width // 2, 
                                           bottom=self.rect.y - 5)
-                self.level.screen.blit(text, text_rect)
+                screenUpdater.add(self.level.screen.blit(text, text_rect))
     
     def checkEntityCollision(self, entity):
         """
@@ -1,9 +1,12 @@
 from copy import copy
 
+from classes.DirtyRects import screenUpdater
 from entities.EntityBase import EntityBase
 
 
 class Coin(EntityBase):
+    __slots__ = ("screen", "spriteCollection", "animation")
+
     def __init__(self, screen, spriteCollection, x, y, gravity=0):
         super(Coin, self).__init__(x, y, gravity)
         self.screen = screen
@@ -11,7 +14,18 @@ class Coin(EntityBase):
         self.animation = copy(self.spriteCollection.get("coin").animation)
         self.type = "Item"
 
-    def update(self, cam):
+    def simulate(self):
         if self.alive:
             self.animation.update()
-            self.screen.blit(self.animation.image, (self.rect.x + cam.x, self.rect.y))
+
+    def getState(self):
+        return (super(Coin, self).getState(), self.animation.getState())
+
+    def setState(self, state):
+        baseState, animationState = state
+        super(Coin, self).setState(baseState)
+        self.animation.setState(animationState)
+
+    def render(self, cam):
+        if self.alive:
+            screenUpdater.add(self.screen.blit(self.animation.image, (self.rect.x + cam.x, self.rect.y)))
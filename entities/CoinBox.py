@@ -1,10 +1,16 @@
 from copy import copy
 
+from classes.DirtyRects import screenUpdater
 from entities.EntityBase import EntityBase
 from entities.Item import Item
 
 
 class CoinBox(EntityBase):
+    __slots__ = (
+        "screen", "spriteCollection", "animation", "triggered", "time", "maxTime",
+        "sound", "dashboard", "item",
+    )
+
     def __init__(self, screen, spriteCollection, x, y, sound, dashboard, gravity=0):
         super(CoinBox, self).__init__(x, y, gravity)
         self.screen = screen
@@ -19,12 +25,12 @@ class CoinBox(EntityBase):
         self.vel = 1
         self.item = Item(spriteCollection, screen, self.rect.x, self.rect.y)
 
-    def update(self, cam):
+    def simulate(self):
         if self.alive and not self.triggered:
             self.animation.update()
         else:
             self.animation.image = self.spriteCollection.get("empty").image
-            self.item.spawnCoin(cam, self.sound, self.dashboard)
+            self.item.spawnCoin(self.sound, self.dashboard)
             if self.time < self.maxTime:
                 self.time += 1
                 self.rect.y -= self.vel
@@ -32,8 +38,26 @@ class CoinBox(EntityBase):
                 if self.time < self.maxTime * 2:
                     self.time += 1
                     self.rect.y += self.vel
-        self.screen.blit(
+
+    def getState(self):
+        return (
+            tuple(self.rect), self.alive, self.triggered, self.time,
+            self.animation.getState(), self.item.getState(),
+        )
+
+    def setState(self, state):
+        rect, self.alive, self.triggered, self.time, animationState, itemState = state
+        self.rect.update(rect)
+        self.animation.setState(animationState)
+        if not self.alive or self.triggered:
+            self.animation.image = self.spriteCollection.get("empty").image
+        self.item.setState(itemState)
+
+    def render(self, cam):
+        if not self.alive or self.triggered:
+            self.item.drawCoin(cam)
+        screenUpdater.add(self.screen.blit(
             self.spriteCollection.get("sky").image,
             (self.rect.x + cam.x, self.rect.y + 2),
-        )
-        self.screen.blit(self.animation.image, (self.rect.x + cam.x, self.rect.y - 1))
+        ))
+        screenUpdater.add(self.screen.blit(self.animation.image, (self.rect.x + cam.x, self.rect.y - 1)))
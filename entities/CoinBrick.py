@@ -1,10 +1,13 @@
 from copy import copy
 
+from classes.DirtyRects import screenUpdater
 from entities.EntityBase import EntityBase
 from entities.Item import Item
 
 
 class CoinBrick(EntityBase):
+    __slots__ = ("screen", "spriteCollection", "image", "triggered", "sound", "dashboard", "item")
+
     def __init__(self, screen, spriteCollection, x, y, sound, dashboard, gravity=0):
         super(CoinBrick, self).__init__(x, y, gravity)
         self.screen = screen
@@ -16,12 +19,28 @@ class CoinBrick(EntityBase):
         self.dashboard = dashboard
         self.item = Item(spriteCollection, screen, self.rect.x, self.rect.y)
 
-    def update(self, cam):
+    def simulate(self):
         if not self.alive or self.triggered:
             self.image = self.spriteCollection.get("empty").image
-            self.item.spawnCoin(cam, self.sound, self.dashboard)
-        self.screen.blit(
+            self.item.spawnCoin(self.sound, self.dashboard)
+
+    def getState(self):
+        return (tuple(self.rect), self.alive, self.triggered, self.item.getState())
+
+    def setState(self, state):
+        rect, self.alive, self.triggered, itemState = state
+        self.rect.update(rect)
+        if not self.alive or self.triggered:
+            self.image = self.spriteCollection.get("empty").image
+        else:
+            self.image = self.spriteCollection.get("bricks").image
+        self.item.setState(itemState)
+
+    def render(self, cam):
+        if not self.alive or self.triggered:
+            self.item.drawCoin(cam)
+        screenUpdater.add(self.screen.blit(
             self.spriteCollection.get("sky").image,
             (self.rect.x + cam.x, self.rect.y + 2),
-        )
-        self.screen.blit(self.image, (self.rect.x + cam.x, self.rect.y - 1))
+        ))
+        screenUpdater.add(self.screen.blit(self.image, (self.rect.x + cam.x, self.rect.y - 1)))
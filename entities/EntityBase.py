@@ -4,6 +4,13 @@ from classes.Maths import Vec2D
 
 
 class EntityBase(object):
+    # Attributs déclarés (pas de __dict__) : chaque sous-classe déclare les siens.
+    # uid est attribué par Level.addEntity, removed posé par Level.removeEntity
+    __slots__ = (
+        "vel", "rect", "gravity", "traits", "alive", "active", "bouncing",
+        "timeAfterDeath", "timer", "type", "onGround", "obeyGravity", "uid", "removed",
+    )
+
     def __init__(self, x, y, gravity):
         self.vel = Vec2D()
         self.rect = pygame.Rect(x * 32, y * 32, 32, 32)
@@ -17,7 +24,33 @@ class EntityBase(object):
         self.type = ""
         self.onGround = False
         self.obeyGravity = True
+        self.removed = False
         
+    def simulate(self):
+        """Une étape de simulation (physique et logique), sans aucun dessin"""
+        pass
+
+    def render(self, camera):
+        """Dessine l'entité à l'écran selon la caméra, sans modifier son état"""
+        pass
+
+    def update(self, camera):
+        self.simulate()
+        self.render(camera)
+
+    def getState(self):
+        """État dynamique de l'entité sous forme de données simples (picklables), pour les instantanés"""
+        return (
+            tuple(self.rect), self.vel.x, self.vel.y, self.alive, self.active,
+            self.bouncing, self.timer, self.onGround, self.obeyGravity,
+        )
+
+    def setState(self, state):
+        """Restaure un état retourné par getState"""
+        (rect, self.vel.x, self.vel.y, self.alive, self.active,
+         self.bouncing, self.timer, self.onGround, self.obeyGravity) = state
+        self.rect.update(rect)
+
     def applyGravity(self):
         if self.obeyGravity:
             self.vel.y += self.gravity
@@ -1,5 +1,6 @@
 from classes.Animation import Animation
 from classes.Collider import Collider
+from classes.DirtyRects import screenUpdater
 from classes.EntityCollider import EntityCollider
 from classes.Maths import Vec2D
 from entities.EntityBase import EntityBase
@@ -7,7 +8,12 @@ from traits.leftrightwalk import LeftRightWalkTrait
 
 
 class Goomba(EntityBase):
-    def __init__(self, screen, spriteColl, x, y, level, sound):
+    __slots__ = (
+        "screen", "spriteCollection", "animation", "leftrightTrait", "dashboard",
+        "collision", "EntityCollider", "levelObj", "sound", "textPos",
+    )
+
+    def __init__(self, screen, spriteColl, x, y, level, sound, direction=None):
         super(Goomba, self).__init__(y, x - 1, 1.25)
         self.spriteCollection = spriteColl
         self.animation = Animation(
@@ -17,7 +23,7 @@ class Goomba(EntityBase):
             ]
         )
         self.screen = screen
-        self.leftrightTrait = LeftRightWalkTrait(self, level)
+        self.leftrightTrait = LeftRightWalkTrait(self, level, direction)
         self.type = "Mob"
         self.dashboard = level.dashboard
         self.collision = Collider(self, level)
@@ -26,44 +32,69 @@ class Goomba(EntityBase):
         self.sound = sound
         self.textPos = Vec2D(0, 0)
 
-    def update(self, camera):
+    def simulate(self):
         if self.alive:
-            self.applyGravity()
-            self.drawGoomba(camera)
-            self.leftrightTrait.update()
+            self.animation.update()
+            self.leftrightTrait.walk()
             self.checkEntityCollision()
         else:
-            self.onDead(camera)
+            self.onDead()
+
+    def walkSpeed(self):
+        """Vitesse de marche du prochain simulate(), ou None s'il ne fait pas marcher l'entité (voir MobStore)"""
+        return self.leftrightTrait.speed if self.alive else None
+
+    def getState(self):
+        return (
+            super(Goomba, self).getState(),
+            self.animation.getState(),
+            self.leftrightTrait.getState(),
+            (self.textPos.x, self.textPos.y),
+        )
+
+    def setState(self, state):
+        baseState, animationState, traitState, textPos = state
+        super(Goomba, self).setState(baseState)
+        self.animation.setState(animationState)
+        self.leftrightTrait.setState(traitState)
+        self.textPos = Vec2D(*textPos)
+
+    def render(self, camera):
+        if self.alive:
+            self.drawGoomba(camera)
+        else:
+            self.drawPointsText(camera)
+            self.drawFlatGoomba(camera)
 
     def drawGoomba(self, camera):
-        self.screen.blit(self.animation.image, (self.rect.x + camera.x, self.rect.y))
-        self.animation.update()
+        screenUpdater.add(self.screen.blit(self.animation.image, (self.rect.x + camera.x, self.rect.y)))
 
-    def onDead(self, camera):
+    def onDead(self):
         if self.timer == 0:
             self.setPointsTextStartPosition(self.rect.x + 3, self.rect.y)
         if self.timer < self.timeAfterDeath:
-            self.movePointsTextUpAndDraw(camera)
-            self.drawFlatGoomba(camera)
+            self.movePointsTextUp()
         else:
             self.alive = None
         self.timer += 0.1
 
     def drawFlatGoomba(self, camera):
-        self.screen.blit(
+        screenUpdater.add(self.screen.blit(
             self.spriteCollection.get("goomba-flat").image,
             (self.rect.x + camera.x, self.rect.y),
-        )
+        ))
 
     def setPointsTextStartPosition(self, x, y):
         self.textPos = Vec2D(x, y)
 
-    def movePointsTextUpAndDraw(self, camera):
+    def movePointsTextUp(self):
         self.textPos.y += -0.5
+
+    def drawPointsText(self, camera):
         self.dashboard.drawText("100", self.textPos.x + camera.x, self.textPos.y, 8)
     
     def checkEntityCollision(self):
-        for ent in self.levelObj.entityList:
+        for ent in self.levelObj.entitiesNear(self.rect):
             collisionState = self.EntityCollider.check(ent)
             if collisionState.isColliding:
                 if ent.type == "Mob":
@@ -1,6 +1,7 @@
 from copy import copy
 
 from classes.Dashboard import Dashboard
+from classes.DirtyRects import screenUpdater
 from classes.Maths import Vec2D
 
 
@@ -13,7 +14,7 @@ class Item(Dashboard):
         self.coin_animation = copy(collection.get("coin-item").animation)
         self.sound_played = False
 
-    def spawnCoin(self, cam, sound, dashboard):
+    def spawnCoin(self, sound, dashboard):
         if not self.sound_played:
             self.sound_played = True
             dashboard.points += 100
@@ -26,10 +27,25 @@ class Item(Dashboard):
             elif self.coin_animation.timer < 45:
                 self.itemVel.y += 0.5
                 self.ItemPos.y += self.itemVel.y
-            self.screen.blit(
-                self.coin_animation.image, (self.ItemPos.x + cam.x, self.ItemPos.y)
-            )
         elif self.coin_animation.timer < 80:
             self.itemVel.y = -0.75
             self.ItemPos.y += self.itemVel.y
+
+    def getState(self):
+        return (
+            self.ItemPos.x, self.ItemPos.y, self.itemVel.x, self.itemVel.y,
+            self.coin_animation.getState(), self.sound_played,
+        )
+
+    def setState(self, state):
+        (self.ItemPos.x, self.ItemPos.y, self.itemVel.x, self.itemVel.y,
+         animationState, self.sound_played) = state
+        self.coin_animation.setState(animationState)
+
+    def drawCoin(self, cam):
+        if self.coin_animation.timer < 45:
+            screenUpdater.add(self.screen.blit(
+                self.coin_animation.image, (self.ItemPos.x + cam.x, self.ItemPos.y)
+            ))
+        elif self.coin_animation.timer < 80:
             self.drawText("100", self.ItemPos.x + 3 + cam.x, self.ItemPos.y, 8)
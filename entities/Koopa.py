@@ -2,6 +2,7 @@ import pygame
 
 from classes.Animation import Animation
 from classes.Collider import Collider
+from classes.DirtyRects import screenUpdater
 from classes.EntityCollider import EntityCollider
 from classes.Maths import Vec2D
 from entities.EntityBase import EntityBase
@@ -9,7 +10,12 @@ from traits.leftrightwalk import LeftRightWalkTrait
 
 
 class Koopa(EntityBase):
-    def __init__(self, screen, spriteColl, x, y, level, sound):
+    __slots__ = (
+        "screen", "spriteCollection", "animation", "leftrightTrait", "dashboard",
+        "collision", "EntityCollider", "levelObj", "sound",
+    )
+
+    def __init__(self, screen, spriteColl, x, y, level, sound, direction=None):
         super(Koopa, self).__init__(y - 1, x, 1.25)
         self.spriteCollection = spriteColl
         self.animation = Animation(
@@ -19,7 +25,7 @@ class Koopa(EntityBase):
             ]
         )
         self.screen = screen
-        self.leftrightTrait = LeftRightWalkTrait(self, level)
+        self.leftrightTrait = LeftRightWalkTrait(self, level, direction)
         self.timer = 0
         self.timeAfterDeath = 35
         self.type = "Mob"
@@ -29,55 +35,80 @@ class Koopa(EntityBase):
         self.levelObj = level
         self.sound = sound
 
-    def update(self, camera):
+    def simulate(self):
         if self.alive and self.active:
-            self.updateAlive(camera)
+            self.updateAlive()
             self.checkEntityCollision()
         elif self.alive and not self.active and not self.bouncing:
-            self.sleepingInShell(camera)
+            self.sleepingInShell()
             self.checkEntityCollision()
         elif self.bouncing:
-            self.shellBouncing(camera)
+            self.shellBouncing()
+
+    def walkSpeed(self):
+        """Vitesse de marche du prochain simulate(), ou None s'il ne fait pas marcher la tortue (voir MobStore)"""
+        if self.alive and self.active:
+            return self.leftrightTrait.speed
+        if self.bouncing:
+            return 4  # Carapace lancée, voir shellBouncing
+        return None
+
+    def getState(self):
+        return (
+            super(Koopa, self).getState(),
+            self.animation.getState(),
+            self.leftrightTrait.getState(),
+        )
+
+    def setState(self, state):
+        baseState, animationState, traitState = state
+        super(Koopa, self).setState(baseState)
+        self.animation.setState(animationState)
+        self.leftrightTrait.setState(traitState)
+        if self.bouncing:
+            self.animation.image = self.spriteCollection.get("koopa-hiding").image
+
+    def render(self, camera):
+        if self.alive and self.active:
+            self.drawKoopa(camera)
+        elif self.alive and not self.active and not self.bouncing:
+            screenUpdater.add(self.screen.blit(
+                self.spriteCollection.get("koopa-hiding").image,
+                (self.rect.x + camera.x, self.rect.y - 32),
+            ))
+        elif self.bouncing:
+            self.drawKoopa(camera)
 
     def drawKoopa(self, camera):
         if self.leftrightTrait.direction == -1:
-            self.screen.blit(
+            screenUpdater.add(self.screen.blit(
                 self.animation.image, (self.rect.x + camera.x, self.rect.y - 32)
-            )
+            ))
         else:
-            self.screen.blit(
+            screenUpdater.add(self.screen.blit(
                 pygame.transform.flip(self.animation.image, True, False),
                 (self.rect.x + camera.x, self.rect.y - 32),
-            )
+            ))
 
-    def shellBouncing(self, camera):
+    def shellBouncing(self):
         self.leftrightTrait.speed = 4
-        self.applyGravity()
         self.animation.image = self.spriteCollection.get("koopa-hiding").image
-        self.drawKoopa(camera)
-        self.leftrightTrait.update()
+        self.leftrightTrait.walk()
 
-    def sleepingInShell(self, camera):
-        if self.timer < self.timeAfterDeath:
-            self.screen.blit(
-                self.spriteCollection.get("koopa-hiding").image,
-                (self.rect.x + camera.x, self.rect.y - 32),
-            )
-        else:
+    def sleepingInShell(self):
+        if self.timer >= self.timeAfterDeath:
             self.alive = True
             self.active = True
             self.bouncing = False
             self.timer = 0
         self.timer += 0.1
 
-    def updateAlive(self, camera):
-        self.applyGravity()
-        self.drawKoopa(camera)
+    def updateAlive(self):
         self.animation.update()
-        self.leftrightTrait.update()
+        self.leftrightTrait.walk()
 
     def checkEntityCollision(self):
-        for ent in self.levelObj.entityList:
+        for ent in self.levelObj.entitiesNear(self.rect):
             if ent is not self:
                 collisionState = self.EntityCollider.check(ent)
                 if collisionState.isColliding:
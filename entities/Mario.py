@@ -3,6 +3,7 @@ import pygame
 from classes.Animation import Animation
 from classes.Camera import Camera
 from classes.Collider import Collider
+from classes.DirtyRects import screenUpdater
 from classes.EntityCollider import EntityCollider
 from classes.Input import Input
 from classes.Sprites import Sprites
@@ -16,9 +17,14 @@ from classes.Pause import Pause
 # Définir la classe StaticImage avant de l'utiliser
 class StaticImage:
     """Classe simplifiée remplaçant l'animation par une image fixe"""
-    def __init__(self, image):
-        self.image = image
+    def __init__(self, sprite):
+        # Le Sprite et non son image : convertAssets remplace l'image après la création de la fenêtre
+        self.sprite = sprite
         self.deltaTime = 0
+
+    @property
+    def image(self):
+        return self.sprite.image
     
     def update(self):
         # Ne fait rien car c'est une image statique
@@ -34,8 +40,8 @@ class StaticImage:
 
 spriteCollection = Sprites().spriteCollection
 # Remplacer les animations par des images fixes
-smallStaticImage = StaticImage(spriteCollection["mario_idle"].image)
-bigStaticImage = StaticImage(spriteCollection["mario_big_idle"].image)
+smallStaticImage = StaticImage(spriteCollection["mario_idle"])
+bigStaticImage = StaticImage(spriteCollection["mario_big_idle"])
 
 # Anciennes animations (commentées pour référence)
 # smallAnimation = Animation(
@@ -59,6 +65,13 @@ bigStaticImage = StaticImage(spriteCollection["mario_big_idle"].image)
 
 
 class Mario(EntityBase):
+    # retour_menu est posé par Pause
+    __slots__ = (
+        "camera", "sound", "input", "inAir", "inJump", "powerUpState", "invincibilityFrames",
+        "levelObj", "collision", "screen", "EntityCollider", "dashboard", "restart", "dead",
+        "pause", "pauseObj", "retour_menu",
+    )
+
     def __init__(self, x, y, level, screen, dashboard, sound, gravity=0.8):
         super(Mario, self).__init__(x, y, gravity)
         self.camera = Camera(self.rect, self)
@@ -80,10 +93,15 @@ class Mario(EntityBase):
         self.EntityCollider = EntityCollider(self)
         self.dashboard = dashboard
         self.restart = False
+        self.dead = False
         self.pause = False
         self.pauseObj = Pause(screen, self, dashboard)
 
     def update(self):
+        self.simulate()
+
+    def simulate(self):
+        """Une étape de simulation de Mario (entrées, physique, collisions), sans dessin"""
         if self.invincibilityFrames > 0:
             self.invincibilityFrames -= 1
         self.updateTraits()
@@ -93,6 +111,33 @@ class Mario(EntityBase):
         self.checkEntityCollision()
         self.input.checkForInput()
 
+    def render(self):
+        # Clignotement pendant les frames d'invincibilité
+        if (self.invincibilityFrames // 2) % 2 == 0:
+            self.traits["goTrait"].drawEntity()
+
+    def getState(self):
+        """État complet de Mario (corps, traits, caméra), en données simples picklables"""
+        return (
+            super(Mario, self).getState(),
+            self.inAir, self.inJump, self.powerUpState, self.invincibilityFrames,
+            self.dead, self.restart,
+            self.traits["goTrait"].getState(),
+            self.traits["jumpTrait"].getState(),
+            self.traits["bounceTrait"].getState(),
+            self.camera.getState(),
+        )
+
+    def setState(self, state):
+        (baseState, self.inAir, self.inJump, self.powerUpState, self.invincibilityFrames,
+         self.dead, self.restart, goState, jumpState, bounceState, cameraState) = state
+        super(Mario, self).setState(baseState)
+        self.traits["goTrait"].animation = bigStaticImage if self.powerUpState == 1 else smallStaticImage
+        self.traits["goTrait"].setState(goState)
+        self.traits["jumpTrait"].setState(jumpState)
+        self.traits["bounceTrait"].setState(bounceState)
+        self.camera.setState(cameraState)
+
     def moveMario(self):
         self.rect.y += self.vel.y
         self.collision.checkY()
@@ -100,7 +145,7 @@ class Mario(EntityBase):
         self.collision.checkX()
 
     def checkEntityCollision(self):
-        for ent in self.levelObj.entityList:
+        for ent in self.levelObj.entitiesNear(self.rect):
             collisionState = self.EntityCollider.check(ent)
             if collisionState.isColliding:
                 if ent.type == "Item":
@@ -111,7 +156,7 @@ class Mario(EntityBase):
                     self._onCollisionWithMob(ent, collisionState)
 
     def _onCollisionWithItem(self, item):
-        self.levelObj.entityList.remove(item)
+        self.levelObj.removeEntity(item)
         self.dashboard.points += 100
         self.dashboard.coins += 1
         self.sound.play_sfx(self.sound.coin)
@@ -174,6 +219,10 @@ class Mario(EntityBase):
         self.dashboard.points += 100
 
     def gameOver(self):
+        self.dead = True
+        self.restart = True
+
+    def playDeathAnimation(self):
         srf = pygame.Surface((640, 480))
         srf.set_colorkey((255, 255, 255), pygame.RLEACCEL)
         srf.set_alpha(128)
@@ -189,12 +238,11 @@ class Mario(EntityBase):
                 i,
             )
             self.screen.blit(srf, (0, 0))
-            pygame.display.update()
+            screenUpdater.presentAll()
             self.input.checkForInput()
         while self.sound.music_channel.get_busy():
-            pygame.display.update()
+            screenUpdater.presentAll()
             self.input.checkForInput()
-        self.restart = True
 
     def getPos(self):
         return self.rect.x, self.rect.y
@@ -1,4 +1,5 @@
 from classes.Animation import Animation
+from classes.DirtyRects import screenUpdater
 from classes.Maths import Vec2D
 from entities.EntityBase import EntityBase
 from traits.leftrightwalk import LeftRightWalkTrait
@@ -7,6 +8,11 @@ from classes.EntityCollider import EntityCollider
 
 
 class RedMushroom(EntityBase):
+    __slots__ = (
+        "screen", "spriteCollection", "animation", "leftrightTrait", "dashboard",
+        "collision", "EntityCollider", "levelObj", "sound", "textPos",
+    )
+
     def __init__(self, screen, spriteColl, x, y, level, sound):
         super(RedMushroom, self).__init__(y, x - 1, 1.25)
         self.spriteCollection = spriteColl
@@ -24,24 +30,52 @@ class RedMushroom(EntityBase):
         self.levelObj = level
         self.sound = sound
 
-    def update(self, camera):
+    def simulate(self):
         if self.alive:
-            self.applyGravity()
-            self.drawRedMushroom(camera)
-            self.leftrightTrait.update()
+            self.animation.update()
+            self.leftrightTrait.walk()
             self.checkEntityCollision()
         else:
-            self.onDead(camera)
+            self.onDead()
+
+    def walkSpeed(self):
+        """Vitesse de marche du prochain simulate(), ou None s'il ne fait pas marcher l'entité (voir MobStore)"""
+        return self.leftrightTrait.speed if self.alive else None
+
+    def getState(self):
+        # textPos n'existe qu'après la mort du champignon
+        textPos = (self.textPos.x, self.textPos.y) if hasattr(self, "textPos") else None
+        return (
+            super(RedMushroom, self).getState(),
+            self.animation.getState(),
+            self.leftrightTrait.getState(),
+            textPos,
+        )
+
+    def setState(self, state):
+        baseState, animationState, traitState, textPos = state
+        super(RedMushroom, self).setState(baseState)
+        self.animation.setState(animationState)
+        self.leftrightTrait.setState(traitState)
+        if textPos is not None:
+            self.textPos = Vec2D(*textPos)
+        elif hasattr(self, "textPos"):
+            del self.textPos
+
+    def render(self, camera):
+        if self.alive:
+            self.drawRedMushroom(camera)
+        else:
+            self.drawPointsText(camera)
 
     def drawRedMushroom(self, camera):
-        self.screen.blit(self.animation.image, (self.rect.x + camera.x, self.rect.y))
-        self.animation.update()
+        screenUpdater.add(self.screen.blit(self.animation.image, (self.rect.x + camera.x, self.rect.y)))
 
-    def onDead(self, camera):
+    def onDead(self):
         if self.timer == 0:
             self.setPointsTextStartPosition(self.rect.x + 3, self.rect.y)
         if self.timer < self.timeAfterDeath:
-            self.movePointsTextUpAndDraw(camera)
+            self.movePointsTextUp()
         else:
             self.alive = None
         self.timer += 0.1
@@ -49,8 +83,10 @@ class RedMushroom(EntityBase):
     def setPointsTextStartPosition(self, x, y):
         self.textPos = Vec2D(x, y)
 
-    def movePointsTextUpAndDraw(self, camera):
+    def movePointsTextUp(self):
         self.textPos.y += -0.5
+
+    def drawPointsText(self, camera):
         self.dashboard.drawText("100", self.textPos.x + camera.x, self.textPos.y, 8)
 
     def checkEntityCollision(self):
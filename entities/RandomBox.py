@@ -1,9 +1,15 @@
 from copy import copy
 
+from classes.DirtyRects import screenUpdater
 from entities.EntityBase import EntityBase
 
 
 class RandomBox(EntityBase):
+    __slots__ = (
+        "screen", "spriteCollection", "animation", "triggered", "time", "maxTime",
+        "sound", "dashboard", "item", "level",
+    )
+
     def __init__(self, screen, spriteCollection, x, y, item, sound, dashboard, level, gravity=0):
         super(RandomBox, self).__init__(x, y, gravity)
         self.screen = screen
@@ -19,7 +25,7 @@ class RandomBox(EntityBase):
         self.item = item
         self.level = level
 
-    def update(self, cam):
+    def simulate(self):
         if self.alive and not self.triggered:
             self.animation.update()
         else:
@@ -35,8 +41,23 @@ class RandomBox(EntityBase):
                 if self.time < self.maxTime * 2:
                     self.time += 1
                     self.rect.y += self.vel
-        self.screen.blit(
+
+    def getState(self):
+        return (
+            tuple(self.rect), self.alive, self.triggered, self.time,
+            self.item, self.animation.getState(),
+        )
+
+    def setState(self, state):
+        rect, self.alive, self.triggered, self.time, self.item, animationState = state
+        self.rect.update(rect)
+        self.animation.setState(animationState)
+        if not self.alive or self.triggered:
+            self.animation.image = self.spriteCollection.get("empty").image
+
+    def render(self, cam):
+        screenUpdater.add(self.screen.blit(
             self.spriteCollection.get("sky").image,
             (self.rect.x + cam.x, self.rect.y + 2),
-        )
-        self.screen.blit(self.animation.image, (self.rect.x + cam.x, self.rect.y - 1))
+        ))
+        screenUpdater.add(self.screen.blit(self.animation.image, (self.rect.x + cam.x, self.rect.y - 1)))
@@ -2,18 +2,26 @@ import sys
 import pygame
 import random
 import os
+import datetime
+from classes.Assets import convertAssets
 from classes.Dashboard import Dashboard
+from classes.DirtyRects import screenUpdater
 from classes.Level import Level
 from classes.Menu import Menu
 from classes.Sound import Sound
+from classes.Trace import TraceRecorder
 from entities.Mario import Mario
 from utils import suppress_pygame_warnings
 
 # Import pour le mode IA
 from ai.run_agents import run_ai_mario
 
-def main_game():
-    """Fonction pour lancer le jeu normal"""
+def main_game(trace_dir="traces"):
+    """Fonction pour lancer le jeu normal
+
+    Args:
+        trace_dir: dossier où enregistrer la trace des commandes de la partie (None = aucune)
+    """
     # Supprimer les avertissements de libpng
     stderr_redirect = suppress_pygame_warnings()
     
@@ -27,6 +35,7 @@ def main_game():
     dashboard = Dashboard("./img/font.png", 8, screen)
     sound = Sound()
     level = Level(screen, sound, dashboard)
+    convertAssets()  # Sprites et polices au format de l'écran
     
     # Charger un niveau par défaut (nécessaire pour éviter l'erreur NoneType)
     level.loadLevel("Level1-1")
@@ -41,6 +50,8 @@ def main_game():
         level.loadLevel(menu.selected_level)
     
     mario = Mario(3, 0, level, screen, dashboard, sound)
+    if trace_dir:
+        mario.input.recorder = TraceRecorder("human", level.loadedLevels, level.seed)
     clock = pygame.time.Clock()
 
     while not mario.restart:
@@ -49,11 +60,17 @@ def main_game():
             mario.pauseObj.update()
         else:
             level.drawLevel(mario.camera)
-            mario.traits["goTrait"].drawEntity()  # Affichage explicite de Mario
+            mario.render()  # Affichage explicite de Mario
             dashboard.update()
             mario.update()
-        pygame.display.update()
+        screenUpdater.present()  # Seules les zones modifiées
         clock.tick(max_frame_rate)
+    if mario.input.recorder is not None:
+        # De quoi rejouer la partie sans affichage (classes.Trace.replayTrace)
+        now = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        mario.input.recorder.save(os.path.join(trace_dir, f"humain_{now}.mtr"))
+    if mario.dead:
+        mario.playDeathAnimation()
     return 'restart'
 
 def main_game_no_retreat():
@@ -71,6 +88,7 @@ def main_game_no_retreat():
     dashboard = Dashboard("./img/font.png", 8, screen)
     sound = Sound()
     level = Level(screen, sound, dashboard)
+    convertAssets()  # Sprites et polices au format de l'écran
     
     # Charger un niveau par défaut (nécessaire pour éviter l'erreur NoneType)
     level.loadLevel("Level1-1")
@@ -100,11 +118,13 @@ def main_game_no_retreat():
             mario.pauseObj.update()
         else:
             level.drawLevel(mario.camera)
-            mario.traits["goTrait"].drawEntity()  # Affichage explicite de Mario
+            mario.render()  # Affichage explicite de Mario
             dashboard.update()
             mario.update()
-        pygame.display.update()
+        screenUpdater.present()  # Seules les zones modifiées
         clock.tick(max_frame_rate)
+    if mario.dead:
+        mario.playDeathAnimation()
     return 'restart'
 
 class MarioButton:
@@ -194,6 +214,7 @@ def afficher_menu_principal():
     dashboard = Dashboard("./img/font.png", 8, screen)
     sound = Sound()
     level = Level(screen, sound, dashboard)
+    convertAssets()  # Sprites et polices au format de l'écran
     level.loadLevel("Level1-1")  # Nécessaire pour avoir accès aux sprites
     
     # Créer les boutons du menu principal
@@ -330,7 +351,7 @@ def afficher_menu_principal():
             button.update()
             button.draw()
         
-        pygame.display.flip()
+        screenUpdater.presentAll()
         clock.tick(60)
     
     return next_action
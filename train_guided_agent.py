@@ -5,11 +5,14 @@ import numpy as np
 import sys
 import time
 
-def train_guided_agent(num_episodes=10):
+def train_guided_agent(num_episodes=10, max_speed=False, action_repeat=1, seed=None):
     """Fonction principale pour exécuter l'agent guidé sur plusieurs épisodes
     
     Args:
         num_episodes: nombre d'épisodes (parties) à jouer
+        max_speed: si True, aucune pause en temps réel (entraînement aussi rapide que possible)
+        action_repeat: nombre de ticks de jeu pendant lesquels chaque décision de l'agent est appliquée
+        seed: graine du monde et de l'agent, pour des épisodes reproductibles (None = hasard)
     """
     print(f"Démarrage de l'agent guidé pour {num_episodes} épisodes...")
     
@@ -19,25 +22,25 @@ def train_guided_agent(num_episodes=10):
             pygame.init()
         
         # Créer l'agent guidé (une seule fois pour conserver la mémoire entre les parties)
-        agent = GuidedAgent()
+        agent = GuidedAgent(seed=seed)
         
         # Statistiques globales
         best_score = -float('inf')
         best_distance = 0
         episode_scores = []
         
+        # Créer l'environnement une seule fois : chaque épisode repart du modèle de niveau en cache
+        env = MarioEnv(agent_type="guided", max_speed=max_speed, seed=seed)
+        
         # Boucle des épisodes
         for episode in range(1, num_episodes + 1):
             print(f"=== Début de l'épisode {episode}/{num_episodes} ===")
             
-            # Créer l'environnement pour cet épisode
-            env = MarioEnv(agent_type="guided")
-            
             # Paramètres d'exécution
             max_steps = 5000
             
-            # Réinitialiser l'environnement
-            state = env.reset()
+            # Réinitialiser l'environnement directement au début du niveau
+            state = env.reset(level="Level1-1")
             score = 0
             done = False
             steps = 0
@@ -57,7 +60,8 @@ def train_guided_agent(num_episodes=10):
             print(f"Épisode {episode}: Mario prêt à jouer...")
             
             # Pour permettre à l'utilisateur de voir Mario avant de commencer
-            time.sleep(0.5)
+            if not max_speed:
+                time.sleep(0.5)
             
             # Boucle principale de l'épisode
             while not done and steps < max_steps:
@@ -77,7 +81,7 @@ def train_guided_agent(num_episodes=10):
                 action = agent.choose_action(state)
                 
                 # Exécuter l'action dans l'environnement
-                next_state, reward, done, info = env.step(action)
+                next_state, reward, done, info = env.step(action, repeat=action_repeat)
                 
                 # Entraîner l'agent avec cette nouvelle expérience
                 agent.train(state, action, reward, next_state, done)
@@ -94,7 +98,8 @@ def train_guided_agent(num_episodes=10):
                     print(f"Étapes: {steps}, Score: {score:.2f}, Distance parcourue: {distance_traveled}")
                 
                 # Petite pause pour que l'humain puisse suivre l'action
-                time.sleep(0.01)  # Vitesse légèrement accélérée pour les entraînements multiples
+                if not max_speed:
+                    time.sleep(0.01)  # Vitesse légèrement accélérée pour les entraînements multiples
             
             # Calculer la distance parcourue
             final_x = state.get("mario_pos", [0, 0])[0] if "mario_pos" in state else 0
@@ -118,10 +123,11 @@ def train_guided_agent(num_episodes=10):
             agent.save_memory()
             
             # Brève pause entre les épisodes
-            time.sleep(1)
-            
-            # Fermer l'environnement
-            env.close()
+            if not max_speed:
+                time.sleep(1)
+        
+        # Fermer l'environnement
+        env.close()
         
         # Afficher les statistiques globales
         print("\n=== Résultats de l'entraînement ===")
@@ -154,13 +160,16 @@ def train_guided_agent(num_episodes=10):
         pygame.quit()
 
 if __name__ == "__main__":
+    # Option --max-speed : entraînement sans aucune pause en temps réel
+    args = [arg for arg in sys.argv[1:] if arg != "--max-speed"]
+    max_speed = len(args) != len(sys.argv) - 1
     # Si des arguments sont fournis, utiliser le premier comme nombre d'épisodes
-    if len(sys.argv) > 1:
+    if len(args) > 0:
         try:
-            num_episodes = int(sys.argv[1])
-            train_guided_agent(num_episodes)
+            num_episodes = int(args[0])
+            train_guided_agent(num_episodes, max_speed=max_speed)
         except ValueError:
-            print(f"Argument invalide: {sys.argv[1]}. Utilisation du nombre d'épisodes par défaut.")
-            train_guided_agent()
+            print(f"Argument invalide: {args[0]}. Utilisation du nombre d'épisodes par défaut.")
+            train_guided_agent(max_speed=max_speed)
     else:
-        train_guided_agent()
\ No newline at end of file
+        train_guided_agent(max_speed=max_speed)
\ No newline at end of file
@@ -11,5 +11,11 @@ class bounceTrait:
             self.jump = False
             self.entity.inAir = True
 
+    def getState(self):
+        return self.jump
+
+    def setState(self, state):
+        self.jump = state
+
     def reset(self):
         self.entity.inAir = False
@@ -1,5 +1,7 @@
 from pygame.transform import flip
 
+from classes.DirtyRects import screenUpdater
+
 
 class GoTrait:
     def __init__(self, animation, screen, camera, ent):
@@ -59,8 +61,12 @@ class GoTrait:
                     self.animation.inAir()
                 else:
                     self.animation.idle()
-        if (self.entity.invincibilityFrames//2) % 2 == 0:
-            self.drawEntity()
+
+    def getState(self):
+        return (self.direction, self.heading, self.boost, self.maxVel)
+
+    def setState(self, state):
+        self.direction, self.heading, self.boost, self.maxVel = state
 
     def updateAnimation(self, animation):
         self.animation = animation
@@ -86,4 +92,4 @@ class GoTrait:
         sprite_x = pos[0] - cam_x + offset_x
         sprite_y = pos[1] - cam_y + offset_y
 
-        self.screen.blit(self.animation.image, (sprite_x, sprite_y))
\ No newline at end of file
+        screenUpdater.add(self.screen.blit(self.animation.image, (sprite_x, sprite_y)))
\ No newline at end of file
@@ -31,5 +31,11 @@ class JumpTrait:
                 self.entity.inJump = False
                 self.entity.obeyGravity = True
 
+    def getState(self):
+        return (self.initalHeight, self.jumpCooldown)
+
+    def setState(self, state):
+        self.initalHeight, self.jumpCooldown = state
+
     def reset(self):
         self.entity.inAir = False
\ No newline at end of file
@@ -1,15 +1,26 @@
-import random
-
 from classes.Collider import Collider
 
 
 class LeftRightWalkTrait:
-    def __init__(self, entity, level):
-        self.direction = random.choice([-1, 1])
+    def __init__(self, entity, level, direction=None):
+        # Direction tirée à la création, sauf si elle a déjà été tirée (voir Level.loadEntities)
+        self.direction = direction if direction is not None else level.random.choice([-1, 1])
         self.entity = entity
         self.collDetection = Collider(self.entity, level)
         self.speed = 1
         self.entity.vel.x = self.speed * self.direction
+        # Calcul du MobStore du niveau qui a traité cette entité, et son rang dans ce calcul
+        self.batchGeneration = None
+        self.batchIndex = None
+
+    def walk(self):
+        """Gravité puis marche ; reprend le résultat du MobStore du niveau s'il l'a déjà calculé"""
+        store = self.collDetection.levelObj.mobStore
+        if store is not None and self.batchGeneration == store.generation:
+            store.apply(self.entity, self.batchIndex)
+            return
+        self.entity.applyGravity()
+        self.update()
 
     def update(self):
         if self.entity.vel.x == 0:
@@ -22,3 +33,9 @@ class LeftRightWalkTrait:
         self.collDetection.checkY()
         self.entity.rect.x += self.entity.vel.x
         self.collDetection.checkX()
+
+    def getState(self):
+        return (self.direction, self.speed)
+
+    def setState(self, state):
+        self.direction, self.speed = state